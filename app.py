@@ -1,11 +1,16 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file, has_request_context, make_response, abort
+from markupsafe import Markup
 from flask_sqlalchemy import SQLAlchemy
 from flask_mail import Mail, Message
 import os
-from datetime import datetime, timedelta
-from collections import defaultdict
-from sqlalchemy import func
-from twilio_config import twilio_client, twilio_number
+from datetime import date, datetime, timedelta
+from collections import defaultdict, namedtuple
+from sqlalchemy import func, and_, or_, event, select, delete, update, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm.attributes import get_history
+from twilio_config import twilio_client, twilio_number, sms_sender
 import secrets
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,6 +20,19 @@ from selenium.webdriver.chrome.service import Service
 import time
 import uuid
 import threading
+import json
+from roster_digest import roster_digest, compare_digests, district_key
+from organizations import ORGANIZATIONS, DEFAULT_ORGANIZATION
+from roster_sync import SyncScheduler, parse_schedule, sync_credentials, sync_organizations
+from notifications import NotificationDispatcher, send_email_batch
+from reminders import ReminderScheduler
+from migrations import upgrade as upgrade_schema
+from db_config import configure_database
+from page_cache import DistrictVersions, SnapshotCache, FragmentCache, make_etag
+from slot_rules import occurrences, visible_window
+from keyset import decode_cursor, keyset_page
+from scheduling import plan_assignments, TIME_PREFERENCES, find_overlaps, interviewer_key, check_booking_operations
+from events import EventBus, MemberEventCoalescer, summarize_changes, BOOKING_CANCELLED, BOOKING_ADDED, WAITLIST_PROMOTED
 
 # Global thread-safe storage for progress data
 progress_store = {}
@@ -22,7 +40,7 @@ progress_lock = threading.Lock()
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = secrets.token_hex(16)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///interviews.db'
+configure_database(app)  # DATABASE_URL, SQLite pragmas / PostgreSQL pool settings
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Email configuration (update with your SMTP settings)
@@ -31,67 +49,709 @@ app.config['MAIL_PORT'] = 587
 app.config['MAIL_USE_TLS'] = True
 app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
+# Batch sends reuse one SMTP login; Flask-Mail reconnects after this many messages
+app.config['MAIL_MAX_EMAILS'] = int(os.environ.get('MAIL_MAX_PER_CONNECTION', '50'))
 
 db = SQLAlchemy(app)
 mail = Mail(app)
 
+@app.context_processor
+def inject_organizations():
+    return {'organizations': ORGANIZATIONS}
+
 # Database Models
 class District(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     interviewer_name = db.Column(db.String(100), nullable=False)
+    organization = db.Column(db.String(30), nullable=False, default=DEFAULT_ORGANIZATION)  # key of ORGANIZATIONS
     teams = db.relationship('Team', backref='district', lazy=True)
 
 class Team(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    district_id = db.Column(db.Integer, db.ForeignKey('district.id'), nullable=False)
+    district_id = db.Column(db.Integer, db.ForeignKey('district.id'), nullable=False, index=True)
     members = db.relationship('Member', backref='team', lazy=True)
 
 class Member(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id', ondelete='SET NULL'), nullable=True, index=True)
     name = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20))
-    email = db.Column(db.String(120), nullable=False)
+    email = db.Column(db.String(120), nullable=False, index=True)  # import matches members by email
     token = db.Column(db.String(32), unique=True, nullable=False, default=lambda: secrets.token_hex(16))
+    time_preference = db.Column(db.String(20), nullable=True)  # key of scheduling.TIME_PREFERENCES, used by auto-schedule
 
 class InterviewSlot(db.Model):
+    __table_args__ = (
+        # One slot per district and start time; generation relies on it to skip duplicates.
+        # It also serves the (district_id, date) range scans of the calendar and schedule.
+        db.Index('ix_interview_slot_district_date_start', 'district_id', 'date', 'start_time', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True)
     district_id = db.Column(db.Integer, db.ForeignKey('district.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
     start_time = db.Column(db.Time, nullable=False)
     duration = db.Column(db.Integer, nullable=False)  # in minutes
     max_slots = db.Column(db.Integer, nullable=False)
-    bookings = db.relationship('Booking', backref='slot', lazy=True)
+    rule_id = db.Column(db.Integer, db.ForeignKey('slot_rule.id', ondelete='SET NULL'), nullable=True, index=True)  # set when materialised from a SlotRule
+    bookings = db.relationship('Booking', backref='slot', lazy=True, passive_deletes=True)
+
+class SlotRule(db.Model):
+    """Recurring availability; slots are materialised from it as pages need them."""
+    id = db.Column(db.Integer, primary_key=True)
+    district_id = db.Column(db.Integer, db.ForeignKey('district.id'), nullable=False, index=True)
+    weekday = db.Column(db.Integer, nullable=False)  # 0 = Monday
+    start_time = db.Column(db.Time, nullable=False)
+    duration = db.Column(db.Integer, nullable=False)  # in minutes
+    num_slots = db.Column(db.Integer, nullable=False)  # back-to-back slots per day
+    max_slots = db.Column(db.Integer, nullable=False, default=10)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    exceptions = db.relationship('SlotRuleException', backref='rule', lazy=True, cascade='all, delete-orphan',
+                                 passive_deletes=True)
+
+    @property
+    def cancelled(self):
+        return {(e.date, e.start_time) for e in self.exceptions}
+
+class SlotRuleException(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('rule_id', 'date', 'start_time', name='uq_slot_rule_exception'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    rule_id = db.Column(db.Integer, db.ForeignKey('slot_rule.id', ondelete='CASCADE'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    start_time = db.Column(db.Time, nullable=True)  # None cancels the whole date
 
 class Booking(db.Model):
+    __table_args__ = (
+        # A member is booked into a slot at most once; also the slot_id lookup index
+        db.Index('ix_booking_slot_member', 'slot_id', 'member_id', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    slot_id = db.Column(db.Integer, db.ForeignKey('interview_slot.id'), nullable=False)
-    member_id = db.Column(db.Integer, db.ForeignKey('member.id'), nullable=False)
+    slot_id = db.Column(db.Integer, db.ForeignKey('interview_slot.id', ondelete='CASCADE'), nullable=False)
+    member_id = db.Column(db.Integer, db.ForeignKey('member.id', ondelete='CASCADE'), nullable=False, index=True)
     member = db.relationship('Member', backref='bookings')
 
+class WaitlistEntry(db.Model):
+    __table_args__ = (
+        # Promotion reads the head of a slot's queue straight off this index
+        db.Index('ix_waitlist_slot_position', 'slot_id', 'position', unique=True),
+        db.UniqueConstraint('slot_id', 'member_id', name='uq_waitlist_slot_member'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    slot_id = db.Column(db.Integer, db.ForeignKey('interview_slot.id', ondelete='CASCADE'), nullable=False)
+    member_id = db.Column(db.Integer, db.ForeignKey('member.id', ondelete='CASCADE'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    member = db.relationship('Member')
+
+class ImportHistory(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    source = db.Column(db.String(20), nullable=False)  # 'scrape' or 'csv'
+    content_hash = db.Column(db.String(64), nullable=False, index=True)
+    district_hashes = db.Column(db.Text, nullable=False)  # JSON {district name: hash}
+    district_count = db.Column(db.Integer, nullable=False, default=0)
+    member_count = db.Column(db.Integer, nullable=False, default=0)
+    applied = db.Column(db.Boolean, nullable=False, default=False)
+
+class SyncRun(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    trigger = db.Column(db.String(20), nullable=False)  # 'scheduled' or 'manual'
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, applied, unchanged, failed
+    message = db.Column(db.Text, nullable=True)
+    districts_imported = db.Column(db.Integer, nullable=False, default=0)
+    members_found = db.Column(db.Integer, nullable=False, default=0)
+    import_id = db.Column(db.Integer, db.ForeignKey('import_history.id'), nullable=True)
+
+    @property
+    def duration_seconds(self):
+        if not self.finished_at:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+class Notification(db.Model):
+    __table_args__ = (
+        # A member hears about a campaign at most once per channel
+        db.Index('ix_notification_member_channel_campaign', 'member_id', 'channel', 'campaign', unique=True),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(db.String(36), nullable=False, index=True)  # one admin send
+    member_id = db.Column(db.Integer, db.ForeignKey('member.id', ondelete='SET NULL'), nullable=True)
+    channel = db.Column(db.String(10), nullable=False)  # 'email' or 'sms'
+    campaign = db.Column(db.String(100), nullable=True)  # e.g. 'interview-invite'; repeat sends are suppressed
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(200), nullable=True)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='pending', index=True)  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)  # when a dispatcher marked it 'sending'
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    member = db.relationship('Member')
+
+def send_email_notifications(notifications):
+    messages = []
+    for n in notifications:
+        msg = Message(n.subject, sender=app.config['MAIL_USERNAME'], recipients=[n.recipient])
+        msg.body = n.body
+        messages.append((n.id, msg))
+    return send_email_batch(mail, messages)
+
+def send_sms_notifications(notifications):
+    if not sms_sender:
+        return {n.id: 'Twilio is not configured' for n in notifications}
+    return sms_sender.send_batch([(n.id, n.recipient, n.body) for n in notifications])
+
+notification_dispatcher = NotificationDispatcher(app, db, Notification, {
+    'email': send_email_notifications,
+    'sms': send_sms_notifications,
+})
+
+DEFAULT_CAMPAIGN = 'interview-invite'
+
+def notification_recipients(district_id=None, unbooked_only=False):
+    """Members in a companionship, optionally limited to a district and to those
+    without a booking in a slot that hasn't started yet (one LEFT JOIN ... IS NULL)."""
+    query = Member.query.join(Team, Member.team_id == Team.id)
+    if district_id:
+        query = query.filter(Team.district_id == district_id)
+    if unbooked_only:
+        now = datetime.now()
+        upcoming = Booking.__table__.join(InterviewSlot.__table__, Booking.slot_id == InterviewSlot.id)
+        query = query.outerjoin(upcoming, and_(Booking.member_id == Member.id, slot_not_started(now))
+                                ).filter(Booking.id.is_(None))
+    return query
+
+def slot_not_started(now):
+    """SQL condition: the InterviewSlot starts at or after `now`."""
+    return or_(InterviewSlot.date > now.date(),
+               and_(InterviewSlot.date == now.date(), InterviewSlot.start_time >= now.time()))
+
+def enqueue_member_notifications(messages, campaign):
+    """Queue (member, subject, email body, sms body) messages by email and SMS, skipping
+    anyone already messaged on that channel for this campaign. Returns (batch_id, queued, skipped)."""
+    batch_id = str(uuid.uuid4())
+    member_ids = [member.id for member, _, _, _ in messages]
+    already_sent = set(db.session.query(Notification.member_id, Notification.channel)
+                       .filter(Notification.campaign == campaign, Notification.member_id.in_(member_ids)).all())
+    queued = skipped = 0
+    for member, subject, email_body, sms_body in messages:
+        channels = []
+        if member.email:
+            channels.append(('email', member.email, subject, email_body))
+        if member.phone and twilio_client:
+            channels.append(('sms', member.phone, None, sms_body))
+        for channel, recipient, channel_subject, body in channels:
+            if (member.id, channel) in already_sent:
+                skipped += 1
+                continue
+            db.session.add(Notification(batch_id=batch_id, member_id=member.id, channel=channel, campaign=campaign,
+                                        recipient=recipient, subject=channel_subject, body=body))
+            queued += 1
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent send of the same campaign got there first
+        db.session.rollback()
+        return batch_id, 0, queued + skipped
+    notification_dispatcher.wake()
+    return batch_id, queued, skipped
+
+def enqueue_scheduling_links(members, campaign=DEFAULT_CAMPAIGN):
+    """Queue each member's scheduling link; returns (batch_id, queued, skipped)."""
+    messages = []
+    for member in members:
+        link = url_for('schedule', token=member.token, _external=True)
+        messages.append((member, 'Interview Scheduling', f'Please schedule your interview: {link}', f'Interview link: {link}'))
+    return enqueue_member_notifications(messages, campaign)
+
+def slot_start(slot):
+    return datetime.combine(slot.date, slot.start_time)
+
+def send_booking_reminder(booking_id, label):
+    """Called by the reminder timer when a booking's reminder is due."""
+    with app.app_context():
+        booking = db.session.get(Booking, booking_id)
+        if not booking:
+            return
+        starts_at = slot_start(booking.slot)
+        if starts_at <= datetime.now():
+            return
+        offset = dict(reminder_scheduler.offsets).get(label)
+        if offset is not None and starts_at - offset > datetime.now() + timedelta(minutes=1):
+            # The slot was moved later since this reminder was queued
+            reminder_scheduler.schedule_booking(booking.id, starts_at)
+            return
+        when = f"{booking.slot.date.strftime('%A, %B %d')} at {booking.slot.start_time.strftime('%I:%M %p')}"
+        interviewer = db.session.get(District, booking.slot.district_id).interviewer_name
+        body = f'Reminder: your ministering interview with {interviewer} is {when}.'
+        enqueue_member_notifications([(booking.member, 'Interview Reminder', body, body)],
+                                     campaign=f'reminder-{label}:booking-{booking.id}')
+
+reminder_scheduler = ReminderScheduler(send_booking_reminder)
+
+def load_reminders():
+    """Queue reminders for every booking in a slot that hasn't started yet (once, at startup)."""
+    today = datetime.now().date()
+    rows = (db.session.query(Booking.id, InterviewSlot.date, InterviewSlot.start_time)
+            .join(InterviewSlot, Booking.slot_id == InterviewSlot.id)
+            .filter(InterviewSlot.date >= today).all())
+    for booking_id, slot_date, start_time in rows:
+        reminder_scheduler.schedule_booking(booking_id, datetime.combine(slot_date, start_time))
+
+# Keep the reminder queue in step with committed booking changes instead of rescanning
+@event.listens_for(db.session, 'after_flush')
+def track_booking_changes(session, flush_context):
+    changes = session.info.setdefault('booking_changes', [])
+    for obj in session.new:
+        if isinstance(obj, Booking):
+            slot = session.get(InterviewSlot, obj.slot_id)
+            changes.append(('schedule', obj.id, slot_start(slot)))
+    for obj in session.deleted:
+        if isinstance(obj, Booking):
+            changes.append(('cancel', obj.id, None))
+
+@event.listens_for(db.session, 'after_commit')
+def apply_booking_changes(session):
+    for action, booking_id, starts_at in session.info.pop('booking_changes', []):
+        if action == 'schedule':
+            reminder_scheduler.schedule_booking(booking_id, starts_at)
+        else:
+            reminder_scheduler.cancel_booking(booking_id)
+    for event_type, payload in session.info.pop('pending_events', []):
+        event_bus.publish(event_type, payload)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_booking_changes(session):
+    session.info.pop('booking_changes', None)
+    session.info.pop('pending_events', None)
+
+# Per-district version counters for the page caches. ORM changes are picked up at
+# flush; bulk statements report the districts they touch with touch_districts().
+district_versions = DistrictVersions()
+DISTRICT_LIST = 'district-list'  # pseudo-district bumped when districts are added, edited or removed
+
+def touch_districts(district_ids):
+    """Mark districts as changed by the current transaction (bumped on commit)."""
+    db.session.info.setdefault('touched_districts', set()).update(d for d in district_ids if d is not None)
+
+def slot_district(session, slot_id):
+    slot = session.get(InterviewSlot, slot_id)
+    if slot is not None:
+        return slot.district_id
+    return session.query(InterviewSlot.district_id).filter_by(id=slot_id).scalar()
+
+def team_district(session, team_id):
+    team = session.get(Team, team_id) if team_id else None
+    return team.district_id if team else None
+
+def changed_districts(session, obj):
+    if isinstance(obj, District):
+        return {obj.id, DISTRICT_LIST}
+    if isinstance(obj, (InterviewSlot, Team, SlotRule)):
+        return {obj.district_id}
+    if isinstance(obj, (Booking, WaitlistEntry)):
+        return {slot_district(session, obj.slot_id)}
+    if isinstance(obj, SlotRuleException):
+        rule = session.get(SlotRule, obj.rule_id)
+        return {rule.district_id} if rule else set()
+    if isinstance(obj, Member):
+        # A reassigned member changes both the old and the new district
+        history = get_history(obj, 'team_id')
+        team_ids = {obj.team_id, *history.added, *history.deleted}
+        return {team_district(session, team_id) for team_id in team_ids}
+    return set()
+
+@event.listens_for(db.session, 'after_flush')
+def track_district_changes(session, flush_context):
+    touched = session.info.setdefault('touched_districts', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        touched.update(d for d in changed_districts(session, obj) if d is not None)
+
+@event.listens_for(db.session, 'after_commit')
+def bump_district_versions(session):
+    touched = session.info.pop('touched_districts', None)
+    if touched:
+        district_versions.bump(touched)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_district_changes(session):
+    session.info.pop('touched_districts', None)
+
+# Conditional GETs: views derive a strong ETag from the version counters and
+# answer If-None-Match before touching the database.
+def view_etag(*parts):
+    # A page carrying a flash message is a one-off; never tag it
+    if session.get('_flashes'):
+        return None
+    return make_etag(*parts)
+
+def not_modified(etag):
+    """A 304 response if the client already has this version, else None."""
+    if etag and request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return None
+
+def tagged(body, etag):
+    response = make_response(body)
+    if etag:
+        response.set_etag(etag)
+        # Let browsers keep the page but revalidate it on every use
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+event_bus = EventBus()
+
+def queue_event(event_type, booking, reason):
+    """Publish a booking event once the current transaction commits."""
+    member = booking.member
+    queue_booking_event(event_type, member.id, member.token, booking.slot_id, slot_start(booking.slot), reason,
+                        booking_id=booking.id)
+
+def queue_booking_event(event_type, member_id, token, slot_id, starts_at, reason, booking_id=None):
+    db.session.info.setdefault('pending_events', []).append((event_type, {
+        'member_id': member_id,
+        'slot_id': slot_id,
+        'booking_id': booking_id,
+        'starts_at': starts_at,
+        'reason': reason,
+        'schedule_url': url_for('schedule', token=token, _external=True) if has_request_context() else None,
+    }))
+
+def cancel_bookings(bookings, reason):
+    """Delete bookings made for members, announcing each as booking-cancelled on commit.
+    Returns the ids of the slots that lost a booking."""
+    slot_ids = set()
+    for booking in bookings:
+        queue_event(BOOKING_CANCELLED, booking, reason)
+        slot_ids.add(booking.slot_id)
+        db.session.delete(booking)
+    return slot_ids
+
+def slot_team_id(slot_id):
+    """Team that owns a slot through its existing bookings (None if the slot is empty)."""
+    return (db.session.query(Member.team_id).join(Booking, Booking.member_id == Member.id)
+            .filter(Booking.slot_id == slot_id).limit(1).scalar())
+
+def lock_slot(slot_id):
+    """Load a slot for booking into it, holding its row until commit so concurrent
+    bookings for it queue up (FOR UPDATE on PostgreSQL; SQLite leaves it out)."""
+    return InterviewSlot.query.filter_by(id=slot_id).with_for_update().first()
+
+def overbooked_slots(slot_ids):
+    """Ids of these slots holding more bookings than places, or members of more than
+    one team. Run after flushing new bookings: the INSERT holds SQLite's write lock,
+    so the counts include whatever a concurrent request committed first."""
+    return {slot_id for (slot_id,) in
+            db.session.query(InterviewSlot.id).join(Booking, Booking.slot_id == InterviewSlot.id)
+            .join(Member, Booking.member_id == Member.id)
+            .filter(InterviewSlot.id.in_(list(slot_ids)))
+            .group_by(InterviewSlot.id, InterviewSlot.max_slots)
+            .having(or_(func.count(Booking.id) > InterviewSlot.max_slots,
+                        func.count(func.distinct(Member.team_id)) > 1))}
+
+def promote_waitlist(slot_ids):
+    """Fill free places in these slots from the head of their waitlists, inside the
+    caller's transaction. Returns the bookings created."""
+    db.session.flush()
+    now = datetime.now()
+    promoted = []
+    for slot_id in slot_ids:
+        slot = db.session.get(InterviewSlot, slot_id)
+        # A slot that has started is past booking
+        if not slot or slot_start(slot) <= now:
+            continue
+        booked = Booking.query.filter_by(slot_id=slot_id).count()
+        while booked < slot.max_slots:
+            # Only members still in the slot's district, and not already booked elsewhere
+            already_booked = (db.session.query(Booking.id).join(InterviewSlot, Booking.slot_id == InterviewSlot.id)
+                              .filter(Booking.member_id == Member.id, slot_not_started(now)).exists())
+            query = (WaitlistEntry.query.join(Member, WaitlistEntry.member_id == Member.id)
+                     .join(Team, Member.team_id == Team.id)
+                     .filter(WaitlistEntry.slot_id == slot_id, Team.district_id == slot.district_id, ~already_booked))
+            team_id = slot_team_id(slot_id)
+            if team_id:
+                query = query.filter(Member.team_id == team_id)
+            entry = query.order_by(WaitlistEntry.position).first()
+            if not entry:
+                break
+            member = entry.member
+            # Whoever deletes the entry owns the promotion; a concurrent cancellation moves on
+            if not WaitlistEntry.query.filter_by(id=entry.id).delete(synchronize_session='fetch'):
+                continue
+            booking = Booking(slot=slot, member=member)
+            db.session.add(booking)
+            db.session.flush()
+            queue_event(WAITLIST_PROMOTED, booking, 'waitlist')
+            promoted.append(booking)
+            booked += 1
+    return promoted
+
+def clear_waitlists(slot_ids=None, member_ids=None):
+    """Drop waitlist entries for slots being deleted or members leaving their team."""
+    if slot_ids:
+        touch_districts(district_id for (district_id,) in db.session.query(InterviewSlot.district_id)
+                        .filter(InterviewSlot.id.in_(list(slot_ids))).distinct())
+        WaitlistEntry.query.filter(WaitlistEntry.slot_id.in_(list(slot_ids))).delete(synchronize_session=False)
+    if member_ids:
+        touch_districts(district_id for (district_id,) in db.session.query(InterviewSlot.district_id)
+                        .join(WaitlistEntry, WaitlistEntry.slot_id == InterviewSlot.id)
+                        .filter(WaitlistEntry.member_id.in_(list(member_ids))).distinct())
+        WaitlistEntry.query.filter(WaitlistEntry.member_id.in_(list(member_ids))).delete(synchronize_session=False)
+
+def format_slot_time(starts_at):
+    return f"{starts_at.strftime('%A, %B %d')} at {starts_at.strftime('%I:%M %p')}"
+
+def send_booking_change_notice(member_id, events):
+    """One consolidated notice for everything that happened to a member's bookings in the window."""
+    with app.app_context():
+        member = db.session.get(Member, member_id)
+        if not member:
+            return
+        changes = summarize_changes(events)
+        lines = [f"- Moved: {format_slot_time(old['starts_at'])} -> {format_slot_time(new['starts_at'])}"
+                 for old, new in changes['moved']]
+        lines += [f"- Cancelled: {format_slot_time(p['starts_at'])}" for p in changes['cancelled']]
+        lines += [f"- Added: {format_slot_time(p['starts_at'])}" for p in changes['added']]
+        if not lines:
+            return
+        link = next((p['schedule_url'] for _, p in events if p.get('schedule_url')), None)
+        body = 'Your ministering interview booking was changed by an administrator:\n' + '\n'.join(lines)
+        if changes['cancelled'] and link:
+            body += f'\nPlease choose a new time: {link}'
+        enqueue_member_notifications([(member, 'Interview Booking Changed', body, body)],
+                                     campaign=f'booking-change:{uuid.uuid4().hex}')
+
+booking_change_coalescer = MemberEventCoalescer(send_booking_change_notice)
+event_bus.subscribe(BOOKING_CANCELLED, booking_change_coalescer)
+event_bus.subscribe(BOOKING_ADDED, booking_change_coalescer)
+
+def send_waitlist_notice(member_id, booking_id, starts_at):
+    with app.app_context():
+        member = db.session.get(Member, member_id)
+        if member:
+            body = f'Good news: a place opened up and you are now booked for your ministering interview on {format_slot_time(starts_at)}.'
+            enqueue_member_notifications([(member, 'Interview Booked from Waitlist', body, body)],
+                                         campaign=f'waitlist-promoted:booking-{booking_id}')
+
+def on_waitlist_promoted(event_type, payload):
+    # Runs inside after_commit, where the session can't be used; queue the notice from a thread
+    threading.Thread(target=send_waitlist_notice, daemon=True,
+                     args=(payload['member_id'], payload['booking_id'], payload['starts_at'])).start()
+
+event_bus.subscribe(WAITLIST_PROMOTED, on_waitlist_promoted)
+
 # Routes
+def existing_slot_keys(district_ids, start, end):
+    """{(district_id, date, start_time)} of the slots already on the calendar."""
+    return set(db.session.query(InterviewSlot.district_id, InterviewSlot.date, InterviewSlot.start_time)
+               .filter(InterviewSlot.district_id.in_(list(district_ids)), InterviewSlot.date.between(start, end)))
+
+def rule_slots(rules, start, end):
+    """Unsaved InterviewSlots for the occurrences of `rules` between start and end
+    that are not on the calendar yet."""
+    rules = list(rules)
+    if not rules:
+        return []
+    seen = existing_slot_keys({rule.district_id for rule in rules}, start, end)
+    slots = []
+    for rule in rules:
+        for slot_date, slot_time in occurrences(rule.weekday, rule.start_time, rule.duration, rule.num_slots,
+                                                rule.start_date, rule.end_date, start, end, rule.cancelled):
+            key = (rule.district_id, slot_date, slot_time)
+            if key not in seen:
+                seen.add(key)
+                slots.append(InterviewSlot(district_id=rule.district_id, date=slot_date, start_time=slot_time,
+                                           duration=rule.duration, max_slots=rule.max_slots, rule_id=rule.id))
+    return slots
+
+INSERT_CHUNK = 500
+
+def insert_slots(rows):
+    """Bulk-insert slot dicts, silently skipping any (district, date, start time) that
+    already exists. Returns how many rows were actually inserted."""
+    dialect = db.session.get_bind().dialect.name
+    insert = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}.get(dialect)
+    created = 0
+    if insert is None:
+        # No INSERT ... ON CONFLICT here; a savepoint per row lets a duplicate fail on its own
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(InterviewSlot.__table__.insert().values(row))
+                created += 1
+            except IntegrityError:
+                pass
+    else:
+        for i in range(0, len(rows), INSERT_CHUNK):
+            # One multi-row INSERT per chunk, so rowcount is exact on both dialects
+            stmt = insert(InterviewSlot).values(rows[i:i + INSERT_CHUNK]).on_conflict_do_nothing(
+                index_elements=['district_id', 'date', 'start_time'])
+            created += db.session.execute(stmt).rowcount
+    if created:
+        touch_districts({row['district_id'] for row in rows})
+    return created
+
+def active_rules(district_ids, start, end):
+    return SlotRule.query.filter(SlotRule.district_id.in_(list(district_ids)),
+                                 SlotRule.start_date <= end, SlotRule.end_date >= start).all()
+
+def materialize_slots(district_ids, start=None, end=None):
+    """Create the rule slots for the given districts that fall in the window a page
+    is about to show (the visible window by default)."""
+    if start is None:
+        start, end = visible_window()
+    slots = rule_slots(active_rules(district_ids, start, end), start, end)
+    if not slots:
+        return 0
+    # A concurrent request may materialise the same window; the unique index makes that harmless
+    created = insert_slots([{'district_id': slot.district_id, 'date': slot.date, 'start_time': slot.start_time,
+                             'duration': slot.duration, 'max_slots': slot.max_slots, 'rule_id': slot.rule_id}
+                            for slot in slots])
+    db.session.commit()
+    return created
+
+# Set-based deletes. Each reads what the booking notices and reminder queue need in
+# one query, then removes rows with bulk DELETEs instead of loading and deleting
+# objects one at a time. They run inside the caller's transaction; the caller commits.
+
+def delete_bookings_where(*criteria, reason):
+    """Delete the bookings matching `criteria` (on Booking columns), announcing each
+    as booking-cancelled on commit. Returns the ids of the slots that lost a booking."""
+    rows = (db.session.query(Booking.id, Booking.slot_id, Member.id, Member.token, InterviewSlot.date, InterviewSlot.start_time,
+                             InterviewSlot.district_id)
+            .outerjoin(Member, Booking.member_id == Member.id)
+            .outerjoin(InterviewSlot, Booking.slot_id == InterviewSlot.id)
+            .filter(*criteria).all())
+    if not rows:
+        return set()
+    changes = db.session.info.setdefault('booking_changes', [])
+    touch_districts({row.district_id for row in rows})
+    for booking_id, slot_id, member_id, token, slot_date, start_time, _ in rows:
+        changes.append(('cancel', booking_id, None))
+        if member_id is None or slot_date is None:
+            continue  # orphaned by an old delete; nobody to tell
+        queue_booking_event(BOOKING_CANCELLED, member_id, token, slot_id, datetime.combine(slot_date, start_time), reason,
+                            booking_id=booking_id)
+    db.session.execute(delete(Booking).where(Booking.id.in_([row[0] for row in rows])))
+    return {row[1] for row in rows}
+
+def delete_slots_where(*criteria, reason='slot deleted', keep_cancelled=False):
+    """Delete the slots matching `criteria` with their bookings and waitlists.
+    With keep_cancelled, rule slots are recorded as exceptions so their rule does
+    not materialise them again. Returns the number of slots deleted."""
+    slots = db.session.execute(select(InterviewSlot.id, InterviewSlot.rule_id, InterviewSlot.date, InterviewSlot.start_time,
+                                      InterviewSlot.district_id).where(*criteria)).all()
+    if not slots:
+        return 0
+    touch_districts({slot.district_id for slot in slots})
+    slot_ids = [slot.id for slot in slots]
+    delete_bookings_where(Booking.slot_id.in_(slot_ids), reason=reason)
+    db.session.execute(delete(WaitlistEntry).where(WaitlistEntry.slot_id.in_(slot_ids)))
+    if keep_cancelled:
+        cancelled = {(slot.rule_id, slot.date, slot.start_time) for slot in slots if slot.rule_id}
+        if cancelled:
+            existing = set(db.session.query(SlotRuleException.rule_id, SlotRuleException.date, SlotRuleException.start_time)
+                           .filter(SlotRuleException.rule_id.in_({rule_id for rule_id, _, _ in cancelled})))
+            db.session.add_all(SlotRuleException(rule_id=rule_id, date=slot_date, start_time=start_time)
+                               for rule_id, slot_date, start_time in cancelled - existing)
+    db.session.execute(delete(InterviewSlot).where(InterviewSlot.id.in_(slot_ids)))
+    return len(slot_ids)
+
+def delete_rules_where(*criteria):
+    """Delete slot rules and their exceptions; any slots still pointing at them are kept."""
+    rule_ids = select(SlotRule.id).where(*criteria).scalar_subquery()
+    touch_districts(db.session.scalars(select(SlotRule.district_id).where(*criteria).distinct()))
+    db.session.execute(update(InterviewSlot).where(InterviewSlot.rule_id.in_(rule_ids)).values(rule_id=None))
+    db.session.execute(delete(SlotRuleException).where(SlotRuleException.rule_id.in_(rule_ids)))
+    db.session.execute(delete(SlotRule).where(*criteria))
+
+def delete_members_where(*criteria, reason):
+    """Delete members with their bookings and waitlist places; their notification history
+    is kept without the member link. Returns the ids of the slots that lost a booking."""
+    member_ids = select(Member.id).where(*criteria).scalar_subquery()
+    touch_districts(db.session.scalars(select(Team.district_id).join(Member, Member.team_id == Team.id)
+                                       .where(*criteria).distinct()))
+    freed_slots = delete_bookings_where(Booking.member_id.in_(member_ids), reason=reason)
+    db.session.execute(delete(WaitlistEntry).where(WaitlistEntry.member_id.in_(member_ids)))
+    db.session.execute(update(Notification).where(Notification.member_id.in_(member_ids)).values(member_id=None))
+    db.session.execute(delete(Member).where(*criteria))
+    return freed_slots
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+DistrictSummary = namedtuple('DistrictSummary', 'id name interviewer_name organization')
+district_list_cache = SnapshotCache()
+calendar_fragments = FragmentCache()
+
+def district_list():
+    """Every district as a DistrictSummary, cached until one is added, edited or removed."""
+    return district_list_cache.get('districts', district_versions.get(DISTRICT_LIST), lambda: [
+        DistrictSummary(*row) for row in db.session.query(District.id, District.name, District.interviewer_name,
+                                                          District.organization).order_by(District.id)])
+
+def render_calendar_block(district_id, window_start, window_end):
+    """One district's card on the admin calendar, loaded in a fixed number of queries."""
+    district = db.session.get(District, district_id, options=[selectinload(District.teams).selectinload(Team.members)])
+    slots = (InterviewSlot.query.filter(InterviewSlot.district_id == district_id,
+                                        InterviewSlot.date.between(window_start, window_end))
+             .options(selectinload(InterviewSlot.bookings).joinedload(Booking.member)
+                      .joinedload(Member.team).selectinload(Team.members))
+             .order_by(InterviewSlot.date, InterviewSlot.start_time).all())
+    return render_template('admin_calendar_district.html', district=district, slots=slots)
+
+def calendar_block(district_id, today, window_start, window_end):
+    """A district's calendar card, re-rendered only when the district changed (or the day rolled over)."""
+    return Markup(calendar_fragments.get(('calendar', district_id), (district_versions.get(district_id), today),
+                                         lambda: render_calendar_block(district_id, window_start, window_end)))
+
 @app.route('/admin')
 def admin():
     today = datetime.now().date()
     selected_district_id = request.args.get('district', type=int)
+    # The calendar lists every district in its filter, so any change anywhere is a new version
+    etag = view_etag('admin', selected_district_id, district_versions.global_version, today)
+    response = not_modified(etag)
+    if response:
+        return response
     
+    all_districts = district_list()  # For the filter dropdown
     if selected_district_id:
-        districts = District.query.filter_by(id=selected_district_id).all()
+        districts = [district for district in all_districts if district.id == selected_district_id]
     else:
-        districts = District.query.all()
+        districts = all_districts
     
-    district_slots = {}
-    for district in districts:
-        slots = InterviewSlot.query.filter_by(district_id=district.id).filter(InterviewSlot.date >= today).order_by(InterviewSlot.date, InterviewSlot.start_time).all()
-        district_slots[district.id] = slots
-    
-    all_districts = District.query.all()  # For the filter dropdown
-    return render_template('admin_calendar.html', districts=districts, district_slots=district_slots, all_districts=all_districts, selected_district_id=selected_district_id)
+    window_start, window_end = visible_window(today)
+    materialize_slots([district.id for district in districts], window_start, window_end)  # may bump versions, so first
+    district_blocks = [calendar_block(district.id, today, window_start, window_end) for district in districts]
+    return tagged(render_template('admin_calendar.html', district_blocks=district_blocks, all_districts=all_districts, selected_district_id=selected_district_id), etag)
+
+@app.route('/admin/calendar/<int:district_id>')
+def admin_calendar_block(district_id):
+    """Just one district's card, for the calendar to refresh in place after an API call."""
+    today = datetime.now().date()
+    etag = view_etag('calendar-block', district_id, district_versions.get(district_id), today)
+    response = not_modified(etag)
+    if response:
+        return response
+    District.query.get_or_404(district_id)
+    window_start, window_end = visible_window(today)
+    materialize_slots([district_id], window_start, window_end)
+    # Materialising may have added slots, which bumps the district's version
+    etag = view_etag('calendar-block', district_id, district_versions.get(district_id), today)
+    return tagged(calendar_block(district_id, today, window_start, window_end), etag)
 
 @app.route('/admin/districts')
 def manage_districts():
@@ -108,6 +768,18 @@ def scrape_data():
             flash('Username and password are required.')
             return redirect(url_for('scrape_data'))
         
+        # Organizations to extract from the one login session
+        selected_organizations = [o for o in request.form.getlist('organizations') if o in ORGANIZATIONS] or [DEFAULT_ORGANIZATION]
+        
+        # Resume from the checkpoint of a failed run if one was requested
+        resume_id = request.form.get('resume_id')
+        checkpoint = None
+        if resume_id:
+            with progress_lock:
+                previous = progress_store.get(resume_id)
+                if previous and previous.get('checkpoint'):
+                    checkpoint = previous['checkpoint']
+        
         # Run scraping in a thread to avoid blocking
         progress_id = str(uuid.uuid4())
         with progress_lock:
@@ -118,13 +790,18 @@ def scrape_data():
                 'total_steps': 10,
                 'companionships_found': 0,
                 'members_found': 0,
-                'errors': []
+                'errors': [],
+                'checkpoint': checkpoint,
+                'organizations': selected_organizations
             }
         
         def run_scrape():
+            trace = None
             try:
                 # Import the scraper module
                 from app_scraper import scrape_ministering_data
+                from scrape_tracing import ScrapeTrace
+                trace = ScrapeTrace()
 
                 def progress_callback(message):
                     # Update progress store with the message
@@ -145,16 +822,23 @@ def scrape_data():
                         else:
                             progress_store[progress_id]['status'] = 'running'
 
+                def checkpoint_callback(state):
+                    # Save extracted rows and completed popups so a retry can resume
+                    with progress_lock:
+                        progress_store[progress_id]['checkpoint'] = state
+
                 # Run the scraper
-                results = scrape_ministering_data(username, password, progress_callback)
+                results = scrape_ministering_data(username, password, progress_callback, trace=trace,
+                                                  checkpoint=checkpoint, on_checkpoint=checkpoint_callback,
+                                                  organizations=selected_organizations)
 
                 if results:
                     with progress_lock:
                         progress_store[progress_id]['status'] = 'completed'
                         progress_store[progress_id]['message'] = 'Scraping completed'
                         progress_store[progress_id]['step'] = 10
-                        progress_store[progress_id]['districts_found'] = len(set(row['district'] for row in results))
-                        progress_store[progress_id]['companionships_found'] = len(set(row['companionship_id'] for row in results))
+                        progress_store[progress_id]['districts_found'] = len(set((row.get('organization'), row['district']) for row in results))
+                        progress_store[progress_id]['companionships_found'] = len(set((row.get('organization'), row['companionship_id']) for row in results))
                         progress_store[progress_id]['members_found'] = len(results)
                         progress_store[progress_id]['scraped_districts'] = group_results_by_district(results)
                         progress_store[progress_id]['raw_results'] = results  # Store raw results for CSV download
@@ -173,13 +857,29 @@ def scrape_data():
                     progress_store[progress_id]['status'] = 'error'
                     progress_store[progress_id]['message'] = str(e)
                     progress_store[progress_id]['errors'].append(str(e))
+            finally:
+                # Keep the per-phase timing breakdown with the job, even for failed runs
+                if trace:
+                    with progress_lock:
+                        progress_store[progress_id]['timings'] = trace.summary()
         
         thread = threading.Thread(target=run_scrape)
         thread.start()
         
         return redirect(url_for('scrape_progress', progress_id=progress_id))
     
-    return render_template('scrape.html')
+    # Offer to resume a failed run from its last checkpoint
+    resume_id = request.args.get('resume')
+    resume_checkpoint = None
+    selected_organizations = [DEFAULT_ORGANIZATION]
+    if resume_id:
+        with progress_lock:
+            previous = progress_store.get(resume_id)
+            if previous and previous.get('checkpoint'):
+                resume_checkpoint = previous['checkpoint']
+                selected_organizations = previous.get('organizations') or selected_organizations
+    return render_template('scrape.html', resume_id=resume_id if resume_checkpoint else None, resume_checkpoint=resume_checkpoint,
+                           selected_organizations=selected_organizations)
 
 @app.route('/admin/scrape_progress/<progress_id>')
 def scrape_progress(progress_id):
@@ -204,7 +904,7 @@ def download_csv(progress_id):
     import csv
     
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=['district', 'interviewer', 'name', 'phone', 'email', 'companionship_id'])
+    writer = csv.DictWriter(output, fieldnames=['organization', 'district', 'interviewer', 'name', 'phone', 'email', 'companionship_id'])
     writer.writeheader()
     for row in raw_results:
         writer.writerow(row)
@@ -246,32 +946,7 @@ def import_csv():
             results = list(reader)
             
             # Group by district and companionship_id
-            from collections import defaultdict
-            districts_data = defaultdict(lambda: {'companionships': defaultdict(list)})
-            for row in results:
-                district_name = row['district']
-                interviewer = row['interviewer']
-                comp_id = row['companionship_id']
-                districts_data[district_name]['interviewer'] = interviewer
-                districts_data[district_name]['companionships'][comp_id].append({
-                    'name': row['name'],
-                    'phone': row['phone'],
-                    'email': row['email']
-                })
-            
-            scraped_districts = []
-            for district_name, data in districts_data.items():
-                companionships = []
-                for comp_id, members in data['companionships'].items():
-                    companionships.append({
-                        'companionship_id': comp_id,
-                        'members': members
-                    })
-                scraped_districts.append({
-                    'name': district_name,
-                    'interviewer': data['interviewer'],
-                    'companionships': companionships
-                })
+            scraped_districts = group_results_by_district(results)
             
             # Store in session for confirmation
             session['uploaded_districts'] = scraped_districts
@@ -282,31 +957,16 @@ def import_csv():
             return redirect(request.url)
     
     return render_template('import_csv.html')
-def send_all_notifications():
-    districts = District.query.all()
-    total_sent = 0
-    for district in districts:
-        for team in district.teams:
-            for member in team.members:
-                link = url_for('schedule', token=member.token, _external=True)
-                if member.email:
-                    msg = Message('Interview Scheduling', sender=app.config['MAIL_USERNAME'], 
-                                recipients=[member.email])
-                    msg.body = f'Please schedule your interview: {link}'
-                    mail.send(msg)
-                    total_sent += 1
-                if member.phone and twilio_client:
-                    twilio_client.messages.create(body=f'Interview link: {link}', from_=twilio_number, to=member.phone)
-                    total_sent += 1
-    flash(f'Notifications sent to {total_sent} contacts!')
-    return redirect(url_for('admin'))
 
 @app.route('/admin/district/new', methods=['GET', 'POST'])
 def new_district():
     if request.method == 'POST':
         name = request.form['name']
         interviewer = request.form['interviewer']
-        district = District(name=name, interviewer_name=interviewer)
+        organization = request.form.get('organization', DEFAULT_ORGANIZATION)
+        if organization not in ORGANIZATIONS:
+            organization = DEFAULT_ORGANIZATION
+        district = District(name=name, interviewer_name=interviewer, organization=organization)
         db.session.add(district)
         db.session.commit()
         flash('District created successfully!')
@@ -315,8 +975,12 @@ def new_district():
 
 @app.route('/admin/district/<int:id>')
 def district_detail(id):
+    etag = view_etag('district', id, district_versions.get(id))
+    response = not_modified(etag)
+    if response:
+        return response
     district = District.query.get_or_404(id)
-    return render_template('district_detail.html', district=district)
+    return tagged(render_template('district_detail.html', district=district), etag)
 
 @app.route('/admin/district/<int:id>/team/new', methods=['GET', 'POST'])
 def new_team(id):
@@ -328,16 +992,18 @@ def new_team(id):
         
         # Handle existing members
         existing_member_ids = request.form.getlist('existing_members[]')
+        moved = []
         for member_id in existing_member_ids:
             member = Member.query.get(int(member_id))
-            if member and member.team.district_id == id:
-                # Cancel existing bookings
-                bookings = Booking.query.filter_by(member_id=member.id).all()
-                for booking in bookings:
-                    db.session.delete(booking)
+            if member and member.team and member.team.district_id == id:
+                moved.append(member.id)
                 # Reassign to new team
                 member.team_id = team.id
         
+        # Cancel their bookings and hand the places to the waitlist
+        freed_slots = delete_bookings_where(Booking.member_id.in_(moved), reason='reassigned') if moved else set()
+        clear_waitlists(member_ids=moved)
+        
         # Add new members
         member_names = request.form.getlist('member_name[]')
         member_phones = request.form.getlist('member_phone[]')
@@ -348,6 +1014,7 @@ def new_team(id):
                 member = Member(team_id=team.id, name=name, phone=phone, email=email)
                 db.session.add(member)
         
+        promote_waitlist(freed_slots)
         db.session.commit()
         flash('Companionship created successfully!')
         return redirect(url_for('district_detail', id=id))
@@ -375,58 +1042,176 @@ def manage_slots(id):
                 days_ahead = 7  # Next week if today is the day
             next_date = today + timedelta(days=days_ahead)
             
-            # Generate slots for the next weeks_ahead weeks
-            for i in range(weeks_ahead):
-                slot_date = next_date + timedelta(weeks=i)
-                for j in range(num_slots):
-                    slot_time = (datetime.combine(slot_date, start_time) + timedelta(minutes=duration * j)).time()
-                    slot = InterviewSlot(district_id=id, date=slot_date, start_time=slot_time, 
-                                       duration=duration, max_slots=10)  # Allow up to 10 members per slot
-                    db.session.add(slot)
+            # Store the pattern for the next weeks_ahead weeks; slots are created as pages show them
+            rule = SlotRule(district_id=id, weekday=day_of_week, start_time=start_time, duration=duration,
+                            num_slots=num_slots, max_slots=10,  # Allow up to 10 members per slot
+                            start_date=next_date, end_date=next_date + timedelta(weeks=weeks_ahead - 1))
+            generated = list(occurrences(day_of_week, start_time, duration, num_slots,
+                                         rule.start_date, rule.end_date, rule.start_date, rule.end_date))
+            if not generated:
+                flash('That pattern does not produce any slots.')
+                return redirect(url_for('manage_slots', id=id))
+            # Times already on the calendar, as slots or from another rule, are skipped
+            taken = {(slot_date, slot_time) for _, slot_date, slot_time in existing_slot_keys([id], rule.start_date, rule.end_date)}
+            taken |= {(slot.date, slot.start_time)
+                      for slot in rule_slots(active_rules([id], rule.start_date, rule.end_date), rule.start_date, rule.end_date)}
+            new_slots = [InterviewSlot(district_id=id, date=slot_date, start_time=slot_time, duration=duration, max_slots=10)
+                         for slot_date, slot_time in generated if (slot_date, slot_time) not in taken]
+            skipped = len(generated) - len(new_slots)
+            if not new_slots:
+                flash(f'All {skipped} slots in that pattern are already on the calendar; nothing was added.')
+                return redirect(url_for('manage_slots', id=id))
             
+            # The interviewer may already have slots in another district at these times
+            conflicts = interviewer_conflicts(new_slots)
+            if conflicts and 'allow_conflicts' not in request.form:
+                examples = '; '.join(f"{format_slot_time(b['starts_at'])} overlaps {a['district']} at {a['starts_at'].strftime('%I:%M %p')}"
+                                     for _, a, b in conflicts[:3])
+                overlapping = len({(b['starts_at'], b['district_id']) for _, _, b in conflicts})
+                flash(f'{overlapping} generated slots overlap existing slots for {district.interviewer_name} ({examples}). '
+                      'No slots were created; tick "Create anyway" to override.')
+                return redirect(url_for('manage_slots', id=id))
+            db.session.add(rule)
             db.session.commit()
-            flash(f'Generated {weeks_ahead * num_slots} recurring slots!')
+            flash(f'Added recurring availability: {len(new_slots)} slots over {weeks_ahead} weeks'
+                  + (f', skipped {skipped} already on the calendar.' if skipped else '.'))
             return redirect(url_for('manage_slots', id=id))
         elif request.form.get('action') == 'delete_all':
-            # Delete all slots for this district
-            slots = InterviewSlot.query.filter_by(district_id=id).all()
-            for slot in slots:
-                bookings = Booking.query.filter_by(slot_id=slot.id).all()
-                for booking in bookings:
-                    db.session.delete(booking)
-                db.session.delete(slot)
+            # Delete all slots for this district, and the rules that would recreate them
+            delete_slots_where(InterviewSlot.district_id == id)
+            delete_rules_where(SlotRule.district_id == id)
             db.session.commit()
             flash('All slots deleted!')
             return redirect(url_for('manage_slots', id=id))
         elif request.form.get('action') == 'delete_selected':
             # Delete selected slots
-            slot_ids = request.form.getlist('slot_ids')
-            for slot_id in slot_ids:
-                slot = InterviewSlot.query.get(int(slot_id))
-                if slot and slot.district_id == id:
-                    bookings = Booking.query.filter_by(slot_id=slot.id).all()
-                    for booking in bookings:
-                        db.session.delete(booking)
-                    db.session.delete(slot)
+            slot_ids = [int(slot_id) for slot_id in request.form.getlist('slot_ids')]
+            deleted = delete_slots_where(InterviewSlot.id.in_(slot_ids), InterviewSlot.district_id == id, keep_cancelled=True)
             db.session.commit()
-            flash(f'Deleted {len(slot_ids)} slots!')
+            flash(f'Deleted {deleted} slots!')
+            return redirect(url_for('manage_slots', id=id))
+        elif request.form.get('action') == 'delete_rule':
+            # Drop the pattern and its upcoming slots; past slots stay as history
+            rule = SlotRule.query.get_or_404(request.form.get('rule_id', type=int))
+            if rule.district_id == id:
+                today = datetime.now().date()
+                delete_slots_where(InterviewSlot.rule_id == rule.id, InterviewSlot.date >= today)
+                delete_rules_where(SlotRule.id == rule.id)
+                db.session.commit()
+                flash('Recurring availability removed.')
+            return redirect(url_for('manage_slots', id=id))
+        elif request.form.get('action') == 'cancel_date':
+            # Skip one date of a rule, e.g. a holiday
+            rule = SlotRule.query.get_or_404(request.form.get('rule_id', type=int))
+            try:
+                cancel_date = datetime.strptime(request.form.get('date', ''), '%Y-%m-%d').date()
+            except ValueError:
+                flash('Please pick a date to cancel.')
+                return redirect(url_for('manage_slots', id=id))
+            if rule.district_id == id and (cancel_date, None) not in rule.cancelled:
+                db.session.add(SlotRuleException(rule_id=rule.id, date=cancel_date, start_time=None))
+                delete_slots_where(InterviewSlot.rule_id == rule.id, InterviewSlot.date == cancel_date, reason='date cancelled')
+                db.session.commit()
+                flash(f"Cancelled {cancel_date.strftime('%A, %B %d')}.")
             return redirect(url_for('manage_slots', id=id))
     
-    slots = InterviewSlot.query.filter_by(district_id=id).order_by(InterviewSlot.date, InterviewSlot.start_time).all()
-    return render_template('manage_slots.html', district=district, slots=slots)
+    materialize_slots([id])
+    rules = SlotRule.query.filter_by(district_id=id).order_by(SlotRule.start_date).all()
+    # Past slots pile up season after season, so only upcoming ones are listed unless asked
+    when = request.args.get('when') if request.args.get('when') in ('upcoming', 'past', 'all') else 'upcoming'
+    query, _ = slot_rows()
+    query = query.filter(InterviewSlot.district_id == id)
+    today = datetime.now().date()
+    if when == 'upcoming':
+        query = query.filter(InterviewSlot.date >= today)
+    elif when == 'past':
+        query = query.filter(InterviewSlot.date < today)
+    slots, next_cursor = keyset_page(query, SLOT_ORDER, page_after(*SLOT_CURSOR), ADMIN_PAGE_SIZE,
+                                     key=lambda row: (row.date, row.start_time, row.id))
+    return render_template('manage_slots.html', district=district, slots=slots, rules=rules, when=when,
+                           next_cursor=next_cursor, first_page=not request.args.get('after'))
+
+schedule_cache = SnapshotCache()
+TOKEN_PLACEHOLDER = 'member-token-placeholder'
+
+def district_schedule_snapshot(district_id):
+    """The part of /schedule that is identical for every member of a district: the
+    rendered list of open slots (with a placeholder where the member's token goes)
+    and the full slots with who holds them."""
+    window_start, window_end = visible_window()
+    materialize_slots([district_id], window_start, window_end)
+    rows = (db.session.query(InterviewSlot.id, InterviewSlot.date, InterviewSlot.start_time, InterviewSlot.duration,
+                             InterviewSlot.max_slots, func.count(Booking.id))
+            .outerjoin(Booking, Booking.slot_id == InterviewSlot.id)
+            .filter(InterviewSlot.district_id == district_id, InterviewSlot.date.between(window_start, window_end))
+            .group_by(InterviewSlot.id).order_by(InterviewSlot.date, InterviewSlot.start_time).all())
+    slots = [{'id': slot_id, 'date': slot_date, 'start_time': start_time, 'duration': duration,
+              'max_slots': max_slots, 'booked': booked}
+             for slot_id, slot_date, start_time, duration, max_slots, booked in rows]
+    available = [slot for slot in slots if slot['booked'] < slot['max_slots']]
+    full_slots = [slot for slot in slots if slot['booked'] >= slot['max_slots']]
+    holders = defaultdict(list)
+    if full_slots:
+        for slot_id, member_id, team_id in (db.session.query(Booking.slot_id, Booking.member_id, Member.team_id)
+                                            .join(Member, Booking.member_id == Member.id)
+                                            .filter(Booking.slot_id.in_([slot['id'] for slot in full_slots]))):
+            holders[slot_id].append((member_id, team_id))
+    for slot in full_slots:
+        slot['member_ids'] = {member_id for member_id, _ in holders[slot['id']]}
+        slot['team_id'] = holders[slot['id']][0][1] if holders[slot['id']] else None
+    return {
+        'slots_html': render_template('schedule_slots.html', slots=available, token=TOKEN_PLACEHOLDER),
+        'full_slots': full_slots,
+    }
+
+# token -> district id of members whose schedule page was served, so a revalidation
+# can be answered without looking the member up. Entries go when their district changes.
+schedule_member_districts = {}
+schedule_member_lock = threading.Lock()
+
+def forget_member_districts(district_ids):
+    with schedule_member_lock:
+        for token in [t for t, d in schedule_member_districts.items() if d in district_ids]:
+            del schedule_member_districts[token]
+
+district_versions.subscribe(forget_member_districts)
 
 @app.route('/schedule/<token>')
 def schedule(token):
+    today = datetime.now().date()
+    with schedule_member_lock:
+        known_district_id = schedule_member_districts.get(token)
+    if known_district_id is not None:
+        response = not_modified(view_etag('schedule', token, known_district_id, district_versions.get(known_district_id), today))
+        if response:
+            return response
     member = Member.query.filter_by(token=token).first_or_404()
     district = member.team.district
-    available_slots = InterviewSlot.query.filter_by(district_id=district.id).outerjoin(Booking).group_by(InterviewSlot.id).having(
-        func.count(Booking.id) < InterviewSlot.max_slots).order_by(InterviewSlot.date, InterviewSlot.start_time).all()
-    return render_template('schedule.html', member=member, slots=available_slots)
+    # Read the version before the queries so a concurrent write can only make the tag stale, never wrong
+    version = district_versions.get(district.id)
+    etag = view_etag('schedule', token, district.id, version, today)
+    key = (district.id, today)
+    
+    def compute():
+        # A new day's snapshot is being built; earlier days' can't be asked for again
+        schedule_cache.discard_where(lambda cached: cached[1] < today)
+        return district_schedule_snapshot(district.id)
+    
+    snapshot = schedule_cache.get(key, district_versions.get(district.id), compute)
+    # Only what differs per member is worked out per request
+    slots_html = Markup(snapshot['slots_html'].replace(TOKEN_PLACEHOLDER, member.token))
+    # Full slots held by this member's team can be waitlisted
+    full_slots = [slot for slot in snapshot['full_slots'] if slot['team_id'] == member.team_id]
+    waitlisted = {slot_id for (slot_id,) in db.session.query(WaitlistEntry.slot_id).filter_by(member_id=member.id)}
+    with schedule_member_lock:
+        schedule_member_districts[token] = district.id
+    return tagged(render_template('schedule.html', member=member, district=district, slots_html=slots_html,
+                                  full_slots=full_slots, waitlisted=waitlisted), etag)
 
 @app.route('/book/<int:slot_id>/<token>', methods=['POST'])
 def book_slot(slot_id, token):
     member = Member.query.filter_by(token=token).first_or_404()
-    slot = InterviewSlot.query.get_or_404(slot_id)
+    slot = lock_slot(slot_id) or abort(404)
     
     # Check if already booked
     existing = Booking.query.filter_by(slot_id=slot_id, member_id=member.id).first()
@@ -444,59 +1229,267 @@ def book_slot(slot_id, token):
     if len(slot.bookings) < slot.max_slots:
         booking = Booking(slot_id=slot_id, member_id=member.id)
         db.session.add(booking)
+        WaitlistEntry.query.filter_by(slot_id=slot_id, member_id=member.id).delete()
+        db.session.flush()
+        if overbooked_slots([slot_id]):
+            # Another booking for this slot got in first
+            db.session.rollback()
+            flash('Sorry, someone else just took that slot. Please pick another.')
+            return redirect(url_for('schedule', token=token))
         db.session.commit()
         flash('Slot booked successfully!')
     else:
-        flash('Slot is full.')
+        flash('Slot is full. You can join the waitlist for it below.')
+    
+    return redirect(url_for('schedule', token=token))
+
+@app.route('/waitlist/<int:slot_id>/<token>', methods=['POST'])
+def join_waitlist(slot_id, token):
+    member = Member.query.filter_by(token=token).first_or_404()
+    slot = InterviewSlot.query.get_or_404(slot_id)
+    
+    if Booking.query.filter_by(slot_id=slot_id, member_id=member.id).first():
+        flash('You are already booked for this slot.')
+        return redirect(url_for('schedule', token=token))
+    
+    if slot_start(slot) <= datetime.now():
+        flash('This slot has already started.')
+        return redirect(url_for('schedule', token=token))
+    
+    if not member.team or slot.district_id != member.team.district_id:
+        flash('This slot is not in your district.')
+        return redirect(url_for('schedule', token=token))
+    
+    # Only full slots have a waitlist; a free place is simply booked
+    if Booking.query.filter_by(slot_id=slot_id).count() < slot.max_slots:
+        flash('This slot still has room, so you can book it directly.')
+        return redirect(url_for('schedule', token=token))
+    
+    team_id = slot_team_id(slot_id)
+    if team_id and team_id != member.team_id:
+        flash('This slot is reserved for another team.')
+        return redirect(url_for('schedule', token=token))
+    
+    if WaitlistEntry.query.filter_by(slot_id=slot_id, member_id=member.id).first():
+        flash('You are already on the waitlist for this slot.')
+        return redirect(url_for('schedule', token=token))
+    
+    # Append at the tail; a concurrent join taking the same position retries once
+    for attempt in range(2):
+        last = db.session.query(func.max(WaitlistEntry.position)).filter_by(slot_id=slot_id).scalar() or 0
+        db.session.add(WaitlistEntry(slot_id=slot_id, member_id=member.id, position=last + 1))
+        try:
+            db.session.commit()
+            break
+        except IntegrityError:
+            db.session.rollback()
+    else:
+        flash('Could not join the waitlist, please try again.')
+        return redirect(url_for('schedule', token=token))
     
+    ahead = WaitlistEntry.query.filter(WaitlistEntry.slot_id == slot_id, WaitlistEntry.position <= last).count()
+    flash(f'You are on the waitlist ({ahead} ahead of you). You will be booked automatically if a place opens up.')
     return redirect(url_for('schedule', token=token))
 
+@app.route('/waitlist/<int:slot_id>/<token>/leave', methods=['POST'])
+def leave_waitlist(slot_id, token):
+    member = Member.query.filter_by(token=token).first_or_404()
+    touch_districts([slot_district(db.session, slot_id)])
+    WaitlistEntry.query.filter_by(slot_id=slot_id, member_id=member.id).delete()
+    db.session.commit()
+    flash('You have left the waitlist.')
+    return redirect(url_for('schedule', token=token))
+
+def auto_schedule_plan(districts):
+    """Preview of auto-schedule: for each district, the companionships with no upcoming
+    booking matched to empty upcoming slots. Returns [(district, [(team, slot)], [unplaced teams])]."""
+    now = datetime.now()
+    district_ids = [d.id for d in districts]
+    materialize_slots(district_ids)
+    teams_by_district = defaultdict(list)
+    for team in Team.query.filter(Team.district_id.in_(district_ids)).order_by(Team.id):
+        if team.members:
+            teams_by_district[team.district_id].append(team)
+    upcoming = [slot for slot in InterviewSlot.query.filter(InterviewSlot.district_id.in_(district_ids),
+                                                            InterviewSlot.date >= now.date())
+                .order_by(InterviewSlot.date, InterviewSlot.start_time) if slot_start(slot) > now]
+    booked_slots = set()
+    booked_teams = set()
+    upcoming_ids = [slot.id for slot in upcoming]
+    for slot_id, team_id in (db.session.query(Booking.slot_id, Member.team_id).join(Member, Booking.member_id == Member.id)
+                             .filter(Booking.slot_id.in_(upcoming_ids))):
+        booked_slots.add(slot_id)
+        booked_teams.add(team_id)
+    slots_by_district = defaultdict(list)
+    for slot in upcoming:
+        if slot.id not in booked_slots:
+            slots_by_district[slot.district_id].append(slot)
+
+    plans = []
+    for district in districts:
+        teams = [t for t in teams_by_district[district.id] if t.id not in booked_teams]
+        slots = slots_by_district[district.id]
+        plan = plan_assignments(
+            [(t.id, len(t.members), [m.time_preference for m in t.members]) for t in teams],
+            [(slot.id, slot.date, slot.start_time, slot.max_slots) for slot in slots])
+        slot_by_id = {slot.id: slot for slot in slots}
+        assigned = sorted(((t, slot_by_id[plan[t.id]]) for t in teams if t.id in plan), key=lambda ts: slot_start(ts[1]))
+        plans.append((district, assigned, [t for t in teams if t.id not in plan]))
+    return plans
+
+@app.route('/admin/auto_schedule', methods=['GET', 'POST'])
+def auto_schedule():
+    district_id = request.values.get('district_id', type=int)
+    districts = [District.query.get_or_404(district_id)] if district_id else District.query.order_by(District.name).all()
+
+    if request.method == 'POST':
+        # Re-check every previewed pair and write them all or none
+        pairs = []
+        try:
+            for value in request.form.getlist('assignments'):
+                team_id, _, slot_id = value.partition(':')
+                pairs.append((int(team_id), int(slot_id)))
+        except ValueError:
+            # Not something the preview rendered
+            flash('The schedule changed since the preview. Please review the new plan.')
+            return redirect(url_for('auto_schedule', district_id=district_id))
+        unbooked_teams = set()
+        for _, assigned, unplaced in auto_schedule_plan(districts):
+            unbooked_teams.update(team.id for team, _ in assigned)
+            unbooked_teams.update(team.id for team in unplaced)
+        stale = [pair for pair in pairs if pair[0] not in unbooked_teams]
+        slot_ids = [slot_id for _, slot_id in pairs]
+        if stale or len(set(slot_ids)) != len(slot_ids):
+            flash('The schedule changed since the preview. Please review the new plan.')
+            return redirect(url_for('auto_schedule', district_id=district_id))
+        # Hold the slots' rows until commit so members' own bookings queue behind this
+        slots = {slot.id: slot for slot in InterviewSlot.query.filter(InterviewSlot.id.in_(slot_ids)).with_for_update()}
+        taken = {slot_id for (slot_id,) in db.session.query(Booking.slot_id).filter(Booking.slot_id.in_(slot_ids))}
+        count = 0
+        for team_id, slot_id in pairs:
+            slot = slots.get(slot_id)
+            team = db.session.get(Team, team_id)
+            if not slot or slot_id in taken or slot.district_id != team.district_id or len(team.members) > slot.max_slots:
+                db.session.rollback()
+                flash('The schedule changed since the preview. Please review the new plan.')
+                return redirect(url_for('auto_schedule', district_id=district_id))
+            for member in team.members:
+                booking = Booking(slot=slot, member=member)
+                db.session.add(booking)
+                queue_event(BOOKING_ADDED, booking, 'auto-schedule')
+                count += 1
+        # A member who booked one of these slots since the check above wins it
+        db.session.flush()
+        if overbooked_slots(slot_ids):
+            db.session.rollback()
+            flash('The schedule changed since the preview. Please review the new plan.')
+            return redirect(url_for('auto_schedule', district_id=district_id))
+        db.session.commit()
+        flash(f'Booked {count} members in {len(pairs)} companionships.')
+        return redirect(url_for('admin'))
+
+    return render_template('auto_schedule.html', plans=auto_schedule_plan(districts), district_id=district_id,
+                           all_districts=District.query.order_by(District.name).all())
+
+def interviewer_conflicts(new_slots=None):
+    """Slots that overlap another slot for the same interviewer in any district.
+
+    With `new_slots` (unsaved InterviewSlot objects) only conflicts involving one of
+    them are returned; otherwise every upcoming conflict in the calendar is.
+    Returns [(interviewer key, slot a, slot b)] where each slot is a small dict."""
+    query = (db.session.query(InterviewSlot.id, InterviewSlot.date, InterviewSlot.start_time, InterviewSlot.duration,
+                              District.id, District.name, District.interviewer_name)
+             .join(District, InterviewSlot.district_id == District.id))
+    districts = {d.id: d for d in District.query.all()}
+    if new_slots:
+        start, end = min(s.date for s in new_slots), max(s.date for s in new_slots)
+    else:
+        start = datetime.now().date()
+        end = max([start] + [r.end_date for r in SlotRule.query.filter(SlotRule.end_date >= start)])
+    query = query.filter(InterviewSlot.date.between(start, end))
+    # Rule occurrences that no page has materialised yet still occupy the interviewer
+    pending = rule_slots(active_rules(districts, start, end), start, end)
+    candidates = []
+    for is_new, slots in ((False, pending), (True, new_slots or [])):
+        for slot in slots:
+            district = districts[slot.district_id]
+            candidates.append((None, slot.date, slot.start_time, slot.duration, district.id, district.name,
+                               district.interviewer_name, is_new))
+
+    intervals = []
+    rows = [tuple(row) + (False,) for row in query] + candidates
+    for slot_id, slot_date, start_time, duration, district_id, district_name, interviewer, is_new in rows:
+        starts_at = datetime.combine(slot_date, start_time)
+        item = {'id': slot_id, 'district_id': district_id, 'district': district_name, 'interviewer': interviewer,
+                'starts_at': starts_at, 'duration': duration, 'new': is_new}
+        intervals.append((interviewer_key(interviewer), starts_at, starts_at + timedelta(minutes=duration), item))
+
+    conflicts = find_overlaps(intervals)
+    if new_slots:
+        conflicts = [c for c in conflicts if c[1]['new'] or c[2]['new']]
+        # Report the new slot second so messages read "new overlaps existing"
+        conflicts = [(key, b, a) if a['new'] and not b['new'] else (key, a, b) for key, a, b in conflicts]
+    return conflicts
+
+@app.route('/admin/conflicts')
+def interviewer_conflict_report():
+    conflicts = interviewer_conflicts()
+    by_interviewer = defaultdict(list)
+    for _, a, b in conflicts:
+        by_interviewer[a['interviewer']].append((a, b))
+    return render_template('conflicts.html', by_interviewer=dict(by_interviewer), total=len(conflicts))
+
 @app.route('/admin/send_notifications/<int:district_id>')
 def send_notifications(district_id):
-    district = District.query.get_or_404(district_id)
-    slots = InterviewSlot.query.filter_by(district_id=district_id).all()
-    
-    for team in district.teams:
-        for member in team.members:
-            link = url_for('schedule', token=member.token, _external=True)
-            # Send email
-            if member.email:
-                msg = Message('Interview Scheduling', sender=app.config['MAIL_USERNAME'], 
-                            recipients=[member.email])
-                msg.body = f'Please schedule your interview: {link}'
-                mail.send(msg)
-            # Send SMS (placeholder - integrate Twilio)
-            if member.phone and twilio_client:
-                twilio_client.messages.create(body=f'Interview link: {link}', from_=twilio_number, to=member.phone)
-    
-    flash('Notifications sent!')
-    return redirect(url_for('district_detail', id=district_id))
+    District.query.get_or_404(district_id)
+    return redirect(url_for('send_all_notifications', district_id=district_id))
+
+def booking_problem(slot, member):
+    """Why an admin can't add `member` to `slot` (None if they can)."""
+    if Booking.query.filter_by(slot_id=slot.id, member_id=member.id).first():
+        return f'{member.name} is already booked for this slot.'
+    # A slot belongs to the team of whoever booked it first
+    if slot.bookings and member.team != slot.bookings[0].member.team:
+        return 'This slot is reserved for another team.'
+    if len(slot.bookings) >= slot.max_slots:
+        return 'Slot is full.'
+    return None
+
+def admin_add_booking(slot, member):
+    """Book `member` into `slot` for an admin; the caller checked booking_problem() and commits."""
+    booking = Booking(slot_id=slot.id, member_id=member.id, slot=slot, member=member)
+    db.session.add(booking)
+    queue_event(BOOKING_ADDED, booking, 'admin')
+    return booking
+
+def commit_admin_booking(slot, member):
+    """admin_add_booking() and commit, unless a concurrent booking overfilled the slot
+    meanwhile (then roll back). Returns the booking, or None if rolled back."""
+    booking = admin_add_booking(slot, member)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    if overbooked_slots([slot.id]):
+        db.session.rollback()
+        return None
+    db.session.commit()
+    return booking
 
 @app.route('/admin/add_booking/<int:slot_id>', methods=['POST'])
 def add_booking(slot_id):
-    slot = InterviewSlot.query.get_or_404(slot_id)
+    slot = lock_slot(slot_id) or abort(404)
     member_id = request.form['member_id']
     member = Member.query.get_or_404(member_id)
     
-    # Check if already booked
-    existing = Booking.query.filter_by(slot_id=slot_id, member_id=member_id).first()
-    if existing:
-        flash(f'{member.name} is already booked for this slot.')
+    problem = booking_problem(slot, member)
+    if problem:
+        flash(problem)
+    elif not commit_admin_booking(slot, member):
+        flash('The slot changed while adding; please try again.')
     else:
-        # Check team restriction
-        if slot.bookings:
-            existing_team = slot.bookings[0].member.team
-            if member.team != existing_team:
-                flash('This slot is reserved for another team.')
-                return redirect(url_for('admin'))
-        
-        if len(slot.bookings) < slot.max_slots:
-            booking = Booking(slot_id=slot_id, member_id=member_id)
-            db.session.add(booking)
-            db.session.commit()
-            flash(f'Added {member.name} to the slot.')
-        else:
-            flash('Slot is full.')
+        flash(f'Added {member.name} to the slot.')
     
     return redirect(url_for('admin'))
 
@@ -505,7 +1498,7 @@ def remove_booking(booking_id):
     booking = Booking.query.get_or_404(booking_id)
     slot = booking.slot
     member_name = booking.member.name
-    db.session.delete(booking)
+    promote_waitlist(cancel_bookings([booking], 'removed'))
     db.session.commit()
     flash(f'Removed {member_name} from the slot.')
     return redirect(url_for('admin'))
@@ -515,16 +1508,207 @@ def delete_slot(slot_id):
     slot = InterviewSlot.query.get_or_404(slot_id)
     district_id = slot.district_id
     
-    # Delete associated bookings first
-    bookings = Booking.query.filter_by(slot_id=slot_id).all()
-    for booking in bookings:
-        db.session.delete(booking)
-    
-    db.session.delete(slot)
+    # Bookings and waitlist go with it
+    delete_slots_where(InterviewSlot.id == slot_id, keep_cancelled=True)
     db.session.commit()
     flash('Interview slot deleted successfully!')
     return redirect(url_for('manage_slots', id=district_id))
 
+# JSON API for the calendar and scripts. Slots are sent as positional rows (see
+# SLOT_FIELDS) and listed with keyset pagination on (date, start_time, id).
+
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 500
+SLOT_FIELDS = ['id', 'date', 'start', 'duration', 'capacity', 'booked', 'team_id']
+SLOT_ORDER = (InterviewSlot.date, InterviewSlot.start_time, InterviewSlot.id)
+SLOT_CURSOR = (date.fromisoformat, lambda value: datetime.strptime(value, '%H:%M:%S').time(), int)
+
+def api_error(message, status=400):
+    return {'error': message}, status
+
+def slot_rows():
+    """Query of slot summaries: the slot's columns plus its booking count and owning team."""
+    booked = (select(func.count(Booking.id)).where(Booking.slot_id == InterviewSlot.id)
+              .correlate(InterviewSlot).scalar_subquery())
+    team_id = (select(Member.team_id).join(Booking, Booking.member_id == Member.id)
+               .where(Booking.slot_id == InterviewSlot.id).correlate(InterviewSlot).limit(1).scalar_subquery())
+    return db.session.query(InterviewSlot.id, InterviewSlot.date, InterviewSlot.start_time, InterviewSlot.duration,
+                            InterviewSlot.max_slots, booked.label('booked'), team_id.label('team_id')), booked
+
+def slot_row(row):
+    return [row.id, row.date.isoformat(), row.start_time.strftime('%H:%M'), row.duration, row.max_slots, row.booked, row.team_id]
+
+def slot_summary(slot_id):
+    query, _ = slot_rows()
+    row = query.filter(InterviewSlot.id == slot_id).first()
+    return slot_row(row) if row else None
+
+# Admin lists (members, a district's slots) page with the same cursors as the API
+ADMIN_PAGE_SIZE = int(os.environ.get('ADMIN_PAGE_SIZE', '50'))
+
+def page_after(*parsers):
+    """The ?after= cursor of a paged admin list (None on the first page or for a mangled link)."""
+    try:
+        return decode_cursor(request.args['after'], *parsers) if request.args.get('after') else None
+    except ValueError:
+        return None
+
+def parse_date_arg(name, default):
+    value = request.args.get(name)
+    return date.fromisoformat(value) if value else default
+
+@app.route('/api/districts/<int:district_id>/slots')
+def api_slots(district_id):
+    """Slots of a district between ?from and ?to (default: the visible window).
+    ?available=1 lists only slots with a free place; ?after=<cursor> continues a listing."""
+    if not db.session.get(District, district_id):
+        return api_error('District not found.', 404)
+    default_start, default_end = visible_window()
+    try:
+        start = parse_date_arg('from', default_start)
+        end = parse_date_arg('to', max(default_end, start))
+        after = decode_cursor(request.args['after'], *SLOT_CURSOR) if request.args.get('after') else None
+    except ValueError as e:
+        return api_error(str(e))
+    if end < start:
+        return api_error('"to" is before "from".')
+    limit = min(max(request.args.get('limit', API_PAGE_SIZE, type=int), 1), API_MAX_PAGE_SIZE)
+    
+    if not after:
+        materialize_slots([district_id], start, end)
+    query, booked = slot_rows()
+    query = query.filter(InterviewSlot.district_id == district_id, InterviewSlot.date.between(start, end))
+    if request.args.get('available') in ('1', 'true'):
+        query = query.filter(booked < InterviewSlot.max_slots)
+    rows, cursor = keyset_page(query, SLOT_ORDER, after, limit, key=lambda row: (row.date, row.start_time, row.id))
+    return {'fields': SLOT_FIELDS, 'slots': [slot_row(row) for row in rows], 'next': cursor}
+
+@app.route('/api/slots/<int:slot_id>')
+def api_slot(slot_id):
+    """One slot's availability and who is booked into it."""
+    summary = slot_summary(slot_id)
+    if not summary:
+        return api_error('Slot not found.', 404)
+    bookings = (db.session.query(Booking.id, Member.id, Member.name).join(Member, Booking.member_id == Member.id)
+                .filter(Booking.slot_id == slot_id).order_by(Booking.id).all())
+    return {'fields': SLOT_FIELDS, 'slot': summary, 'bookings': [list(booking) for booking in bookings]}
+
+@app.route('/api/slots/<int:slot_id>/bookings', methods=['POST'])
+def api_add_booking(slot_id):
+    """Body: {"member_id": n}. Same rules as the calendar's Add button."""
+    slot = lock_slot(slot_id)
+    if not slot:
+        return api_error('Slot not found.', 404)
+    payload = request.get_json(silent=True)
+    try:
+        member_id = int(payload.get('member_id'))
+    except (AttributeError, TypeError, ValueError):
+        return api_error('member_id must be an integer.')
+    member = db.session.get(Member, member_id)
+    if not member:
+        return api_error('Member not found.', 404)
+    problem = booking_problem(slot, member)
+    if problem:
+        return api_error(problem, 409)
+    booking = commit_admin_booking(slot, member)
+    if not booking:
+        return api_error('The slot changed while adding; please try again.', 409)
+    return {'booking': [booking.id, member.id, member.name], 'slot': slot_summary(slot_id)}, 201
+
+@app.route('/api/bookings/<int:booking_id>', methods=['DELETE'])
+def api_remove_booking(booking_id):
+    booking = db.session.get(Booking, booking_id)
+    if not booking:
+        return api_error('Booking not found.', 404)
+    slot_id = booking.slot_id
+    promoted = promote_waitlist(cancel_bookings([booking], 'removed'))
+    db.session.commit()
+    return {'slot': slot_summary(slot_id), 'promoted': [[b.id, b.member_id] for b in promoted]}
+
+class SlotsChanged(Exception):
+    """A concurrent booking changed a slot between checking a batch and writing it."""
+
+def parse_booking_operations(payload):
+    """[(op, slot_id, member_id)] from {"operations": [...]}, or None if malformed."""
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    if not isinstance(operations, list):
+        return None
+    parsed = []
+    for operation in operations:
+        if not isinstance(operation, dict):
+            return None
+        try:
+            parsed.append((operation.get('op'), int(operation.get('slot_id')), int(operation.get('member_id'))))
+        except (TypeError, ValueError):
+            return None
+    return parsed
+
+def apply_booking_operations(operations):
+    """Check a batch of admin adds and removes together and, if every one is valid,
+    apply them in the current transaction. Returns (applied, errors, bookings)
+    with an error or None per operation and the booking id of each added pair."""
+    slot_ids = {slot_id for _, slot_id, _ in operations}
+    # Lock the slots before reading their bookings so concurrent changes to them wait for this batch
+    capacities = dict(db.session.query(InterviewSlot.id, InterviewSlot.max_slots).filter(InterviewSlot.id.in_(slot_ids))
+                      .with_for_update())
+    existing = (db.session.query(Booking.slot_id, Booking.member_id).filter(Booking.slot_id.in_(slot_ids)).all())
+    booked = defaultdict(set)
+    for slot_id, member_id in existing:
+        booked[slot_id].add(member_id)
+    member_ids = {member_id for _, _, member_id in operations} | {member_id for _, member_id in existing}
+    members = {member_id: (name, team_id) for member_id, name, team_id in
+               db.session.query(Member.id, Member.name, Member.team_id).filter(Member.id.in_(member_ids))}
+    errors, final = check_booking_operations(operations, capacities, members, booked)
+    if any(errors):
+        return False, errors, {}
+
+    # Only the net change is written, so an add undone later in the batch never touches the database
+    removed = {(slot_id, member_id) for slot_id, member_ids in booked.items() for member_id in member_ids - final[slot_id]}
+    added = {(slot_id, member_id) for slot_id, member_ids in final.items() for member_id in member_ids - booked[slot_id]}
+    freed = set()
+    if removed:
+        freed = cancel_bookings(Booking.query.filter(tuple_(Booking.slot_id, Booking.member_id).in_(removed)).all(), 'removed')
+        db.session.flush()
+    slots = {slot.id: slot for slot in InterviewSlot.query.filter(InterviewSlot.id.in_({slot_id for slot_id, _ in added}))}
+    people = {member.id: member for member in Member.query.filter(Member.id.in_({member_id for _, member_id in added}))}
+    bookings = {(slot_id, member_id): admin_add_booking(slots[slot_id], people[member_id]) for slot_id, member_id in sorted(added)}
+    db.session.flush()
+    # SQLite cannot lock rows, so check again now that this batch holds the write lock
+    if overbooked_slots({slot_id for slot_id, _ in added}):
+        raise SlotsChanged()
+    promote_waitlist(freed)
+    return True, errors, {pair: booking.id for pair, booking in bookings.items()}
+
+@app.route('/api/bookings/bulk', methods=['POST'])
+def api_bulk_bookings():
+    """Body: {"operations": [{"op": "add" | "remove", "slot_id": n, "member_id": n}, ...]}.
+    The operations are checked together, in order, against capacity and the team rule
+    and applied in one transaction only if all of them are valid. Answers one
+    {"ok": ...} result per operation; nothing is applied if any result is not ok."""
+    operations = parse_booking_operations(request.get_json(silent=True))
+    if operations is None:
+        return api_error('Expected {"operations": [{"op": ..., "slot_id": ..., "member_id": ...}]}.')
+    try:
+        applied, errors, bookings = apply_booking_operations(operations)
+        if applied:
+            db.session.commit()
+    except (IntegrityError, SlotsChanged):
+        # Someone else booked one of these slots between the check and the insert
+        db.session.rollback()
+        return api_error('The calendar changed while applying these changes; please try again.', 409)
+    results = []
+    for (op, slot_id, member_id), error in zip(operations, errors):
+        if error:
+            results.append({'ok': False, 'error': error})
+        elif op == 'add' and (slot_id, member_id) in bookings:
+            results.append({'ok': True, 'booking_id': bookings[(slot_id, member_id)]})
+        else:
+            results.append({'ok': True})
+    if not applied:
+        db.session.rollback()
+        return {'applied': False, 'results': results}, 409
+    return {'applied': True, 'results': results}
+
 @app.route('/admin/team/<int:team_id>/add_member', methods=['GET', 'POST'])
 def add_member(team_id):
     team = Team.query.get_or_404(team_id)
@@ -540,14 +1724,13 @@ def add_member(team_id):
             # Reassign existing member to this team
             member = Member.query.get_or_404(existing_member_id)
             
-            # Remove any existing bookings
-            bookings = Booking.query.filter_by(member_id=member.id).all()
-            for booking in bookings:
-                db.session.delete(booking)
+            # Remove any existing bookings and hand their places to the waitlist
+            freed_slots = delete_bookings_where(Booking.member_id == member.id, reason='reassigned')
+            clear_waitlists(member_ids=[member.id])
             
             # Reassign to new team
-            old_team_id = member.team_id
             member.team_id = team_id
+            promote_waitlist(freed_slots)
             db.session.commit()
             flash(f'Reassigned {member.name} to this companionship!')
             return redirect(url_for('district_detail', id=team.district_id))
@@ -570,13 +1753,13 @@ def unassign_member(member_id):
     member = Member.query.get_or_404(member_id)
     district_id = member.team.district_id if member.team else None
     
-    # Cancel any existing bookings
-    bookings = Booking.query.filter_by(member_id=member_id).all()
-    for booking in bookings:
-        db.session.delete(booking)
+    # Cancel any existing bookings and hand their places to the waitlist
+    freed_slots = delete_bookings_where(Booking.member_id == member_id, reason='unassigned')
+    clear_waitlists(member_ids=[member_id])
     
     # Unassign from team
     member.team_id = None
+    promote_waitlist(freed_slots)
     db.session.commit()
     flash(f'Unassigned {member.name} from companionship!')
     
@@ -591,14 +1774,11 @@ def remove_team(team_id):
     district_id = team.district_id
     name = f"Companionship {team.id}"
     
-    # Remove all members and their bookings
-    for member in team.members:
-        bookings = Booking.query.filter_by(member_id=member.id).all()
-        for booking in bookings:
-            db.session.delete(booking)
-        db.session.delete(member)
-    
-    db.session.delete(team)
+    # Remove all members, their bookings and waitlist places
+    freed_slots = delete_members_where(Member.team_id == team_id, reason='companionship removed')
+    db.session.execute(delete(Team).where(Team.id == team_id))
+    touch_districts([district_id])
+    promote_waitlist(freed_slots)
     db.session.commit()
     flash(f'{name} removed!')
     return redirect(url_for('district_detail', id=district_id))
@@ -609,6 +1789,8 @@ def edit_district(id):
     if request.method == 'POST':
         district.name = request.form['name']
         district.interviewer_name = request.form['interviewer']
+        if request.form.get('organization') in ORGANIZATIONS:
+            district.organization = request.form['organization']
         db.session.commit()
         flash('District updated!')
         return redirect(url_for('district_detail', id=id))
@@ -616,10 +1798,26 @@ def edit_district(id):
 
 @app.route('/admin/members')
 def manage_members():
-    """View and manage all members across all districts."""
-    members = Member.query.outerjoin(Team).outerjoin(District).order_by(District.name.nulls_last(), Team.id.nulls_last(), Member.name).all()
-    districts = District.query.all()
-    return render_template('manage_members.html', members=members, districts=districts)
+    """View and manage all members across all districts, a page at a time."""
+    search = request.args.get('q', '').strip()
+    district_filter = request.args.get('district', '')
+    query = Member.query.options(joinedload(Member.team).joinedload(Team.district))
+    if search:
+        pattern = f'%{search}%'
+        query = query.filter(or_(Member.name.ilike(pattern), Member.email.ilike(pattern), Member.phone.ilike(pattern)))
+    if district_filter == 'none':
+        query = query.filter(Member.team_id.is_(None))
+    elif district_filter.isdigit():
+        query = query.join(Team, Member.team_id == Team.id).filter(Team.district_id == int(district_filter))
+    members, next_cursor = keyset_page(query, (Member.name, Member.id), page_after(str, int), ADMIN_PAGE_SIZE,
+                                       key=lambda member: (member.name, member.id))
+    # The reassign targets go out once per page and every row's dropdown is filled from them
+    teams_by_district = defaultdict(list)
+    for team_id, district_id in db.session.query(Team.id, Team.district_id).order_by(Team.id):
+        teams_by_district[district_id].append(team_id)
+    return render_template('manage_members.html', members=members, districts=district_list(), teams_by_district=teams_by_district,
+                           search=search, district_filter=district_filter, next_cursor=next_cursor,
+                           first_page=not request.args.get('after'))
 
 @app.route('/admin/member/<int:member_id>/reassign', methods=['POST'])
 def reassign_member(member_id):
@@ -634,13 +1832,13 @@ def reassign_member(member_id):
     new_team = Team.query.get_or_404(new_team_id)
     old_team_id = member.team_id
     
-    # Remove any existing bookings
-    bookings = Booking.query.filter_by(member_id=member_id).all()
-    for booking in bookings:
-        db.session.delete(booking)
+    # Remove any existing bookings and hand their places to the waitlist
+    freed_slots = delete_bookings_where(Booking.member_id == member_id, reason='reassigned')
+    clear_waitlists(member_ids=[member_id])
     
     # Reassign to new team
     member.team_id = new_team_id
+    promote_waitlist(freed_slots)
     db.session.commit()
     
     flash(f'Reassigned {member.name} to Companionship {new_team_id} in {new_team.district.name}')
@@ -653,29 +1851,33 @@ def edit_member(member_id):
         member.name = request.form['name']
         member.phone = request.form['phone']
         member.email = request.form['email']
+        preference = request.form.get('time_preference')
+        member.time_preference = preference if preference in TIME_PREFERENCES else None
         db.session.commit()
         flash(f'Updated {member.name}!')
         return redirect(url_for('district_detail', id=member.team.district_id))
-    return render_template('edit_member.html', member=member)
+    return render_template('edit_member.html', member=member, time_preferences=TIME_PREFERENCES)
 
 def group_results_by_district(results):
-    """Group scraping results by district for display."""
+    """Group scraping results by organization and district for display."""
     from collections import defaultdict
     districts_data = defaultdict(lambda: {'companionships': defaultdict(list)})
     
     for row in results:
+        # Older CSV exports have no organization column
+        organization = row.get('organization') or DEFAULT_ORGANIZATION
         district_name = row['district']
         interviewer = row['interviewer']
         comp_id = row['companionship_id']
-        districts_data[district_name]['interviewer'] = interviewer
-        districts_data[district_name]['companionships'][comp_id].append({
+        districts_data[(organization, district_name)]['interviewer'] = interviewer
+        districts_data[(organization, district_name)]['companionships'][comp_id].append({
             'name': row['name'],
             'phone': row['phone'],
             'email': row['email']
         })
     
     scraped_districts = []
-    for district_name, data in districts_data.items():
+    for (organization, district_name), data in districts_data.items():
         companionships = []
         for comp_id, members in data['companionships'].items():
             companionships.append({
@@ -683,6 +1885,7 @@ def group_results_by_district(results):
                 'members': members
             })
         scraped_districts.append({
+            'organization': organization,
             'name': district_name,
             'interviewer': data['interviewer'],
             'companionships': companionships
@@ -738,10 +1941,164 @@ def import_progress(progress_id):
             'members_found': progress_data['members_found'],
             'errors': progress_data['errors'],
             'redirect_url': progress_data.get('redirect_url'),
-            'scraped_districts': progress_data.get('scraped_districts', [])
+            'scraped_districts': progress_data.get('scraped_districts', []),
+            'timings': progress_data.get('timings'),
+            'resumable': progress_data['status'] == 'error' and bool(progress_data.get('checkpoint'))
         }
     return {'status': 'not_found'}
 
+def latest_import():
+    """Return the most recently applied ImportHistory entry, if any."""
+    return ImportHistory.query.filter_by(applied=True).order_by(ImportHistory.id.desc()).first()
+
+def database_district_hashes(scraped_districts):
+    """{district_key: hash} of each scraped district as it is in the database now
+    (None if it isn't there), in the form roster_digest() hashes a roster, so edits
+    made in the app since the last import count as changes."""
+    stored = {}
+    rows = (db.session.query(District.organization, District.name, District.interviewer_name, Member.team_id,
+                             Member.name, Member.email, Member.phone)
+            .join(Team, Team.district_id == District.id).join(Member, Member.team_id == Team.id))
+    for organization, name, interviewer, team_id, *member in rows:
+        district = stored.setdefault((organization, name), {'interviewer': interviewer, 'companionships': defaultdict(list)})
+        district['companionships'][team_id].append(dict(zip(('name', 'email', 'phone'), member)))
+    hashes = {}
+    for district_data in scraped_districts:
+        district = stored.get((district_data.get('organization') or DEFAULT_ORGANIZATION, district_data['name']))
+        if district:
+            # Teams left empty by earlier re-imports don't count
+            district = {'organization': district_data.get('organization'), 'name': district_data['name'],
+                        'interviewer': district['interviewer'],
+                        'companionships': [{'members': members} for members in district['companionships'].values()]}
+        hashes[district_key(district_data)] = roster_digest([district])[1][district_key(district_data)] if district else None
+    return hashes
+
+def import_diff(scraped_districts):
+    """Hash a grouped roster and compare it with the last applied import."""
+    content_hash, district_hashes = roster_digest(scraped_districts)
+    last = latest_import()
+    previous_hashes = json.loads(last.district_hashes) if last else {}
+    districts = compare_digests(previous_hashes, district_hashes)
+    # A district edited or deleted in the app since that import is not unchanged: importing restores it
+    in_database = database_district_hashes(scraped_districts)
+    drifted = [key for key in districts['unchanged'] if in_database.get(key) != district_hashes[key]]
+    districts['unchanged'] = [key for key in districts['unchanged'] if key not in drifted]
+    districts['changed'] = sorted(districts['changed'] + drifted)
+    status = {key: state for state in ('added', 'changed', 'unchanged') for key in districts[state]}
+    return {
+        'content_hash': content_hash,
+        'district_hashes': district_hashes,
+        'last_import': last,
+        'unchanged': bool(last) and last.content_hash == content_hash and not drifted,
+        'districts': districts,
+        'district_status': [status[district_key(d)] for d in scraped_districts],
+    }
+
+def apply_import(scraped_districts, source, clear_existing=False, diff=None):
+    """Import a grouped roster into the database and record it in ImportHistory.
+    Districts whose content hash matches the last applied import, and that the
+    database still holds as imported, are skipped unless existing data is being
+    cleared. Returns the number of districts imported."""
+    diff = diff or import_diff(scraped_districts)
+    skip = set()
+    if not clear_existing:
+        # Checked again here: the database may have changed since the preview computed `diff`
+        in_database = database_district_hashes(scraped_districts)
+        skip = {key for key in diff['districts']['unchanged'] if in_database.get(key) == diff['district_hashes'][key]}
+
+    # Clear existing data if requested
+    if clear_existing:
+        # Delete in correct order due to foreign keys
+        touch_districts([DISTRICT_LIST] + [district_id for (district_id,) in db.session.query(District.id)])
+        Booking.query.delete()
+        WaitlistEntry.query.delete()
+        Notification.query.update({'member_id': None})
+        InterviewSlot.query.delete()
+        SlotRuleException.query.delete()
+        SlotRule.query.delete()
+        Member.query.delete()
+        Team.query.delete()
+        District.query.delete()
+
+    imported = 0
+    for district_data in scraped_districts:
+        if district_key(district_data) in skip:
+            continue
+        imported += 1
+        district_name = district_data['name']
+        interviewer_name = district_data['interviewer']
+        organization = district_data.get('organization') or DEFAULT_ORGANIZATION
+
+        # Find or create district
+        district = District.query.filter_by(name=district_name, organization=organization).first()
+        if not district:
+            district = District(name=district_name, interviewer_name=interviewer_name, organization=organization)
+            db.session.add(district)
+            db.session.flush()
+
+        for comp_data in district_data['companionships']:
+            # Create team
+            team = Team(district_id=district.id)
+            db.session.add(team)
+            db.session.flush()
+
+            for member_data in comp_data['members']:
+                # Try to find existing member by email globally
+                existing_member = Member.query.filter_by(email=member_data['email']).first()
+
+                if existing_member:
+                    # Update phone if different
+                    if existing_member.phone != member_data['phone'] and member_data['phone']:
+                        existing_member.phone = member_data['phone']
+                    # Update name if different
+                    if existing_member.name != member_data['name']:
+                        existing_member.name = member_data['name']
+                    # Reassign to new team
+                    existing_member.team_id = team.id
+                    member = existing_member
+                else:
+                    # Create new member
+                    member = Member(
+                        name=member_data['name'],
+                        phone=member_data['phone'],
+                        email=member_data['email'],
+                        team_id=team.id
+                    )
+                    db.session.add(member)
+
+                # Ensure member is in the team
+                if member not in team.members:
+                    team.members.append(member)
+
+    db.session.add(ImportHistory(
+        source=source,
+        content_hash=diff['content_hash'],
+        district_hashes=json.dumps(diff['district_hashes'], sort_keys=True),
+        district_count=len(scraped_districts),
+        member_count=sum(len(c['members']) for d in scraped_districts for c in d['companionships']),
+        applied=True
+    ))
+    db.session.commit()
+    return imported
+
+def handle_import_post(scraped_districts, source, diff):
+    """Run the confirmed import form; returns True if the import succeeded or was skipped."""
+    clear_existing = 'clear_existing' in request.form
+    if diff['unchanged'] and not clear_existing and 'force_import' not in request.form:
+        flash('Roster is identical to the last import - nothing to do.')
+        return True
+    try:
+        imported = apply_import(scraped_districts, source, clear_existing=clear_existing, diff=diff)
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Import failed: {str(e)}')
+        return False
+    if clear_existing:
+        flash('Cleared all existing data for fresh import.')
+    skipped = len(scraped_districts) - imported
+    flash(f'Data imported successfully! {imported} districts imported, {skipped} unchanged districts skipped.')
+    return True
+
 @app.route('/admin/import_confirm', methods=['GET', 'POST'])
 def import_confirm():
     progress_id = request.args.get('progress_id')
@@ -754,77 +2111,14 @@ def import_confirm():
         
         scraped_districts = progress_data['scraped_districts']
     
+    diff = import_diff(scraped_districts)
     if request.method == 'POST' and 'confirm_import' in request.form:
-        # Import the data
-        try:
-            # Clear existing data if requested
-            if 'clear_existing' in request.form:
-                # Delete in correct order due to foreign keys
-                Booking.query.delete()
-                InterviewSlot.query.delete()
-                Member.query.delete()
-                Team.query.delete()
-                District.query.delete()
-                db.session.commit()
-                flash('Cleared all existing data for fresh import.')
-            
-            for district_data in scraped_districts:
-                district_name = district_data['name']
-                interviewer_name = district_data['interviewer']
-                
-                # Find or create district
-                district = District.query.filter_by(name=district_name).first()
-                if not district:
-                    district = District(name=district_name, interviewer_name=interviewer_name)
-                    db.session.add(district)
-                    db.session.commit()
-                
-                for comp_data in district_data['companionships']:
-                    # Create team
-                    team = Team(district_id=district.id)
-                    db.session.add(team)
-                    db.session.commit()
-                    
-                    for member_data in comp_data['members']:
-                        # Try to find existing member by email globally
-                        existing_member = Member.query.filter_by(email=member_data['email']).first()
-                        
-                        if existing_member:
-                            # Update phone if different
-                            if existing_member.phone != member_data['phone'] and member_data['phone']:
-                                existing_member.phone = member_data['phone']
-                            # Update name if different
-                            if existing_member.name != member_data['name']:
-                                existing_member.name = member_data['name']
-                            # Reassign to new team
-                            existing_member.team_id = team.id
-                            member = existing_member
-                        else:
-                            # Create new member
-                            member = Member(
-                                name=member_data['name'],
-                                phone=member_data['phone'],
-                                email=member_data['email'],
-                                team_id=team.id
-                            )
-                            db.session.add(member)
-                        
-                        # Ensure member is in the team
-                        if member not in team.members:
-                            team.members.append(member)
-                    
-                    db.session.commit()
-            
-            flash('Data imported successfully!')
-            return redirect(url_for('admin_calendar'))
-        
-        except Exception as e:
-            db.session.rollback()
-            flash(f'Import failed: {str(e)}')
-            return redirect(url_for('scrape_progress', progress_id=progress_id))
+        if handle_import_post(scraped_districts, 'scrape', diff):
+            return redirect(url_for('admin'))
+        return redirect(url_for('scrape_progress', progress_id=progress_id))
     
     # Display confirmation
-    return render_template('import_confirm.html', scraped_districts=scraped_districts, progress_id=progress_id, confirm_endpoint='import_confirm')
+    return render_template('import_confirm.html', scraped_districts=scraped_districts, progress_id=progress_id, confirm_endpoint='import_confirm', diff=diff)
 
 @app.route('/admin/import_csv_confirm', methods=['GET', 'POST'])
 def import_csv_confirm():
@@ -833,100 +2127,171 @@ def import_csv_confirm():
         flash('No uploaded data found.')
         return redirect(url_for('import_csv'))
     
+    diff = import_diff(scraped_districts)
     if request.method == 'POST' and 'confirm_import' in request.form:
-        # Import the data
-        try:
-            # Clear existing data if requested
-            if 'clear_existing' in request.form:
-                # Delete in correct order due to foreign keys
-                Booking.query.delete()
-                InterviewSlot.query.delete()
-                Member.query.delete()
-                Team.query.delete()
-                District.query.delete()
-                db.session.commit()
-                flash('Cleared all existing data for fresh import.')
-            
-            for district_data in scraped_districts:
-                district_name = district_data['name']
-                interviewer_name = district_data['interviewer']
-                
-                # Find or create district
-                district = District.query.filter_by(name=district_name).first()
-                if not district:
-                    district = District(name=district_name, interviewer_name=interviewer_name)
-                    db.session.add(district)
-                    db.session.commit()
-                
-                for comp_data in district_data['companionships']:
-                    # Create team
-                    team = Team(district_id=district.id)
-                    db.session.add(team)
-                    db.session.commit()
-                    
-                    for member_data in comp_data['members']:
-                        # Try to find existing member by email globally
-                        existing_member = Member.query.filter_by(email=member_data['email']).first()
-                        
-                        if existing_member:
-                            # Update phone if different
-                            if existing_member.phone != member_data['phone'] and member_data['phone']:
-                                existing_member.phone = member_data['phone']
-                            # Update name if different
-                            if existing_member.name != member_data['name']:
-                                existing_member.name = member_data['name']
-                            # Reassign to new team
-                            existing_member.team_id = team.id
-                            member = existing_member
-                        else:
-                            # Create new member
-                            member = Member(
-                                name=member_data['name'],
-                                phone=member_data['phone'],
-                                email=member_data['email'],
-                                team_id=team.id
-                            )
-                            db.session.add(member)
-                        
-                        # Ensure member is in the team
-                        if member not in team.members:
-                            team.members.append(member)
-                    
-                    db.session.commit()
-            
+        if handle_import_post(scraped_districts, 'csv', diff):
             session.pop('uploaded_districts', None)
-            flash('Data imported successfully!')
-            return redirect(url_for('admin_calendar'))
-        
-        except Exception as e:
-            db.session.rollback()
-            flash(f'Import failed: {str(e)}')
-            return redirect(url_for('import_csv_confirm'))
+            return redirect(url_for('admin'))
+        return redirect(url_for('import_csv_confirm'))
     
     # Display confirmation
-    return render_template('import_confirm.html', scraped_districts=scraped_districts, confirm_endpoint='import_csv_confirm')
+    return render_template('import_confirm.html', scraped_districts=scraped_districts, confirm_endpoint='import_csv_confirm', diff=diff)
+
+def run_roster_sync(trigger):
+    """Scrape LCR with the stored credentials and import the roster if it changed."""
+    from app_scraper import scrape_ministering_data
+    with app.app_context():
+        run = SyncRun(trigger=trigger)
+        db.session.add(run)
+        db.session.commit()
+        messages = []
+        try:
+            username, password = sync_credentials()
+            if not username:
+                raise RuntimeError('LCR_USERNAME and LCR_PASSWORD (or LCR_PASSWORD_FILE) are not set')
+
+            organizations = sync_organizations(ORGANIZATIONS, DEFAULT_ORGANIZATION)
+            results = scrape_ministering_data(username, password, messages.append, organizations=organizations)
+            if not results:
+                errors = [m for m in messages if m.startswith('❌') or 'Error' in m or 'Failed' in m]
+                raise RuntimeError(errors[-1] if errors else 'Scraper returned no data')
 
-@app.route('/admin/send_all_notifications')
+            run.members_found = len(results)
+            scraped_districts = group_results_by_district(results)
+            diff = import_diff(scraped_districts)
+            if diff['unchanged']:
+                run.status = 'unchanged'
+                run.message = 'Roster is identical to the last import'
+            else:
+                run.districts_imported = apply_import(scraped_districts, 'sync', diff=diff)
+                run.import_id = latest_import().id
+                run.status = 'applied'
+                run.message = f'{run.districts_imported} districts imported'
+        except Exception as e:
+            db.session.rollback()
+            run.status = 'failed'
+            run.message = str(e)
+        run.finished_at = datetime.utcnow()
+        db.session.commit()
+
+def create_sync_scheduler():
+    """Build the roster sync runner; its timer is only set when ROSTER_SYNC_SCHEDULE is valid."""
+    schedule = None
+    if os.environ.get('ROSTER_SYNC_SCHEDULE'):
+        try:
+            schedule = parse_schedule(os.environ['ROSTER_SYNC_SCHEDULE'])
+        except ValueError as e:
+            print(f"Scheduled roster sync disabled: {e}")
+    return SyncScheduler(run_roster_sync, schedule)
+
+sync_scheduler = create_sync_scheduler()
+
+@app.route('/admin/sync', methods=['GET', 'POST'])
+def roster_sync():
+    if request.method == 'POST':
+        if sync_scheduler.busy:
+            flash('A roster sync is already running.')
+        else:
+            threading.Thread(target=sync_scheduler.run_now, args=('manual',), daemon=True).start()
+            flash('Roster sync started.')
+        return redirect(url_for('roster_sync'))
+
+    runs = SyncRun.query.order_by(SyncRun.id.desc()).limit(20).all()
+    username, _ = sync_credentials()
+    return render_template('roster_sync.html', runs=runs, scheduler=sync_scheduler,
+                           schedule=os.environ.get('ROSTER_SYNC_SCHEDULE'), credentials_configured=bool(username))
+
+@app.route('/admin/send_all_notifications', methods=['GET', 'POST'])
 def send_all_notifications():
-    districts = District.query.all()
-    total_sent = 0
-    for district in districts:
-        for team in district.teams:
-            for member in team.members:
-                link = url_for('schedule', token=member.token, _external=True)
-                if member.email:
-                    msg = Message('Interview Scheduling', sender=app.config['MAIL_USERNAME'], 
-                                recipients=[member.email])
-                    msg.body = f'Please schedule your interview: {link}'
-                    mail.send(msg)
-                    total_sent += 1
-                if member.phone and twilio_client:
-                    twilio_client.messages.create(body=f'Interview link: {link}', from_=twilio_number, to=member.phone)
-                    total_sent += 1
-    flash(f'Notifications sent to {total_sent} contacts!')
-    return redirect(url_for('admin'))
+    district_id = request.values.get('district_id', type=int)
+    if request.method == 'POST':
+        unbooked_only = request.form.get('mode') == 'unbooked'
+        campaign = request.form.get('campaign', '').strip() or DEFAULT_CAMPAIGN
+        members = notification_recipients(district_id, unbooked_only).all()
+        batch_id, queued, skipped = enqueue_scheduling_links(members, campaign)
+        flash(f'{queued} notifications queued for "{campaign}"; {skipped} already sent were skipped.')
+        return redirect(url_for('notification_status', batch=batch_id))
+
+    districts = District.query.order_by(District.name).all()
+    return render_template('send_notifications.html', districts=districts, district_id=district_id,
+                           default_campaign=DEFAULT_CAMPAIGN,
+                           total_count=notification_recipients(district_id).count(),
+                           unbooked_count=notification_recipients(district_id, unbooked_only=True).count())
+
+def notification_summary(batch_id=None):
+    query = Notification.query
+    if batch_id:
+        query = query.filter_by(batch_id=batch_id)
+    counts = dict(query.with_entities(Notification.status, func.count(Notification.id)).group_by(Notification.status).all())
+    recent = query.order_by(Notification.id.desc()).limit(500).all()
+    return {
+        'counts': {status: counts.get(status, 0) for status in ('pending', 'sending', 'sent', 'failed')},
+        'notifications': [{
+            'id': n.id,
+            'name': n.member.name if n.member else '',
+            'channel': n.channel,
+            'recipient': n.recipient,
+            'status': n.status,
+            'attempts': n.attempts,
+            'last_error': n.last_error,
+            'next_attempt_at': n.next_attempt_at.isoformat() if n.status == 'pending' else None,
+            'sent_at': n.sent_at.isoformat() if n.sent_at else None,
+        } for n in recent],
+    }
+
+@app.route('/admin/notifications')
+def notification_status():
+    batch_id = request.args.get('batch')
+    return render_template('notifications.html', batch_id=batch_id, summary=notification_summary(batch_id))
+
+@app.route('/admin/notifications/status')
+def notification_status_json():
+    return notification_summary(request.args.get('batch'))
+
+@app.route('/admin/notifications/<int:notification_id>/retry', methods=['POST'])
+def retry_notification(notification_id):
+    notification = Notification.query.get_or_404(notification_id)
+    if notification.status == 'failed':
+        notification.status = 'pending'
+        notification.attempts = 0
+        notification.next_attempt_at = datetime.utcnow()
+        db.session.commit()
+        notification_dispatcher.wake()
+    return redirect(url_for('notification_status', batch=request.form.get('batch') or None))
+
+# Roster sync, notification delivery and reminders run on threads in whichever
+# process serves requests: started by the first request (any WSGI server or
+# `flask run`) or straight away by `python app.py`, and only once per process.
+background_workers_started = False
+background_workers_lock = threading.Lock()
+
+def start_background_workers():
+    global background_workers_started
+    with background_workers_lock:
+        if background_workers_started:
+            return
+        background_workers_started = True
+    if app.testing or os.environ.get('BACKGROUND_WORKERS', '1') == '0':
+        app.logger.warning('Background workers not started (testing or BACKGROUND_WORKERS=0): queued notifications, '
+                           'reminders and scheduled roster syncs will not run in this process.')
+        return
+    sync_scheduler.start()
+    # Pick up anything still queued from before the restart
+    notification_dispatcher.start()
+    with app.app_context():
+        load_reminders()
+    reminder_scheduler.start()
+    app.logger.info(f'Background workers started in process {os.getpid()}')
+
+@app.before_request
+def ensure_background_workers():
+    if not background_workers_started:
+        start_background_workers()
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        upgrade_schema(db.engine, db.metadata)
+    # The debug reloader's watcher process never serves requests; its serving child starts them
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers()
     app.run(debug=True, host='0.0.0.0', port=8181)
\ No newline at end of file
@@ -16,9 +16,48 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, InvalidSessionIdException, WebDriverException
 import json
 import csv
+import logging
+from scrape_tracing import ScrapeTrace, logger, debug_sampled
+from organizations import ORGANIZATIONS, DEFAULT_ORGANIZATION
+
+class ScrapeInterrupted(Exception):
+    """The browser session was lost part way through a scrape."""
+
+def session_lost(error):
+    """Return True if a WebDriver error means the browser or session is gone."""
+    if isinstance(error, InvalidSessionIdException):
+        return True
+    message = str(error).lower()
+    return isinstance(error, WebDriverException) and any(
+        marker in message for marker in ('chrome not reachable', 'no such window', 'session deleted', 'disconnected')
+    )
+
+# Each checkpoint copies every row, so popups are checkpointed in batches of this many
+CHECKPOINT_EVERY_POPUPS = 10
+
+def popup_key(row):
+    """Checkpoint id of an extracted row. Two brothers can share a name, but not within a companionship."""
+    return f"{row['companionship_id']}:{row['name']}"
+
+def find_unresolved_row(results, name, completed_popups):
+    """Return the first row for a ministering brother whose popup hasn't been read
+    and whose contact info is incomplete, or None."""
+    for row_data in results:
+        if (row_data['name'] == name and popup_key(row_data) not in completed_popups
+                and (not row_data['phone'] or not row_data['email'])):
+            return row_data
+    return None
+
+def unresolved_names(rows, completed_popups):
+    """Names whose contact info is still incomplete and whose popup has not been read yet."""
+    completed = set(completed_popups)
+    # Popups are only read from the default organization's table
+    return [row['name'] for row in rows
+            if row.get('organization', DEFAULT_ORGANIZATION) == DEFAULT_ORGANIZATION
+            and popup_key(row) not in completed and (not row['phone'] or not row['email'])]
 
 def find_existing_chromedriver():
     """Try to find an existing ChromeDriver installation."""
@@ -85,7 +124,7 @@ def download_chromedriver_manual():
 
 def setup_chrome_driver():
     """Set up Chrome driver with visible browser for debugging."""
-    print("🔍 [DEBUG] setup_chrome_driver called")
+    logger.debug("setup_chrome_driver called")
     chrome_options = Options()
 
     # Make browser visible for debugging - multiple options to ensure visibility
@@ -111,7 +150,7 @@ def setup_chrome_driver():
     chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
 
     try:
-        print("🔍 [DEBUG] About to download ChromeDriver")
+        logger.debug("About to download ChromeDriver")
         # Skip existing ChromeDriver if it's the old version, force download new one
         print("📥 Downloading correct ChromeDriver for Chrome 141...")
         chromedriver_path = download_chromedriver_manual()
@@ -126,7 +165,7 @@ def setup_chrome_driver():
 
         service = Service(chromedriver_path)
 
-        print("🔍 [DEBUG] About to initialize Chrome driver")
+        logger.debug("About to initialize Chrome driver")
         # Initialize the driver
         print("🚀 Initializing Chrome driver...")
         driver = webdriver.Chrome(service=service, options=chrome_options)
@@ -147,176 +186,323 @@ def setup_chrome_driver():
         print("   4. Try downloading ChromeDriver manually from https://chromedriver.chromium.org/")
         raise Exception("Could not initialize Chrome driver with any method")
 
-def login_to_lcr(driver, username, password, progress_callback=None):
-    """Perform the LCR login process and extract ministering data from JSON.
-    Returns the extracted data as a list of dictionaries."""
-    print("🔍 [DEBUG] login_to_lcr called")
+def read_ministering_json(driver, progress_callback=None):
+    """Return ministeringData from the current page's __NEXT_DATA__ JSON.
+    Raises if the JSON is missing or not in the expected shape."""
+    # First check if the script element exists
     try:
-        print("🔍 [DEBUG] Starting login process")
+        script = driver.find_element(By.ID, "__NEXT_DATA__")
         if progress_callback:
-            progress_callback("🔐 Starting LCR login process...")
+            progress_callback("✅ Found __NEXT_DATA__ script element")
+    except Exception as e:
+        if progress_callback:
+            progress_callback(f"❌ Could not find __NEXT_DATA__ script: {e}")
+        raise Exception("JSON script not found")
 
-        # Step 1: Navigate to LCR ministering page
-        print("🔍 [DEBUG] Step 1: Navigating to LCR")
+    # Get the script content
+    try:
+        script_content = script.get_attribute("innerHTML")
         if progress_callback:
-            progress_callback("📍 Step 1: Navigating to LCR ministering page...")
-        try:
-            driver.get("https://lcr.churchofjesuschrist.org/ministering")
-            print("🔍 [DEBUG] Navigation completed")
-            if progress_callback:
-                progress_callback(f"📍 Current URL: {driver.current_url}")
-                progress_callback(f"📍 Page title: {driver.title}")
-        except Exception as e:
-            print(f"🔍 [DEBUG] Navigation failed: {e}")
-            if progress_callback:
-                progress_callback(f"❌ Navigation failed: {e}")
-            return None
+            progress_callback(f"📄 Script content length: {len(script_content)} characters")
+    except Exception as e:
+        if progress_callback:
+            progress_callback(f"❌ Could not get script content: {e}")
+        raise Exception("Could not get script content")
 
-        # Wait for page to load and check if we're on the right page
-        print("🔍 [DEBUG] Waiting for page to load")
+    # Parse the JSON
+    try:
+        data = json.loads(script_content)
+        if progress_callback:
+            progress_callback("✅ JSON parsed successfully")
+    except Exception as e:
         if progress_callback:
-            progress_callback("📍 Waiting for login page to load...")
-        time.sleep(3)
+            progress_callback(f"❌ JSON parsing failed: {e}")
+        raise Exception("JSON parsing failed")
 
-        # Check if we got redirected or if there's an error
-        current_url = driver.current_url
-        page_title = driver.title
-        print(f"🔍 [DEBUG] After navigation - URL: {current_url}, Title: {page_title}")
+    # Extract ministering data from the parsed JSON
+    try:
+        ministering = data["props"]["pageProps"]["initialState"]["ministeringData"]
+        if progress_callback:
+            progress_callback("✅ Found ministeringData in JSON")
+    except KeyError as e:
         if progress_callback:
-            progress_callback(f"📍 After navigation - URL: {current_url}")
-            progress_callback(f"📍 Page title: {page_title}")
+            progress_callback(f"❌ ministeringData not found in JSON structure. Available keys: {list(data.keys()) if 'props' in data else 'No props key'}")
+        raise Exception("ministeringData not found in JSON")
+    except Exception as e:
+        if progress_callback:
+            progress_callback(f"❌ Error accessing ministeringData: {e}")
+        raise Exception("Error accessing ministeringData")
+    return ministering
+
+def rows_from_ministering(districts, organization, companionship_counter=1):
+    """Flatten one organization's districts into ministering brother rows.
+    Returns (rows, next_companionship_counter)."""
+    results = []
+    for district in districts:
+        district_name = district.get("districtName", "")
+        interviewer = district.get("supervisorName", "")
+        for companionship in district.get("companionships", []):
+            companionship_id = companionship_counter
+            for minister in companionship.get("ministers", []):
+                name = minister.get("name", "")
+                phone = minister.get("phone", "") if "phone" in minister else ""
+                email = minister.get("email", "") if "email" in minister else ""
+                row = {
+                    'organization': organization,
+                    'district': district_name,
+                    'interviewer': interviewer,
+                    'name': name,
+                    'phone': phone,
+                    'email': email,
+                    'companionship_id': companionship_id
+                }
+                results.append(row)
+            companionship_counter += 1
+    return results, companionship_counter
+
+def extract_rows_from_json(driver, progress_callback=None, organizations=(DEFAULT_ORGANIZATION,)):
+    """Read the ministering companionships from the page's __NEXT_DATA__ JSON.
+    Returns (rows, missing) where `missing` lists the requested organizations
+    whose data is not on this page. Raises if the JSON is not usable."""
+    ministering = read_ministering_json(driver, progress_callback)
+    results = []
+    missing = []
+    companionship_counter = 1
+    for organization in organizations:
+        json_key = ORGANIZATIONS[organization]['json_key']
+        if json_key not in ministering:
+            missing.append(organization)
+            continue
+        rows, companionship_counter = rows_from_ministering(ministering[json_key], organization, companionship_counter)
+        results.extend(rows)
+    return results, missing
+
+def extract_organizations_in_tabs(driver, organizations, progress_callback=None, trace=None, companionship_counter=1):
+    """Extract organizations whose data needs another page from the same logged-in session.
+    Every tab is opened before any is read so the pages load concurrently; each
+    tab is then read and closed in turn. Returns the combined rows."""
+    if trace is None:
+        trace = ScrapeTrace()
+    main_handle = driver.current_window_handle
+    tabs = []
+    for organization in organizations:
+        known_handles = set(driver.window_handles)
+        driver.execute_script("window.open(arguments[0], '_blank');", ORGANIZATIONS[organization]['url'])
+        new_handles = [h for h in driver.window_handles if h not in known_handles]
+        if new_handles:
+            tabs.append((organization, new_handles[0]))
+
+    results = []
+    try:
+        for organization, handle in tabs:
+            label = ORGANIZATIONS[organization]['label']
+            with trace.span(f'organization_tab.{organization}'):
+                driver.switch_to.window(handle)
+                try:
+                    WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.ID, "__NEXT_DATA__")))
+                    ministering = read_ministering_json(driver)
+                    rows, companionship_counter = rows_from_ministering(
+                        ministering.get(ORGANIZATIONS[organization]['json_key'], []), organization, companionship_counter)
+                    results.extend(rows)
+                    if progress_callback:
+                        progress_callback(f"✅ Extracted {len(rows)} {label} ministers from JSON")
+                except Exception as e:
+                    if session_lost(e):
+                        raise ScrapeInterrupted(str(e))
+                    if progress_callback:
+                        progress_callback(f"⚠️ Could not extract {label} data: {e}")
+                finally:
+                    driver.close()
+    finally:
+        driver.switch_to.window(main_handle)
+    return results
 
-        # Check for common error conditions - be more specific to avoid false positives
-        if ("error" in page_title.lower() and "sign in" not in page_title.lower()) or ("error" in driver.page_source.lower() and "oauth" not in driver.page_source.lower()):
-            print("🔍 [DEBUG] Error page detected")
+def login_to_lcr(driver, username, password, progress_callback=None, trace=None, checkpoint=None, on_checkpoint=None, organizations=None):
+    """Perform the LCR login process and extract ministering data from JSON.
+    Returns the extracted data as a list of dictionaries, each tagged with its
+    organization. `organizations` lists ORGANIZATIONS keys (default: elders).
+
+    `checkpoint` is the last state saved by a previous run ({'source', 'rows',
+    'completed_popups'} with popups as popup_key() values); extraction resumes
+    from it and only the brothers that are still unresolved have their popups
+    reopened. `on_checkpoint` is called with the same structure after every
+    CHECKPOINT_EVERY_POPUPS popups and when the browser session is lost."""
+    logger.debug("login_to_lcr called")
+    if trace is None:
+        trace = ScrapeTrace()
+    organizations = list(organizations or [DEFAULT_ORGANIZATION])
+    flush_checkpoint = None
+    try:
+        if progress_callback:
+            progress_callback("🔐 Starting LCR login process...")
+
+        # Step 1: Navigate to LCR ministering page
+        logger.debug("Step 1: Navigating to LCR")
+        if progress_callback:
+            progress_callback("📍 Step 1: Navigating to LCR ministering page...")
+        with trace.span('navigate'):
+            try:
+                driver.get("https://lcr.churchofjesuschrist.org/ministering")
+                logger.debug("Navigation completed")
+                if progress_callback:
+                    progress_callback(f"📍 Current URL: {driver.current_url}")
+                    progress_callback(f"📍 Page title: {driver.title}")
+            except Exception as e:
+                logger.debug(f"Navigation failed: {e}")
+                if progress_callback:
+                    progress_callback(f"❌ Navigation failed: {e}")
+                return None
+
+            # Wait for page to load and check if we're on the right page
+            logger.debug("Waiting for page to load")
             if progress_callback:
-                progress_callback("❌ Error page detected - possible login issue or site problem")
-            return None
+                progress_callback("📍 Waiting for login page to load...")
+            time.sleep(3)
 
-        if "maintenance" in page_title.lower() or "maintenance" in driver.page_source.lower():
-            print("🔍 [DEBUG] Maintenance page detected")
+            # Check if we got redirected or if there's an error
+            current_url = driver.current_url
+            page_title = driver.title
+            logger.debug(f"After navigation - URL: {current_url}, Title: {page_title}")
             if progress_callback:
-                progress_callback("❌ Site under maintenance")
-            return None
+                progress_callback(f"📍 After navigation - URL: {current_url}")
+                progress_callback(f"📍 Page title: {page_title}")
+
+            # Check for common error conditions - be more specific to avoid false positives
+            if ("error" in page_title.lower() and "sign in" not in page_title.lower()) or ("error" in driver.page_source.lower() and "oauth" not in driver.page_source.lower()):
+                logger.debug("Error page detected")
+                if progress_callback:
+                    progress_callback("❌ Error page detected - possible login issue or site problem")
+                return None
+
+            if "maintenance" in page_title.lower() or "maintenance" in driver.page_source.lower():
+                logger.debug("Maintenance page detected")
+                if progress_callback:
+                    progress_callback("❌ Site under maintenance")
+                return None
 
         # Step 2: Enter username - handle both direct and OAuth login
-        print("🔍 [DEBUG] Step 2: Looking for username field")
+        logger.debug("Step 2: Looking for username field")
         if progress_callback:
             progress_callback("📍 Step 2: Entering username...")
-        try:
-            # Try OAuth login first (id="username"), then fallback to direct (id="username-input")
-            username_selectors = [(By.ID, "username"), (By.ID, "username-input")]
-            username_field = None
-            for selector in username_selectors:
-                try:
-                    username_field = WebDriverWait(driver, 5).until(
-                        EC.visibility_of_element_located(selector)
-                    )
-                    print(f"🔍 [DEBUG] Username field found with selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not username_field:
-                raise TimeoutException("No username field found")
-            
-            username_field.clear()
-            username_field.send_keys(username)
-            print("🔍 [DEBUG] Username entered")
-            if progress_callback:
-                progress_callback("✅ Username entered")
-            time.sleep(1)
-        except TimeoutException:
-            print("🔍 [DEBUG] Username field not found")
-            if progress_callback:
-                progress_callback("❌ Username field not found or not visible")
-                progress_callback(f"📄 Current page source contains username field: {'username' in driver.page_source or 'username-input' in driver.page_source}")
-            return None
+        with trace.span('login.username'):
+            try:
+                # Try OAuth login first (id="username"), then fallback to direct (id="username-input")
+                username_selectors = [(By.ID, "username"), (By.ID, "username-input")]
+                username_field = None
+                for selector in username_selectors:
+                    try:
+                        username_field = WebDriverWait(driver, 5).until(
+                            EC.visibility_of_element_located(selector)
+                        )
+                        logger.debug(f"Username field found with selector: {selector}")
+                        break
+                    except TimeoutException:
+                        continue
+
+                if not username_field:
+                    raise TimeoutException("No username field found")
+
+                username_field.clear()
+                username_field.send_keys(username)
+                logger.debug("Username entered")
+                if progress_callback:
+                    progress_callback("✅ Username entered")
+                time.sleep(1)
+            except TimeoutException:
+                logger.debug("Username field not found")
+                if progress_callback:
+                    progress_callback("❌ Username field not found or not visible")
+                    progress_callback(f"📄 Current page source contains username field: {'username' in driver.page_source or 'username-input' in driver.page_source}")
+                return None
 
         # Step 3: Click Next button
         if progress_callback:
             progress_callback("📍 Step 3: Clicking Next button...")
-        try:
-            next_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "button-primary"))
-            )
-            next_button.click()
-            if progress_callback:
-                progress_callback("✅ Next button clicked")
-            time.sleep(2)
-        except TimeoutException:
-            if progress_callback:
-                progress_callback("❌ Next button not clickable")
-            return None
+        with trace.span('login.next'):
+            try:
+                next_button = WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable((By.ID, "button-primary"))
+                )
+                next_button.click()
+                if progress_callback:
+                    progress_callback("✅ Next button clicked")
+                time.sleep(2)
+            except TimeoutException:
+                if progress_callback:
+                    progress_callback("❌ Next button not clickable")
+                return None
 
         # Step 4: Enter password - handle both direct and OAuth login
         if progress_callback:
             progress_callback("📍 Step 4: Entering password...")
-        try:
-            # Try OAuth login first (id="password"), then fallback to direct (id="password-input")
-            password_selectors = [(By.ID, "password"), (By.ID, "password-input")]
-            password_field = None
-            for selector in password_selectors:
-                try:
-                    password_field = WebDriverWait(driver, 5).until(
-                        EC.visibility_of_element_located(selector)
-                    )
-                    print(f"🔍 [DEBUG] Password field found with selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not password_field:
-                raise TimeoutException("No password field found")
-            
-            password_field.clear()
-            password_field.send_keys(password)
-            if progress_callback:
-                progress_callback("✅ Password entered")
-            time.sleep(1)
-        except TimeoutException:
-            if progress_callback:
-                progress_callback("❌ Password field not found or not visible")
-            return None
+        with trace.span('login.password'):
+            try:
+                # Try OAuth login first (id="password"), then fallback to direct (id="password-input")
+                password_selectors = [(By.ID, "password"), (By.ID, "password-input")]
+                password_field = None
+                for selector in password_selectors:
+                    try:
+                        password_field = WebDriverWait(driver, 5).until(
+                            EC.visibility_of_element_located(selector)
+                        )
+                        logger.debug(f"Password field found with selector: {selector}")
+                        break
+                    except TimeoutException:
+                        continue
+
+                if not password_field:
+                    raise TimeoutException("No password field found")
+
+                password_field.clear()
+                password_field.send_keys(password)
+                if progress_callback:
+                    progress_callback("✅ Password entered")
+                time.sleep(1)
+            except TimeoutException:
+                if progress_callback:
+                    progress_callback("❌ Password field not found or not visible")
+                return None
 
         # Step 5: Click Verify/Login button
         if progress_callback:
             progress_callback("📍 Step 5: Clicking Verify button...")
-        try:
-            # Try multiple button selectors for OAuth vs direct login
-            button_selectors = [(By.ID, "button-primary"), (By.ID, "login-button"), (By.CSS_SELECTOR, "button[type='submit']")]
-            verify_button = None
-            for selector in button_selectors:
-                try:
-                    def button_enabled(driver):
-                        btn = driver.find_element(*selector)
-                        return btn.is_enabled() and btn.is_displayed()
-                    
-                    WebDriverWait(driver, 5).until(button_enabled)
-                    verify_button = driver.find_element(*selector)
-                    print(f"🔍 [DEBUG] Verify button found with selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not verify_button:
-                raise TimeoutException("No verify button found")
-            
-            verify_button.click()
-            if progress_callback:
-                progress_callback("✅ Verify button clicked")
-            time.sleep(3)
-        except TimeoutException:
-            if progress_callback:
-                progress_callback("❌ Verify button not clickable or not enabled")
-            return None
+        with trace.span('login.verify'):
+            try:
+                # Try multiple button selectors for OAuth vs direct login
+                button_selectors = [(By.ID, "button-primary"), (By.ID, "login-button"), (By.CSS_SELECTOR, "button[type='submit']")]
+                verify_button = None
+                for selector in button_selectors:
+                    try:
+                        def button_enabled(driver):
+                            btn = driver.find_element(*selector)
+                            return btn.is_enabled() and btn.is_displayed()
+
+                        WebDriverWait(driver, 5).until(button_enabled)
+                        verify_button = driver.find_element(*selector)
+                        logger.debug(f"Verify button found with selector: {selector}")
+                        break
+                    except TimeoutException:
+                        continue
+
+                if not verify_button:
+                    raise TimeoutException("No verify button found")
+
+                verify_button.click()
+                if progress_callback:
+                    progress_callback("✅ Verify button clicked")
+                time.sleep(3)
+            except TimeoutException:
+                if progress_callback:
+                    progress_callback("❌ Verify button not clickable or not enabled")
+                return None
 
         # Step 6: Wait for ministering page to load
         if progress_callback:
             progress_callback("📍 Step 6: Waiting for ministering page to load...")
-        WebDriverWait(driver, 30).until(
-            lambda driver: "ministering" in driver.current_url.lower() or "companionship" in driver.page_source.lower()
-        )
+        with trace.span('login.ministering_page'):
+            WebDriverWait(driver, 30).until(
+                lambda driver: "ministering" in driver.current_url.lower() or "companionship" in driver.page_source.lower()
+            )
         if progress_callback:
             progress_callback("✅ Ministering page loaded successfully")
 
@@ -325,177 +511,178 @@ def login_to_lcr(driver, username, password, progress_callback=None):
             progress_callback("📍 Step 7: Attempting JSON extraction...")
         results = []
         json_extraction_success = False
-        
-        try:
-            # First check if the script element exists
-            try:
-                script = driver.find_element(By.ID, "__NEXT_DATA__")
-                if progress_callback:
-                    progress_callback("✅ Found __NEXT_DATA__ script element")
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"❌ Could not find __NEXT_DATA__ script: {e}")
-                raise Exception("JSON script not found")
-
-            # Get the script content
-            try:
-                script_content = script.get_attribute("innerHTML")
-                if progress_callback:
-                    progress_callback(f"📄 Script content length: {len(script_content)} characters")
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"❌ Could not get script content: {e}")
-                raise Exception("Could not get script content")
-
-            # Parse the JSON
+        checkpoint = checkpoint or {}
+        completed_popups = set(checkpoint.get('completed_popups', []))
+        # Contact info already read from popups by a previous table-fallback run
+        resumed_contacts = {popup_key(row): row for row in checkpoint.get('rows', [])} if checkpoint.get('source') == 'table' else {}
+        unsaved_popups = 0
+        checkpoint_source = None
+
+        def save_checkpoint(source, popup=False):
+            nonlocal unsaved_popups, checkpoint_source
+            checkpoint_source = source
+            if popup:
+                unsaved_popups += 1
+                if unsaved_popups < CHECKPOINT_EVERY_POPUPS:
+                    return
+            unsaved_popups = 0
+            if on_checkpoint:
+                on_checkpoint({
+                    'source': source,
+                    'rows': [dict(row) for row in results],
+                    'completed_popups': list(completed_popups),
+                })
+
+        def flush():
+            if unsaved_popups:
+                save_checkpoint(checkpoint_source)
+        flush_checkpoint = flush
+
+        if checkpoint.get('source') == 'json' and checkpoint.get('rows'):
+            results = [dict(row) for row in checkpoint['rows']]
+            json_extraction_success = True
+            if progress_callback:
+                progress_callback(f"♻️ Resuming from checkpoint: {len(results)} ministering brothers, {len(completed_popups)} popups already done")
+        else:
             try:
-                data = json.loads(script_content)
+                with trace.span('json_extraction'):
+                    results, missing_organizations = extract_rows_from_json(driver, progress_callback, organizations)
                 if progress_callback:
-                    progress_callback("✅ JSON parsed successfully")
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"❌ JSON parsing failed: {e}")
-                raise Exception("JSON parsing failed")
+                    progress_callback(f"✅ Extracted {len(results)} ministering brothers from JSON")
+                if missing_organizations:
+                    # Other organizations load on their own page - read them in extra tabs of this session
+                    next_counter = max((row['companionship_id'] for row in results), default=0) + 1
+                    results.extend(extract_organizations_in_tabs(driver, missing_organizations, progress_callback, trace, next_counter))
+                json_extraction_success = True
+                save_checkpoint('json')
 
-            # Extract ministering data from the parsed JSON
-            try:
-                ministering = data["props"]["pageProps"]["initialState"]["ministeringData"]
-                if progress_callback:
-                    progress_callback("✅ Found ministeringData in JSON")
-            except KeyError as e:
-                if progress_callback:
-                    progress_callback(f"❌ ministeringData not found in JSON structure. Available keys: {list(data.keys()) if 'props' in data else 'No props key'}")
-                raise Exception("ministeringData not found in JSON")
             except Exception as e:
                 if progress_callback:
-                    progress_callback(f"❌ Error accessing ministeringData: {e}")
-                raise Exception("Error accessing ministeringData")
-
-            companionship_counter = 1
-            for district in ministering.get("elders", []):
-                district_name = district.get("districtName", "")
-                interviewer = district.get("supervisorName", "")
-                for companionship in district.get("companionships", []):
-                    companionship_id = companionship_counter
-                    for minister in companionship.get("ministers", []):
-                        name = minister.get("name", "")
-                        phone = minister.get("phone", "") if "phone" in minister else ""
-                        email = minister.get("email", "") if "email" in minister else ""
-                        row = {
-                            'district': district_name,
-                            'interviewer': interviewer,
-                            'name': name,
-                            'phone': phone,
-                            'email': email,
-                            'companionship_id': companionship_id
-                        }
-                        results.append(row)
-                    companionship_counter += 1
-
-            if progress_callback:
-                progress_callback(f"✅ Extracted {len(results)} ministering brothers from JSON")
-            json_extraction_success = True
-
-        except Exception as e:
-            if progress_callback:
-                progress_callback(f"⚠️ JSON extraction failed: {e}")
-                progress_callback("🔄 Falling back to table scraping approach...")
+                    progress_callback(f"⚠️ JSON extraction failed: {e}")
+                    progress_callback("🔄 Falling back to table scraping approach...")
 
         # If JSON extraction failed, use the table scraping approach that was working
         if not json_extraction_success:
             if progress_callback:
                 progress_callback("📍 Extracting ministering data from table...")
             try:
-                # Wait for the ministering table to load
-                table = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-                )
-                if progress_callback:
-                    progress_callback("✅ Ministering table found")
-
-                # Get all rows from the table
-                rows = table.find_elements(By.TAG_NAME, "tr")
-                if progress_callback:
-                    progress_callback(f"📊 Found {len(rows)} rows in table")
-
-                companionship_counter = 1
-                for row_idx, row in enumerate(rows[1:], 1):  # Skip header row
-                    try:
-                        cells = row.find_elements(By.TAG_NAME, "td")
-                        if len(cells) < 7:  # Need at least 7 columns
-                            continue
-
-                        # Extract district from first column (might be in header or separate)
-                        district_cell = cells[0]
-                        district_name = district_cell.text.strip()
-
-                        # Extract interviewer from second column
-                        interviewer_cell = cells[1]
-                        interviewer = interviewer_cell.text.strip()
-
-                        # Extract ministering brothers from third column
-                        ministering_cell = cells[2]
-                        brother_links = ministering_cell.find_elements(By.TAG_NAME, "a")
-
-                        # For each brother in this companionship
-                        for link in brother_links:
-                            name = link.text.strip()
-                            if name:
-                                # Try to get contact info from popup
-                                phone = ""
-                                email = ""
-                                try:
-                                    # Click the link to open popup
-                                    driver.execute_script("arguments[0].scrollIntoView();", link)
-                                    time.sleep(0.2)
-                                    link.click()
-                                    time.sleep(1)
-
-                                    # Look for phone and email in popup
-                                    try:
-                                        phone_elem = driver.find_element(By.XPATH, "//a[contains(@href, 'tel:')]")
-                                        phone = phone_elem.get_attribute("href").replace("tel:", "")
-                                    except:
-                                        pass
+                with trace.span('table_fallback'):
+                    # Wait for the ministering table to load
+                    table = WebDriverWait(driver, 15).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
+                    )
+                    if progress_callback:
+                        progress_callback("✅ Ministering table found")
 
-                                    try:
-                                        email_elem = driver.find_element(By.XPATH, "//a[contains(@href, 'mailto:')]")
-                                        email = email_elem.get_attribute("href").replace("mailto:", "")
-                                    except:
-                                        pass
+                    # Get all rows from the table
+                    rows = table.find_elements(By.TAG_NAME, "tr")
+                    if progress_callback:
+                        progress_callback(f"📊 Found {len(rows)} rows in table")
 
-                                    # Close popup
+                    companionship_counter = 1
+                    for row_idx, row in enumerate(rows[1:], 1):  # Skip header row
+                        try:
+                            cells = row.find_elements(By.TAG_NAME, "td")
+                            if len(cells) < 7:  # Need at least 7 columns
+                                continue
+
+                            # Extract district from first column (might be in header or separate)
+                            district_cell = cells[0]
+                            district_name = district_cell.text.strip()
+
+                            # Extract interviewer from second column
+                            interviewer_cell = cells[1]
+                            interviewer = interviewer_cell.text.strip()
+
+                            # Extract ministering brothers from third column
+                            ministering_cell = cells[2]
+                            brother_links = ministering_cell.find_elements(By.TAG_NAME, "a")
+
+                            # For each brother in this companionship
+                            for link in brother_links:
+                                name = link.text.strip()
+                                key = popup_key({'companionship_id': companionship_counter, 'name': name})
+                                if key in completed_popups and key in resumed_contacts:
+                                    # Popup already read before the last run was interrupted
+                                    phone = resumed_contacts[key]['phone']
+                                    email = resumed_contacts[key]['email']
+                                    results.append({
+                                        'organization': DEFAULT_ORGANIZATION,
+                                        'district': district_name,
+                                        'interviewer': interviewer,
+                                        'name': name,
+                                        'phone': phone,
+                                        'email': email,
+                                        'companionship_id': companionship_counter
+                                    })
+                                elif name:
+                                    # Try to get contact info from popup
+                                    phone = ""
+                                    email = ""
                                     try:
-                                        close_btn = driver.find_element(By.XPATH, "//button[contains(text(), 'Close') or @aria-label='Close']")
-                                        close_btn.click()
-                                    except:
-                                        driver.find_element(By.TAG_NAME, "body").send_keys("\ue00c")  # Escape key
-                                    time.sleep(0.5)
-
-                                except Exception as e:
-                                    if progress_callback:
-                                        progress_callback(f"⚠️ Could not get contact info for {name}: {e}")
-
-                                row_data = {
-                                    'district': district_name,
-                                    'interviewer': interviewer,
-                                    'name': name,
-                                    'phone': phone,
-                                    'email': email,
-                                    'companionship_id': companionship_counter
-                                }
-                                results.append(row_data)
-
-                        companionship_counter += 1
-
-                    except Exception as e:
-                        if progress_callback:
-                            progress_callback(f"⚠️ Error processing row {row_idx}: {e}")
-                        continue
+                                        with trace.span('popup'):
+                                            # Click the link to open popup
+                                            driver.execute_script("arguments[0].scrollIntoView();", link)
+                                            time.sleep(0.2)
+                                            link.click()
+                                            time.sleep(1)
+
+                                            # Look for phone and email in popup
+                                            try:
+                                                phone_elem = driver.find_element(By.XPATH, "//a[contains(@href, 'tel:')]")
+                                                phone = phone_elem.get_attribute("href").replace("tel:", "")
+                                            except:
+                                                pass
+
+                                            try:
+                                                email_elem = driver.find_element(By.XPATH, "//a[contains(@href, 'mailto:')]")
+                                                email = email_elem.get_attribute("href").replace("mailto:", "")
+                                            except:
+                                                pass
+
+                                            # Close popup
+                                            try:
+                                                close_btn = driver.find_element(By.XPATH, "//button[contains(text(), 'Close') or @aria-label='Close']")
+                                                close_btn.click()
+                                            except:
+                                                driver.find_element(By.TAG_NAME, "body").send_keys("\ue00c")  # Escape key
+                                            time.sleep(0.5)
+                                        completed_popups.add(key)
+
+                                    except Exception as e:
+                                        if session_lost(e):
+                                            raise ScrapeInterrupted(str(e))
+                                        if progress_callback:
+                                            progress_callback(f"⚠️ Could not get contact info for {name}: {e}")
+
+                                    row_data = {
+                                        'organization': DEFAULT_ORGANIZATION,
+                                        'district': district_name,
+                                        'interviewer': interviewer,
+                                        'name': name,
+                                        'phone': phone,
+                                        'email': email,
+                                        'companionship_id': companionship_counter
+                                    }
+                                    results.append(row_data)
+                                    save_checkpoint('table', popup=True)
+
+                            companionship_counter += 1
+
+                        except ScrapeInterrupted:
+                            raise
+                        except Exception as e:
+                            if session_lost(e):
+                                raise ScrapeInterrupted(str(e))
+                            if progress_callback:
+                                progress_callback(f"⚠️ Error processing row {row_idx}: {e}")
+                            continue
 
                 if progress_callback:
                     progress_callback(f"✅ Extracted {len(results)} ministering brothers from table")
 
+            except ScrapeInterrupted:
+                raise
             except Exception as e:
                 if progress_callback:
                     progress_callback(f"❌ Error extracting ministering data from table: {e}")
@@ -506,131 +693,137 @@ def login_to_lcr(driver, username, password, progress_callback=None):
             if progress_callback:
                 progress_callback("📍 Step 8: Augmenting with popup data from ministering brothers column...")
             try:
-                # Find the ministering table
-                table = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-                )
-                
-                total_links = 0
-                total_popups = 0
-                total_phone_found = 0
-                total_email_found = 0
-
-                # Get all rows from the table
-                rows = table.find_elements(By.TAG_NAME, "tr")
-                print(f"🔍 [DEBUG] Found {len(rows)} rows for popup extraction")
-                
-                for row_idx, row in enumerate(rows[1:], 1):  # Skip header row
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    print(f"🔍 [DEBUG] Row {row_idx}: has {len(cells)} cells")
-                    if len(cells) < 3:  # Need at least 3 columns (district, interviewer, ministering brothers)
-                        print(f"🔍 [DEBUG] Row {row_idx}: skipped - not enough cells")
-                        continue
-                    
-                    # Debug: print what's in each cell
-                    for cell_idx, cell in enumerate(cells[:5]):  # Print first 5 cells
-                        print(f"🔍 [DEBUG] Row {row_idx}, Cell {cell_idx}: '{cell.text[:50] if cell.text else '(empty)'}'")
-                    
-                    # Check column 1 (index 1, second column) for ministering brother links
-                    ministering_cell = cells[1]
-                    brother_links = ministering_cell.find_elements(By.TAG_NAME, "a")
-                    print(f"🔍 [DEBUG] Row {row_idx}, Cell 1: found {len(brother_links)} links")
-                    
-                    for link in brother_links:
-                        link_text = link.text.strip()
-                        if not link_text:
+                with trace.span('popup_augmentation'):
+                    # Find the ministering table
+                    table = WebDriverWait(driver, 15).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
+                    )
+
+                    total_links = 0
+                    total_skipped = 0
+                    total_popups = 0
+                    total_phone_found = 0
+                    total_email_found = 0
+
+                    # Get all rows from the table
+                    rows = table.find_elements(By.TAG_NAME, "tr")
+                    logger.debug(f"Found {len(rows)} rows for popup extraction")
+                    # The table only shows the default organization's companionships
+                    table_results = [row_data for row_data in results
+                                     if row_data.get('organization', DEFAULT_ORGANIZATION) == DEFAULT_ORGANIZATION]
+
+                    for row_idx, row in enumerate(rows[1:], 1):  # Skip header row
+                        cells = row.find_elements(By.TAG_NAME, "td")
+                        if len(cells) < 3:  # Need at least 3 columns (district, interviewer, ministering brothers)
+                            debug_sampled('row_skipped', f"Row {row_idx}: skipped - only {len(cells)} cells")
                             continue
-                        total_links += 1
-                        print(f"🔍 [DEBUG] Processing link {total_links}: {link_text}")
 
-                        # Try to open popup for this ministering brother
-                        try:
-                            driver.execute_script("arguments[0].scrollIntoView();", link)
-                            time.sleep(0.2)
-                            try:
-                                link.click()
-                            except Exception:
-                                driver.execute_script("arguments[0].click();", link)
-                            time.sleep(1)
+                        # Reading cell text is a WebDriver round-trip per cell, so only do it when debugging
+                        if logger.isEnabledFor(logging.DEBUG):
+                            cell_texts = [cell.text[:50] if cell.text else '(empty)' for cell in cells[:5]]
+                            debug_sampled('row_cells', f"Row {row_idx} cells: {cell_texts}")
 
-                            # Look for popup - try different selectors
-                            popup = None
+                        # Check column 1 (index 1, second column) for ministering brother links
+                        ministering_cell = cells[1]
+                        brother_links = ministering_cell.find_elements(By.TAG_NAME, "a")
+
+                        for link in brother_links:
+                            link_text = link.text.strip()
+                            if not link_text:
+                                continue
+                            total_links += 1
+
+                            # Only reopen brothers that are still unresolved
+                            matching_row = find_unresolved_row(table_results, link_text, completed_popups)
+                            if not matching_row:
+                                total_skipped += 1
+                                continue
+                            debug_sampled('popup_link', f"Processing link {total_links}: {link_text}")
+
+                            # Try to open popup for this ministering brother
                             try:
-                                popup = driver.find_element(By.CLASS_NAME, "sc-cd0364fd-0")
-                                print(f"🔍 [DEBUG] Popup found with class 'sc-cd0364fd-0' for {link_text}")
-                            except Exception:
-                                try:
-                                    popup = driver.find_element(By.CSS_SELECTOR, "[role='dialog']")
-                                    print(f"🔍 [DEBUG] Popup found with role='dialog' for {link_text}")
-                                except Exception:
-                                    print(f"🔍 [DEBUG] No popup found for {link_text}")
-
-                            if popup:
-                                total_popups += 1
-                                phone = ""
-                                email = ""
-
-                                # Extract phone from tel: link
-                                try:
-                                    phone_elem = popup.find_element(By.XPATH, ".//a[contains(@href, 'tel:')]")
-                                    phone = phone_elem.get_attribute("href").replace("tel:", "").strip()
-                                    print(f"🔍 [DEBUG] Phone found for {link_text}: {phone}")
-                                    if phone:
-                                        total_phone_found += 1
-                                except Exception:
-                                    print(f"🔍 [DEBUG] No phone link found for {link_text}")
-
-                                # Extract email from mailto: link
-                                try:
-                                    email_elem = popup.find_element(By.XPATH, ".//a[contains(@href, 'mailto:')]")
-                                    email = email_elem.get_attribute("href").replace("mailto:", "").strip()
-                                    print(f"🔍 [DEBUG] Email found for {link_text}: {email}")
-                                    if email:
-                                        total_email_found += 1
-                                except Exception:
-                                    print(f"🔍 [DEBUG] No email link found for {link_text}")
-
-                                # Update matching row in results
-                                for row_data in results:
-                                    if row_data['name'] == link_text:
-                                        if phone and not row_data['phone']:
-                                            row_data['phone'] = phone
-                                            print(f"🔍 [DEBUG] Updated phone for {link_text}")
-                                        if email and not row_data['email']:
-                                            row_data['email'] = email
-                                            print(f"🔍 [DEBUG] Updated email for {link_text}")
-                                        break
-
-                                # Close popup
-                                try:
-                                    close_btn = popup.find_element(By.XPATH, ".//button[contains(text(), 'Close') or @aria-label='Close']")
-                                    close_btn.click()
-                                    print(f"🔍 [DEBUG] Closed popup for {link_text}")
-                                except Exception:
+                                with trace.span('popup'):
+                                    driver.execute_script("arguments[0].scrollIntoView();", link)
+                                    time.sleep(0.2)
                                     try:
-                                        driver.find_element(By.TAG_NAME, "body").send_keys("\ue00c")  # Escape key
-                                        print(f"🔍 [DEBUG] Closed popup with Escape for {link_text}")
+                                        link.click()
                                     except Exception:
-                                        print(f"🔍 [DEBUG] Could not close popup for {link_text}")
-                                time.sleep(0.5)
+                                        driver.execute_script("arguments[0].click();", link)
+                                    time.sleep(1)
+
+                                    # Look for popup - try different selectors
+                                    popup = None
+                                    try:
+                                        popup = driver.find_element(By.CLASS_NAME, "sc-cd0364fd-0")
+                                    except Exception:
+                                        try:
+                                            popup = driver.find_element(By.CSS_SELECTOR, "[role='dialog']")
+                                        except Exception:
+                                            logger.debug(f"No popup found for {link_text}")
+
+                                    if popup:
+                                        total_popups += 1
+                                        phone = ""
+                                        email = ""
+
+                                        # Extract phone from tel: link
+                                        try:
+                                            phone_elem = popup.find_element(By.XPATH, ".//a[contains(@href, 'tel:')]")
+                                            phone = phone_elem.get_attribute("href").replace("tel:", "").strip()
+                                            if phone:
+                                                total_phone_found += 1
+                                        except Exception:
+                                            debug_sampled('popup_no_phone', f"No phone link found for {link_text}")
+
+                                        # Extract email from mailto: link
+                                        try:
+                                            email_elem = popup.find_element(By.XPATH, ".//a[contains(@href, 'mailto:')]")
+                                            email = email_elem.get_attribute("href").replace("mailto:", "").strip()
+                                            if email:
+                                                total_email_found += 1
+                                        except Exception:
+                                            debug_sampled('popup_no_email', f"No email link found for {link_text}")
+
+                                        # Update matching row in results
+                                        if phone and not matching_row['phone']:
+                                            matching_row['phone'] = phone
+                                        if email and not matching_row['email']:
+                                            matching_row['email'] = email
+
+                                        # Close popup
+                                        try:
+                                            close_btn = popup.find_element(By.XPATH, ".//button[contains(text(), 'Close') or @aria-label='Close']")
+                                            close_btn.click()
+                                        except Exception:
+                                            try:
+                                                driver.find_element(By.TAG_NAME, "body").send_keys("\ue00c")  # Escape key
+                                            except Exception:
+                                                logger.debug(f"Could not close popup for {link_text}")
+                                        time.sleep(0.5)
+                                        completed_popups.add(popup_key(matching_row))
+                                        save_checkpoint('json', popup=True)
+
+                            except Exception as e:
+                                if session_lost(e):
+                                    raise ScrapeInterrupted(str(e))
+                                logger.debug(f"Error processing popup for {link_text}: {e}")
+
+                logger.info(f"Popup extraction summary: {total_links} links, {total_skipped} already resolved, "
+                            f"{total_popups} popups, {total_phone_found} phones, {total_email_found} emails")
 
-                        except Exception as e:
-                            print(f"🔍 [DEBUG] Error processing popup for {link_text}: {e}")
-
-                print(f"🔍 [DEBUG] Popup extraction summary:")
-                print(f"  - Total links processed: {total_links}")
-                print(f"  - Popups opened: {total_popups}")
-                print(f"  - Phone numbers found: {total_phone_found}")
-                print(f"  - Emails found: {total_email_found}")
-                
                 if progress_callback:
                     progress_callback(f"[SUMMARY] Processed {total_links} ministering brother links")
+                    progress_callback(f"[SUMMARY] Skipped {total_skipped} already resolved brothers")
                     progress_callback(f"[SUMMARY] Opened {total_popups} popups")
                     progress_callback(f"[SUMMARY] Found {total_phone_found} phone numbers")
                     progress_callback(f"[SUMMARY] Found {total_email_found} emails")
-                    
+
+            except ScrapeInterrupted:
+                raise
             except Exception as e:
-                print(f"🔍 [DEBUG] Error during popup augmentation: {e}")
+                if session_lost(e):
+                    raise ScrapeInterrupted(str(e))
+                logger.warning(f"Error during popup augmentation: {e}")
                 if progress_callback:
                     progress_callback(f"[WARN] Could not augment with popups: {e}")
 
@@ -638,60 +831,74 @@ def login_to_lcr(driver, username, password, progress_callback=None):
             progress_callback(f"✅ Scraping complete! Extracted {len(results)} ministering brothers")
         return results
 
+    except ScrapeInterrupted as e:
+        if flush_checkpoint:
+            flush_checkpoint()  # popups read since the last batch was saved
+        if progress_callback:
+            progress_callback(f"❌ Browser session lost: {e}. Progress was checkpointed - retry to resume.")
+        return None
     except Exception as e:
         if progress_callback:
             progress_callback(f"❌ Login process failed: {e}")
         return None
 
-def scrape_ministering_data(username, password, progress_callback=None):
+def scrape_ministering_data(username, password, progress_callback=None, trace=None, checkpoint=None, on_checkpoint=None, organizations=None):
     """Main function to scrape ministering data for the web app.
-    Returns a list of ministering brother dictionaries or None on failure."""
-    print("🔍 [DEBUG] scrape_ministering_data called with username length:", len(username) if username else 0)
+    Returns a list of ministering brother dictionaries or None on failure.
+    `organizations` lists the ORGANIZATIONS to extract from the one login session.
+    Pass a ScrapeTrace as `trace` to collect the per-phase timing breakdown, and
+    `checkpoint`/`on_checkpoint` to resume and save progress (see login_to_lcr)."""
+    logger.debug(f"scrape_ministering_data called with username length: {len(username) if username else 0}")
+    if trace is None:
+        trace = ScrapeTrace()
+
+    # Nothing left to do if the checkpoint already resolved every brother
+    if checkpoint and checkpoint.get('source') == 'json' and checkpoint.get('rows'):
+        if not unresolved_names(checkpoint['rows'], checkpoint.get('completed_popups', [])):
+            if progress_callback:
+                progress_callback(f"♻️ Checkpoint already complete - reusing {len(checkpoint['rows'])} ministering brothers")
+            return [dict(row) for row in checkpoint['rows']]
+
     driver = None
     try:
-        print("🔍 [DEBUG] About to call setup_chrome_driver()")
         if progress_callback:
             progress_callback("🚀 Initializing Chrome driver for scraping...")
 
-        driver = setup_chrome_driver()
-        print("🔍 [DEBUG] setup_chrome_driver() completed successfully")
+        with trace.span('driver_setup'):
+            driver = setup_chrome_driver()
+        logger.debug("setup_chrome_driver() completed successfully")
 
         if progress_callback:
             progress_callback("🔐 Starting login and data extraction...")
 
-        print("🔍 [DEBUG] About to call login_to_lcr()")
-        results = login_to_lcr(driver, username, password, progress_callback)
-        print("🔍 [DEBUG] login_to_lcr() completed, results:", "None" if results is None else f"list with {len(results)} items")
+        results = login_to_lcr(driver, username, password, progress_callback, trace=trace,
+                               checkpoint=checkpoint, on_checkpoint=on_checkpoint, organizations=organizations)
+        logger.debug(f"login_to_lcr() completed, results: {'None' if results is None else f'list with {len(results)} items'}")
 
         if results is not None:
             if progress_callback:
                 progress_callback(f"✅ Successfully extracted {len(results)} ministering brothers")
-            print("🔍 [DEBUG] Returning successful results")
             return results
         else:
             if progress_callback:
                 progress_callback("❌ Failed to extract ministering data")
-            print("🔍 [DEBUG] login_to_lcr returned None")
             return None
 
     except Exception as e:
-        print(f"🔍 [DEBUG] Exception caught in scrape_ministering_data: {e}")
-        import traceback
-        print("🔍 [DEBUG] Full traceback:")
-        traceback.print_exc()
+        logger.exception(f"Exception caught in scrape_ministering_data: {e}")
         if progress_callback:
             progress_callback(f"❌ Scraping failed: {e}")
         return None
     finally:
-        print("🔍 [DEBUG] In finally block, about to close driver")
         if driver:
             try:
-                driver.quit()
-                print("🔍 [DEBUG] Driver closed successfully")
+                with trace.span('driver_quit'):
+                    driver.quit()
+                logger.debug("Driver closed successfully")
                 if progress_callback:
                     progress_callback("🧹 Chrome driver closed")
             except Exception as e:
-                print(f"🔍 [DEBUG] Error closing driver: {e}")
+                logger.warning(f"Error closing driver: {e}")
                 if progress_callback:
                     progress_callback(f"⚠️ Warning: Could not close driver properly: {e}")
 
@@ -708,7 +915,9 @@ if __name__ == "__main__":
     def print_progress(message):
         print(message)
 
-    results = scrape_ministering_data(username, password, print_progress)
+    trace = ScrapeTrace()
+    results = scrape_ministering_data(username, password, print_progress, trace=trace)
+    print(f"⏱️ Timing breakdown: {json.dumps(trace.summary(), indent=2)}")
 
     if results:
         print(f"\n✅ Scraping successful! Extracted {len(results)} ministering brothers.")
@@ -719,4 +928,4 @@ if __name__ == "__main__":
             print(f"  ... and {len(results)-3} more")
     else:
         print("❌ Scraping failed!")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
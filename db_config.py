@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Database connection settings.
+
+DATABASE_URL picks the database; without it the app uses SQLite
+(interviews.db in the instance folder). Every SQLite connection is tuned for a
+web app whose background threads (notifications, reminders, roster sync) write
+while pages are being read:
+
+- journal_mode=WAL lets readers carry on while a writer commits
+- synchronous=NORMAL is durable enough under WAL and avoids an fsync per commit
+- busy_timeout makes a writer wait for the lock instead of failing with
+  "database is locked"
+- foreign_keys=ON enforces the ON DELETE actions the models declare
+- cache_size gives each connection a larger page cache
+
+PostgreSQL (the App Platform setup in DEPLOYMENT.md) gets a sized,
+health-checked connection pool instead.
+"""
+
+import os
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+DEFAULT_DATABASE_URL = 'sqlite:///interviews.db'
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '10000'))
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', '20000'))
+
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+
+
+def database_url(url=None):
+    """DATABASE_URL (or `url`), with Heroku/App Platform style postgres:// fixed up."""
+    url = url or os.environ.get('DATABASE_URL') or DEFAULT_DATABASE_URL
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def engine_options(url):
+    backend = make_url(url).get_backend_name()
+    if backend == 'sqlite':
+        # The driver's own timeout covers the wait before the busy_timeout pragma is set
+        return {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': True,  # drop connections the server closed while idle
+    }
+
+
+def configure_database(app, url=None):
+    url = database_url(url)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(url)
+
+
+@event.listens_for(Engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute(f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}')
+    cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.execute(f'PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}')  # negative = KiB rather than pages
+    cursor.close()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+In-process event bus for booking changes made by admins.
+
+Routes that remove or add bookings queue events on the database session; the
+app publishes them here once the transaction commits. MemberEventCoalescer
+buffers events per member for a short window so a bulk delete, or a remove
+followed by an add, turns into one notice per member instead of one per row.
+"""
+
+import logging
+import os
+import threading
+from collections import defaultdict
+
+logger = logging.getLogger('events')
+
+BOOKING_CANCELLED = 'booking-cancelled'
+BOOKING_ADDED = 'booking-added'
+WAITLIST_PROMOTED = 'waitlist-promoted'
+
+COALESCE_SECONDS = float(os.environ.get('NOTICE_COALESCE_SECONDS', '120'))
+
+
+class EventBus:
+    """Synchronous publish/subscribe keyed on event type."""
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type, handler):
+        with self._lock:
+            self._handlers[event_type].append(handler)
+
+    def publish(self, event_type, payload):
+        with self._lock:
+            handlers = list(self._handlers[event_type])
+        for handler in handlers:
+            try:
+                handler(event_type, payload)
+            except Exception as e:
+                logger.exception(f"Handler for {event_type} failed: {e}")
+
+
+def summarize_changes(events):
+    """Collapse one member's buffered events into {'cancelled', 'added', 'moved'}.
+
+    A cancellation and an addition in the same window read as a move. Events
+    are (event_type, payload) pairs; payloads carry 'slot_id' and 'starts_at'.
+    """
+    cancelled = [p for t, p in events if t == BOOKING_CANCELLED]
+    added = [p for t, p in events if t == BOOKING_ADDED]
+    # Adding back the slot that was just removed is not a change
+    added_slots = {p['slot_id'] for p in added}
+    cancelled_slots = {p['slot_id'] for p in cancelled}
+    cancelled = [p for p in cancelled if p['slot_id'] not in added_slots]
+    added = [p for p in added if p['slot_id'] not in cancelled_slots]
+    cancelled.sort(key=lambda p: p['starts_at'])
+    added.sort(key=lambda p: p['starts_at'])
+    pairs = min(len(cancelled), len(added))
+    moved = list(zip(cancelled[:pairs], added[:pairs]))
+    return {'cancelled': cancelled[pairs:], 'added': added[pairs:], 'moved': moved}
+
+
+class MemberEventCoalescer:
+    """Buffers events per member and calls `flush(member_id, events)` `window`
+    seconds after the member's first buffered event."""
+
+    def __init__(self, flush, window=None):
+        self.flush = flush
+        self.window = COALESCE_SECONDS if window is None else window
+        self._pending = {}  # member_id -> [(event_type, payload)]
+        self._timers = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event_type, payload):
+        member_id = payload['member_id']
+        with self._lock:
+            self._pending.setdefault(member_id, []).append((event_type, payload))
+            if member_id not in self._timers:
+                timer = threading.Timer(self.window, self.flush_member, args=(member_id,))
+                timer.daemon = True
+                self._timers[member_id] = timer
+                timer.start()
+
+    def flush_member(self, member_id):
+        with self._lock:
+            events = self._pending.pop(member_id, [])
+            timer = self._timers.pop(member_id, None)
+        if timer:
+            timer.cancel()
+        if events:
+            try:
+                self.flush(member_id, events)
+            except Exception as e:
+                logger.exception(f"Flushing booking changes for member {member_id} failed: {e}")
+
+    def flush_all(self):
+        with self._lock:
+            member_ids = list(self._pending)
+        for member_id in member_ids:
+            self.flush_member(member_id)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Keyset (cursor) pagination.
+
+A page is "the first `limit` rows ordered by some columns that sort after the
+last row of the previous page", so every page costs one index range scan no
+matter how deep into the list it is, and rows inserted or deleted between
+requests never shift a page the way OFFSET does. The position travels as an
+opaque cursor: the last row's sort values, JSON-encoded and base64'd.
+
+The sort columns must end with a unique column (normally the id) so that the
+order is total.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, time
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(*values):
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, time)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, *parsers):
+    """The values of a cursor made by encode_cursor, each converted by its parser
+    (e.g. date.fromisoformat, int). Raises ValueError for a malformed cursor."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError(f'Invalid cursor: {cursor!r}')
+
+
+def keyset_page(query, columns, after, limit, key):
+    """One page of `query` in `columns` order, starting after the row whose sort
+    values are `after` (None for the first page). `key(row)` gives a row's sort
+    values. Returns (rows, cursor for the next page or None on the last page)."""
+    if after:
+        query = query.filter(tuple_(*columns) > tuple_(*after))
+    rows = query.order_by(*columns).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the interviews database (SQLite or PostgreSQL).
+
+db.create_all() only creates missing tables; it never changes a table that
+already exists. Each migration below runs once, in order, in its own
+transaction, and is recorded in the schema_version table, so an existing
+database is brought up to date in place when the app starts. A brand-new
+database is created straight from the models and stamped with the latest
+version.
+
+Databases from before this table existed start at version 0. Older versions of
+the app patched some columns in ad hoc, so every migration must tolerate its
+change already being present.
+
+Apply by hand with: python migrations.py
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateTable
+
+logger = logging.getLogger('migrations')
+
+MIGRATIONS = []  # (version, description, function(conn, metadata))
+
+
+def migration(version, description):
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+
+def column_names(conn, table):
+    return {c['name'] for c in inspect(conn).get_columns(table)}
+
+
+def index_names(conn, table):
+    return {i['name'] for i in inspect(conn).get_indexes(table)}
+
+
+def create_index(conn, name, table, columns, unique=False):
+    conn.execute(text(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+@migration(1, 'Tables and columns added before versioned migrations')
+def baseline(conn, metadata):
+    metadata.create_all(conn)  # only creates tables that are missing
+    if 'organization' not in column_names(conn, 'district'):
+        conn.execute(text("ALTER TABLE district ADD COLUMN organization VARCHAR(30) NOT NULL DEFAULT 'elders'"))
+    if 'time_preference' not in column_names(conn, 'member'):
+        conn.execute(text("ALTER TABLE member ADD COLUMN time_preference VARCHAR(20)"))
+    if 'campaign' not in column_names(conn, 'notification'):
+        conn.execute(text("ALTER TABLE notification ADD COLUMN campaign VARCHAR(100)"))
+    create_index(conn, 'ix_notification_member_channel_campaign', 'notification', ['member_id', 'channel', 'campaign'], unique=True)
+    if 'rule_id' not in column_names(conn, 'interview_slot'):
+        conn.execute(text("ALTER TABLE interview_slot ADD COLUMN rule_id INTEGER REFERENCES slot_rule (id)"))
+
+
+@migration(2, 'One slot per district and start time')
+def unique_slot_start(conn, metadata):
+    if 'ix_interview_slot_district_date_start' in index_names(conn, 'interview_slot'):
+        return
+    # Older generators could create the same slot twice; fold duplicates into the first copy
+    conn.execute(text("""
+        UPDATE booking SET slot_id = (
+            SELECT MIN(s2.id) FROM interview_slot s1 JOIN interview_slot s2
+              ON s2.district_id = s1.district_id AND s2.date = s1.date AND s2.start_time = s1.start_time
+            WHERE s1.id = booking.slot_id)
+        WHERE slot_id IN (SELECT id FROM interview_slot)"""))
+    keep = "SELECT MIN(id) FROM interview_slot GROUP BY district_id, date, start_time"
+    conn.execute(text(f"DELETE FROM waitlist_entry WHERE slot_id NOT IN ({keep})"))
+    conn.execute(text(f"DELETE FROM interview_slot WHERE id NOT IN ({keep})"))
+    # A merged slot can hold more bookings than it allows; keep them all and raise its capacity to fit
+    booked = "SELECT COUNT(DISTINCT member_id) FROM booking WHERE booking.slot_id = interview_slot.id"
+    overfilled = conn.execute(text(f"SELECT id, max_slots, ({booked}) FROM interview_slot WHERE max_slots < ({booked})")).fetchall()
+    if overfilled:
+        conn.execute(text(f"UPDATE interview_slot SET max_slots = ({booked}) WHERE max_slots < ({booked})"))
+        changes = ', '.join(f'slot {slot_id} {old}->{count}' for slot_id, old, count in overfilled[:20])
+        logger.warning(f"Raised max_slots of {len(overfilled)} merged slots to fit their bookings: {changes}")
+    create_index(conn, 'ix_interview_slot_district_date_start', 'interview_slot', ['district_id', 'date', 'start_time'], unique=True)
+
+
+@migration(3, 'Indexes for schedule, calendar, import and delete lookups')
+def hot_path_indexes(conn, metadata):
+    # A member is booked into a slot at most once (add_booking and book_slot check for it)
+    conn.execute(text("DELETE FROM booking WHERE id NOT IN (SELECT MIN(id) FROM booking GROUP BY slot_id, member_id)"))
+    create_index(conn, 'ix_booking_slot_member', 'booking', ['slot_id', 'member_id'], unique=True)
+    create_index(conn, 'ix_booking_member_id', 'booking', ['member_id'])
+    create_index(conn, 'ix_team_district_id', 'team', ['district_id'])
+    create_index(conn, 'ix_member_team_id', 'member', ['team_id'])
+    create_index(conn, 'ix_member_email', 'member', ['email'])
+    create_index(conn, 'ix_waitlist_entry_member_id', 'waitlist_entry', ['member_id'])
+    create_index(conn, 'ix_interview_slot_rule_id', 'interview_slot', ['rule_id'])
+    create_index(conn, 'ix_slot_rule_district_id', 'slot_rule', ['district_id'])
+
+
+def missing_delete_actions(conn, table):
+    """Foreign keys of `table` whose ON DELETE action in the database differs from the model."""
+    existing = {}
+    for fk in inspect(conn).get_foreign_keys(table.name):
+        ondelete = (fk.get('options') or {}).get('ondelete')
+        existing[tuple(fk['constrained_columns'])] = (fk.get('name'), (ondelete or '').upper() or None)
+    mismatched = []
+    for constraint in table.foreign_key_constraints:
+        if not constraint.ondelete:
+            continue
+        name, ondelete = existing.get(tuple(constraint.column_keys), (None, None))
+        if ondelete != constraint.ondelete.upper():
+            mismatched.append((name, constraint))
+    return mismatched
+
+
+def rebuild_sqlite_table(conn, table):
+    """SQLite cannot alter a constraint, so copy the rows into a table created from
+    the model and swap it in. Needs PRAGMA foreign_keys=OFF (see upgrade())."""
+    temp_name = f'_{table.name}_rebuild'
+    temp = table.to_metadata(table.metadata, name=temp_name)
+    try:
+        conn.execute(CreateTable(temp))
+    finally:
+        table.metadata.remove(temp)
+    shared = [c.name for c in table.columns if c.name in column_names(conn, table.name)]
+    column_list = ', '.join(shared)
+    conn.execute(text(f"INSERT INTO {temp_name} ({column_list}) SELECT {column_list} FROM {table.name}"))
+    conn.execute(text(f"DROP TABLE {table.name}"))
+    conn.execute(text(f"ALTER TABLE {temp_name} RENAME TO {table.name}"))
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+@migration(4, 'ON DELETE actions for booking, waitlist, member, notification and rule keys')
+def foreign_key_actions(conn, metadata):
+    # Rows orphaned while SQLite was not enforcing foreign keys would block the new constraints
+    conn.execute(text("DELETE FROM booking WHERE slot_id NOT IN (SELECT id FROM interview_slot) "
+                      "OR member_id NOT IN (SELECT id FROM member)"))
+    conn.execute(text("DELETE FROM waitlist_entry WHERE slot_id NOT IN (SELECT id FROM interview_slot) "
+                      "OR member_id NOT IN (SELECT id FROM member)"))
+    conn.execute(text("DELETE FROM slot_rule_exception WHERE rule_id NOT IN (SELECT id FROM slot_rule)"))
+    conn.execute(text("UPDATE member SET team_id = NULL WHERE team_id NOT IN (SELECT id FROM team)"))
+    conn.execute(text("UPDATE notification SET member_id = NULL WHERE member_id NOT IN (SELECT id FROM member)"))
+    conn.execute(text("UPDATE interview_slot SET rule_id = NULL WHERE rule_id NOT IN (SELECT id FROM slot_rule)"))
+
+    for name in ('booking', 'waitlist_entry', 'slot_rule_exception', 'member', 'notification', 'interview_slot'):
+        table = metadata.tables[name]
+        mismatched = missing_delete_actions(conn, table)
+        if not mismatched:
+            continue
+        if conn.dialect.name == 'sqlite':
+            rebuild_sqlite_table(conn, table)
+            continue
+        for constraint_name, constraint in mismatched:
+            columns = ', '.join(constraint.column_keys)
+            referred = constraint.elements[0].column
+            if constraint_name:
+                conn.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {constraint_name}"))
+            constraint_name = constraint_name or f'{name}_{constraint.column_keys[0]}_fkey'
+            conn.execute(text(f"ALTER TABLE {name} ADD CONSTRAINT {constraint_name} FOREIGN KEY ({columns}) "
+                              f"REFERENCES {referred.table.name} ({referred.name}) ON DELETE {constraint.ondelete}"))
+
+
+@migration(5, 'Claim time on notifications for dispatcher leases')
+def notification_claimed_at(conn, metadata):
+    if 'claimed_at' not in column_names(conn, 'notification'):
+        conn.execute(text("ALTER TABLE notification ADD COLUMN claimed_at TIMESTAMP"))
+
+
+def ensure_version_table(conn):
+    conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version ("
+                      "version INTEGER PRIMARY KEY, description VARCHAR(200) NOT NULL, applied_at TIMESTAMP NOT NULL)"))
+
+
+def record_version(conn, version, description):
+    conn.execute(text("INSERT INTO schema_version (version, description, applied_at) VALUES (:v, :d, :t)"),
+                 {'v': version, 'd': description, 't': datetime.utcnow()})
+
+
+def current_version(conn):
+    tables = inspect(conn).get_table_names()
+    if 'schema_version' not in tables:
+        return None if 'district' not in tables else 0
+    return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+
+
+def upgrade(engine, metadata):
+    """Bring the database up to the latest version. Returns the versions applied."""
+    migrations = sorted(MIGRATIONS, key=lambda m: m[0])
+    applied = []
+    with engine.connect() as conn:
+        sqlite = conn.dialect.name == 'sqlite'
+        if sqlite:
+            # Table rebuilds drop tables; with enforcement on that would cascade into child rows.
+            # The pragma is a no-op inside a transaction, so set it before the first one.
+            conn.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            conn.commit()
+        try:
+            with conn.begin():
+                version = current_version(conn)
+                ensure_version_table(conn)
+                if version is None:
+                    # New database: the models already describe the latest schema
+                    metadata.create_all(conn)
+                    for number, description, _ in migrations:
+                        record_version(conn, number, description)
+                    logger.info(f"Created new database at schema version {migrations[-1][0]}")
+                    return [number for number, _, _ in migrations]
+            for number, description, fn in migrations:
+                if number <= version:
+                    continue
+                with conn.begin():
+                    fn(conn, metadata)
+                    record_version(conn, number, description)
+                logger.info(f"Applied migration {number}: {description}")
+                applied.append(number)
+            if sqlite and applied:
+                violations = conn.exec_driver_sql('PRAGMA foreign_key_check').fetchall()
+                if violations:
+                    logger.warning(f"Foreign key violations after migrating: {violations[:10]}")
+                conn.commit()
+        finally:
+            if sqlite:
+                conn.exec_driver_sql('PRAGMA foreign_keys=ON')
+                conn.commit()
+    return applied
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    from app import app, db
+    with app.app_context():
+        applied = upgrade(db.engine, db.metadata)
+        with db.engine.connect() as conn:
+            print(f"Schema version {current_version(conn)} ({len(applied)} migrations applied)")
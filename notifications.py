@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Background delivery of queued email/SMS notifications.
+
+Routes only write rows to the Notification outbox. The dispatcher thread here
+claims due rows, hands them to a sender per channel and records the outcome.
+A claim is one conditional UPDATE, so dispatchers in several processes never
+send the same row; a claim not finished within NOTIFY_LEASE_SECONDS is taken
+to belong to a crashed process and the row goes back in the queue.
+Failed messages are retried with exponential backoff until NOTIFY_MAX_ATTEMPTS
+is reached, after which they stay in the outbox as 'failed'.
+
+Email batches go out over one authenticated SMTP connection (send_email_batch)
+instead of a new TLS handshake and login per message. SMS batches go straight
+to the Twilio REST API from a small thread pool sharing one HTTP session
+(SmsSender), throttled to the account's message rate.
+"""
+
+import logging
+import os
+import random
+import smtplib
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+from sqlalchemy import or_, select, update
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger('notifications')
+
+MAX_ATTEMPTS = int(os.environ.get('NOTIFY_MAX_ATTEMPTS', '5'))
+BACKOFF_BASE_SECONDS = float(os.environ.get('NOTIFY_BACKOFF_BASE', '30'))
+BACKOFF_MAX_SECONDS = float(os.environ.get('NOTIFY_BACKOFF_MAX', '3600'))
+POLL_SECONDS = float(os.environ.get('NOTIFY_POLL_SECONDS', '5'))
+CLAIM_BATCH_SIZE = int(os.environ.get('NOTIFY_CLAIM_BATCH', '200'))
+# Longest a claimed batch may take to send before another dispatcher may retry it
+LEASE_SECONDS = float(os.environ.get('NOTIFY_LEASE_SECONDS', '900'))
+# Sender-side limit for outgoing mail; 0 disables it
+MAIL_RATE_PER_SECOND = float(os.environ.get('MAIL_RATE_PER_SECOND', '5'))
+
+# Twilio sends at 1 message/second per long code by default; match the account's limit
+SMS_RATE_PER_SECOND = float(os.environ.get('SMS_RATE_PER_SECOND', '1'))
+SMS_CONCURRENCY = int(os.environ.get('SMS_CONCURRENCY', '4'))
+SMS_MAX_THROTTLE_RETRIES = int(os.environ.get('SMS_MAX_THROTTLE_RETRIES', '3'))
+TWILIO_API_BASE = os.environ.get('TWILIO_API_BASE', 'https://api.twilio.com')
+
+# The server rejected one message but the connection is still usable (unless the code is 421)
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+def backoff_delay(attempts):
+    """Seconds to wait before retry number `attempts` (1-based), with +/-20% jitter."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _close(connection):
+    try:
+        connection.__exit__(None, None, None)
+    except (smtplib.SMTPException, OSError):
+        pass
+
+
+def send_email_batch(mail, messages, rate_per_second=None):
+    """Send (key, Message) pairs over one pooled Flask-Mail connection.
+
+    Flask-Mail itself reconnects after MAIL_MAX_EMAILS messages. A dropped or
+    broken connection is reopened and the message retried once; if the server
+    cannot be reached at all the rest of the batch is failed so the dispatcher
+    can back off. Returns {key: error message or None}.
+    """
+    bucket = TokenBucket(MAIL_RATE_PER_SECOND if rate_per_second is None else rate_per_second)
+    results = {}
+    connection = None
+    pending = list(messages)
+    retried = False
+    try:
+        while pending:
+            key, message = pending[0]
+            if connection is None:
+                try:
+                    connection = mail.connect().__enter__()
+                except (smtplib.SMTPException, OSError) as e:
+                    logger.warning(f"SMTP connect failed: {e}")
+                    for k, _ in pending:
+                        results[k] = f'SMTP connect failed: {e}'
+                    break
+            bucket.acquire()
+            try:
+                connection.send(message)
+                results[key] = None
+            except (smtplib.SMTPException, OSError) as e:
+                if isinstance(e, MESSAGE_ERRORS) and getattr(e, 'smtp_code', None) != 421:
+                    results[key] = str(e)
+                else:
+                    # Dropped connection or 421 "closing": reconnect and retry this message once
+                    _close(connection)
+                    connection = None
+                    if not retried:
+                        logger.info(f"SMTP connection error, reconnecting: {e}")
+                        retried = True
+                        continue
+                    results[key] = str(e)
+            pending.pop(0)
+            retried = False
+    finally:
+        if connection is not None:
+            _close(connection)
+    return results
+
+
+def retry_after_seconds(response, attempt):
+    """Delay requested by a 429 response, falling back to exponential backoff."""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return min(30.0, 2 ** attempt)
+
+
+class SmsSender:
+    """Sends SMS through the Twilio REST API from a bounded thread pool.
+
+    All workers share one requests.Session (and its connection pool) and one
+    token bucket, so concurrency never pushes past `rate_per_second`. A 429
+    reply is retried after its Retry-After delay.
+    """
+
+    def __init__(self, account_sid, auth_token, from_number, base_url=None,
+                 rate_per_second=None, workers=None):
+        self.from_number = from_number
+        self.url = f"{(base_url or TWILIO_API_BASE).rstrip('/')}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.workers = workers or SMS_CONCURRENCY
+        self.bucket = TokenBucket(SMS_RATE_PER_SECOND if rate_per_second is None else rate_per_second)
+        self.session = requests.Session()
+        self.session.auth = (account_sid, auth_token)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sms')
+
+    def send(self, to, body):
+        """Send one message; returns None on success or an error message."""
+        for attempt in range(SMS_MAX_THROTTLE_RETRIES + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.post(self.url, data={'To': to, 'From': self.from_number, 'Body': body}, timeout=15)
+            except requests.RequestException as e:
+                return str(e)
+            if response.status_code == 429 and attempt < SMS_MAX_THROTTLE_RETRIES:
+                delay = retry_after_seconds(response, attempt)
+                logger.info(f"Twilio throttled SMS to {to}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            if response.ok:
+                return None
+            try:
+                detail = response.json().get('message')
+            except ValueError:
+                detail = None
+            return f"Twilio {response.status_code}: {detail or response.reason}"
+        return 'Twilio kept throttling the request'
+
+    def send_batch(self, messages):
+        """Send (key, to, body) triples concurrently; returns {key: error message or None}."""
+        futures = {key: self.pool.submit(self.send, to, body) for key, to, body in messages}
+        results = {}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results[key] = str(e)
+        return results
+
+
+class NotificationDispatcher:
+    """Drains the Notification outbox on a background thread.
+
+    `senders` maps a channel name to a callable that takes a list of
+    Notification rows and returns {notification id: error message or None}.
+    """
+
+    def __init__(self, app, db, model, senders):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.senders = senders
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._next_release = 0.0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='notification-dispatcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Start draining now instead of at the next poll."""
+        self.start()
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    if time.monotonic() >= self._next_release:
+                        self.release_stale()
+                        self._next_release = time.monotonic() + LEASE_SECONDS / 2
+                    handled = self.dispatch_due()
+            except Exception as e:
+                logger.exception(f"Notification dispatch failed: {e}")
+                handled = 0
+            if not handled:
+                self._wake.wait(POLL_SECONDS)
+                self._wake.clear()
+
+    def release_stale(self):
+        """Put rows whose claim outlived the lease (a crashed process) back in the queue."""
+        Notification = self.model
+        expired = datetime.utcnow() - timedelta(seconds=LEASE_SECONDS)
+        (Notification.query
+         .filter(Notification.status == 'sending',
+                 or_(Notification.claimed_at.is_(None), Notification.claimed_at < expired))
+         .update({'status': 'pending'}, synchronize_session=False))
+        self.db.session.commit()
+
+    def claim_due(self):
+        """Mark a batch of due rows 'sending' and return their ids. The UPDATE only
+        takes rows still pending, so a row claimed by another process is skipped."""
+        Notification = self.model
+        now = datetime.utcnow()
+        due = (select(Notification.id)
+               .where(Notification.status == 'pending', Notification.next_attempt_at <= now)
+               .order_by(Notification.next_attempt_at, Notification.id)
+               .limit(CLAIM_BATCH_SIZE))
+        claimed = self.db.session.scalars(
+            update(Notification)
+            .where(Notification.id.in_(due.scalar_subquery()), Notification.status == 'pending')
+            .values(status='sending', claimed_at=now)
+            .returning(Notification.id)
+            .execution_options(synchronize_session=False)).all()
+        self.db.session.commit()
+        return claimed
+
+    def dispatch_due(self):
+        """Send one batch of due notifications; returns how many were handled."""
+        Notification = self.model
+        claimed = self.claim_due()
+        if not claimed:
+            return 0
+        due = Notification.query.filter(Notification.id.in_(claimed)).order_by(Notification.next_attempt_at, Notification.id).all()
+
+        by_channel = defaultdict(list)
+        for n in due:
+            by_channel[n.channel].append(n)
+
+        for channel, batch in by_channel.items():
+            sender = self.senders.get(channel)
+            if sender is None:
+                results = {n.id: f'No sender configured for {channel}' for n in batch}
+            else:
+                try:
+                    results = sender(batch)
+                except Exception as e:
+                    results = {n.id: str(e) for n in batch}
+            for n in batch:
+                self.record_attempt(n, results.get(n.id, 'No result from sender'))
+            self.db.session.commit()
+        return len(due)
+
+    def record_attempt(self, notification, error):
+        notification.attempts += 1
+        now = datetime.utcnow()
+        if error is None:
+            notification.status = 'sent'
+            notification.sent_at = now
+            notification.last_error = None
+        elif notification.attempts >= MAX_ATTEMPTS:
+            notification.status = 'failed'
+            notification.last_error = error
+        else:
+            notification.status = 'pending'
+            notification.last_error = error
+            notification.next_attempt_at = now + timedelta(seconds=backoff_delay(notification.attempts))
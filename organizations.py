@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Ministering organizations the app knows about.
+
+Kept apart from app_scraper.py so the web app can use them without importing
+Selenium and webdriver_manager, which only the scraper needs.
+"""
+
+# Ministering organizations that can be scraped. `json_key` is the key under
+# ministeringData in the page JSON and `url` the LCR page that loads it.
+ORGANIZATIONS = {
+    'elders': {
+        'label': 'Elders Quorum',
+        'json_key': 'elders',
+        'url': 'https://lcr.churchofjesuschrist.org/ministering?type=EQ',
+    },
+    'relief_society': {
+        'label': 'Relief Society',
+        'json_key': 'reliefSociety',
+        'url': 'https://lcr.churchofjesuschrist.org/ministering?type=RS',
+    },
+}
+# Organization shown by the default ministering page (and by its table and popups)
+DEFAULT_ORGANIZATION = 'elders'
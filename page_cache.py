@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+In-process caching for pages that many members load at once.
+
+DistrictVersions keeps a counter per district that the app bumps whenever a
+committed transaction touched that district's slots, teams, members or
+bookings. SnapshotCache keeps the latest computed value per key and treats it
+as valid while the district's version is unchanged, so invalidation is just a
+counter increment. Concurrent misses for the same key and version wait for a
+single computation (single flight) instead of all running the same queries.
+
+The same counters give views cheap strong ETags (make_etag), so a client
+holding a current copy gets a 304 without the view running a query.
+
+FragmentCache holds rendered HTML blocks (one per district on the admin
+calendar) under a byte budget, evicting the least recently used.
+
+Everything here is per process, which matches how the app is served
+(python app.py, one process with threads).
+"""
+
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+
+# How long a request waits for another request's computation before doing its own
+SNAPSHOT_WAIT_SECONDS = float(os.environ.get('SNAPSHOT_WAIT_SECONDS', '10'))
+FRAGMENT_CACHE_BYTES = int(float(os.environ.get('FRAGMENT_CACHE_MB', '16')) * 1024 * 1024)
+
+# Counters restart at zero with the process; mixing this in keeps old ETags from matching
+PROCESS_EPOCH = uuid.uuid4().hex
+
+
+def make_etag(*parts):
+    """Strong ETag value for a response determined entirely by `parts`."""
+    raw = '|'.join(str(part) for part in (PROCESS_EPOCH,) + parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class DistrictVersions:
+    """Monotonic version counter per district id, plus one for any district."""
+
+    def __init__(self):
+        self._versions = defaultdict(int)
+        self._global = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def get(self, district_id):
+        with self._lock:
+            return self._versions[district_id]
+
+    @property
+    def global_version(self):
+        """Changes whenever any district does (for pages that show every district)."""
+        with self._lock:
+            return self._global
+
+    def subscribe(self, listener):
+        """Call `listener(district_ids)` after every bump."""
+        self._listeners.append(listener)
+
+    def bump(self, district_ids):
+        district_ids = set(district_ids)
+        with self._lock:
+            for district_id in district_ids:
+                self._versions[district_id] += 1
+            self._global += 1
+        for listener in self._listeners:
+            listener(district_ids)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SnapshotCache:
+    """Latest value per key, tagged with the version it was computed for."""
+
+    def __init__(self, wait_timeout=None):
+        self.wait_timeout = SNAPSHOT_WAIT_SECONDS if wait_timeout is None else wait_timeout
+        self._entries = {}  # key -> (version, value)
+        self._flights = {}  # (key, version) -> _Flight
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = self.timeouts = 0
+
+    def get(self, key, version, compute):
+        """Return the value for `key` at `version`, calling `compute()` at most once
+        per key and version however many requests miss at the same time. A request
+        that waits longer than wait_timeout for that call runs compute() itself."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            flight = self._flights.get((key, version))
+            leader = flight is None
+            if leader:
+                flight = self._flights[(key, version)] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            if not flight.done.wait(self.wait_timeout):
+                # Don't let one stuck computation hold up every request for the key
+                with self._lock:
+                    self.timeouts += 1
+                return compute()
+            if flight.error:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[(key, version)]
+                current = self._entries.get(key)
+                # A slower computation for an older version must not replace a newer one
+                if flight.error is None and (current is None or current[0] <= version):
+                    self._entries[key] = (version, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def discard_where(self, predicate):
+        """Drop the entries whose key matches `predicate`, e.g. ones for past days."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FragmentCache:
+    """Rendered HTML fragments with LRU eviction under a memory cap.
+
+    Each key holds one fragment tagged with the version it was rendered for;
+    a lookup with a different tag re-renders and replaces it, so stale versions
+    never accumulate.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = FRAGMENT_CACHE_BYTES if max_bytes is None else max_bytes
+        self._entries = OrderedDict()  # key -> (tag, html, size)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, tag, render):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == tag:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        html = render()
+        size = len(html.encode('utf-8'))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._size -= old[2]
+            if size <= self.max_bytes:
+                self._entries[key] = (tag, html, size)
+                self._size += size
+            while self._size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+                self.evictions += 1
+        return html
+
+    @property
+    def size(self):
+        with self._lock:
+            return self._size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Time-ordered queue of interview reminders.
+
+Every booking gets one reminder per offset in REMINDER_OFFSETS_HOURS (default
+"24,1": a day and an hour before the slot starts). Reminders live in a
+min-heap keyed on due time, so scheduling is O(log n) and the timer thread
+only ever looks at the head. Cancelling a booking just drops it from the
+live-entry map; its heap entries are discarded lazily when they reach the top.
+
+The web app feeds bookings in as they are committed and supplies `fire`, which
+turns a due reminder into Notification rows.
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger('reminders')
+
+
+def parse_offsets(value):
+    """"24,1" -> [('24h', timedelta(hours=24)), ('1h', timedelta(hours=1))]"""
+    offsets = []
+    for part in (value or '').split(','):
+        part = part.strip()
+        if part:
+            hours = float(part)
+            offsets.append((f'{part}h', timedelta(hours=hours)))
+    return sorted(offsets, key=lambda o: o[1], reverse=True)
+
+
+REMINDER_OFFSETS = parse_offsets(os.environ.get('REMINDER_OFFSETS_HOURS', '24,1'))
+# A reminder that became due more than this long ago (e.g. the 24h reminder for a
+# booking made 3 hours ahead) is dropped instead of being sent late
+REMINDER_GRACE = timedelta(minutes=float(os.environ.get('REMINDER_GRACE_MINUTES', '30')))
+
+
+class ReminderScheduler:
+    """Min-heap of (due_at, seq, booking_id, label) plus a background timer."""
+
+    def __init__(self, fire, offsets=None, grace=None):
+        self.fire = fire
+        self.offsets = REMINDER_OFFSETS if offsets is None else offsets
+        self.grace = REMINDER_GRACE if grace is None else grace
+        self._heap = []
+        self._live = {}  # (booking_id, label) -> due_at of the current entry
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._live)
+
+    def schedule_booking(self, booking_id, starts_at, now=None):
+        """(Re)schedule every reminder for a booking whose slot starts at `starts_at`."""
+        now = now or datetime.now()
+        with self._lock:
+            scheduled = False
+            for label, offset in self.offsets:
+                due_at = starts_at - offset
+                key = (booking_id, label)
+                if due_at < now - self.grace or starts_at <= now:
+                    self._live.pop(key, None)
+                    continue
+                self._live[key] = due_at
+                heapq.heappush(self._heap, (due_at, next(self._seq), booking_id, label))
+                scheduled = True
+            if scheduled:
+                # Let the timer re-check in case this is now the earliest reminder
+                self._wake.set()
+
+    def cancel_booking(self, booking_id):
+        with self._lock:
+            for label, _ in self.offsets:
+                self._live.pop((booking_id, label), None)
+
+    def next_due(self):
+        """Due time of the earliest live reminder, or None."""
+        with self._lock:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        """Remove and return [(booking_id, label)] for every reminder due by `now`."""
+        now = now or datetime.now()
+        due = []
+        with self._lock:
+            while True:
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, booking_id, label = heapq.heappop(self._heap)
+                del self._live[(booking_id, label)]
+                due.append((booking_id, label))
+        return due
+
+    def _discard_stale(self):
+        # Drop heap entries that were cancelled or superseded by a reschedule
+        while self._heap:
+            due_at, _, booking_id, label = self._heap[0]
+            if self._live.get((booking_id, label)) == due_at:
+                return
+            heapq.heappop(self._heap)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='reminders', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for booking_id, label in self.pop_due():
+                try:
+                    self.fire(booking_id, label)
+                except Exception as e:
+                    logger.exception(f"Reminder {label} for booking {booking_id} failed: {e}")
+            next_due = self.next_due()
+            timeout = 3600 if next_due is None else (next_due - datetime.now()).total_seconds()
+            self._wake.wait(min(max(timeout, 0.05), 3600))
+            self._wake.clear()
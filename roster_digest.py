@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Canonical hashing of scraped or uploaded rosters.
+
+Both the LCR scraper and the CSV upload produce the grouped structure built by
+group_results_by_district(). The companionship ids in that structure are just
+counters, so the digest ignores them and hashes a normalised, sorted form of
+districts, interviewers and members instead. Two rosters with the same people
+in the same companionships hash the same no matter what order they arrived in.
+"""
+
+import hashlib
+import json
+import re
+
+
+def _clean_text(value):
+    return re.sub(r'\s+', ' ', str(value or '')).strip()
+
+
+def _clean_phone(value):
+    return re.sub(r'[^\d+]', '', str(value or ''))
+
+
+def canonical_member(member):
+    return [
+        _clean_text(member.get('name')),
+        _clean_text(member.get('email')).lower(),
+        _clean_phone(member.get('phone')),
+    ]
+
+
+def canonical_district(district):
+    companionships = sorted(
+        sorted(canonical_member(m) for m in comp.get('members', []))
+        for comp in district.get('companionships', [])
+    )
+    return {
+        'organization': _clean_text(district.get('organization')),
+        'name': _clean_text(district.get('name')),
+        'interviewer': _clean_text(district.get('interviewer')),
+        'companionships': companionships,
+    }
+
+
+def district_key(district):
+    """Key used to match a district between two imports."""
+    return f"{_clean_text(district.get('organization'))}/{_clean_text(district.get('name'))}"
+
+
+def _hash(data):
+    encoded = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def roster_digest(scraped_districts):
+    """Return (content_hash, {district_key: district_hash}) for a grouped roster."""
+    district_hashes = {}
+    for district in scraped_districts:
+        district_hashes[district_key(district)] = _hash(canonical_district(district))
+    content_hash = _hash(sorted(district_hashes.items()))
+    return content_hash, district_hashes
+
+
+def compare_digests(previous_hashes, current_hashes):
+    """Classify districts as added, changed, unchanged or removed since the previous import."""
+    previous_hashes = previous_hashes or {}
+    return {
+        'added': sorted(k for k in current_hashes if k not in previous_hashes),
+        'changed': sorted(k for k in current_hashes if k in previous_hashes and previous_hashes[k] != current_hashes[k]),
+        'unchanged': sorted(k for k in current_hashes if previous_hashes.get(k) == current_hashes[k]),
+        'removed': sorted(k for k in previous_hashes if k not in current_hashes),
+    }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Timer for the unattended roster sync.
+
+The schedule and the LCR credentials come from the environment so they never
+pass through the browser or the database:
+
+    ROSTER_SYNC_SCHEDULE       "sun 02:00" (weekly) or "daily 02:00"; unset disables the timer
+    ROSTER_SYNC_ORGANIZATIONS  comma separated organization keys (default "elders")
+    LCR_USERNAME               LCR username for the sync
+    LCR_PASSWORD               LCR password, or
+    LCR_PASSWORD_FILE          path to a file holding it (e.g. a Docker secret)
+
+The web app supplies the job itself; this module only decides when it runs.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+from scrape_tracing import logger
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+def parse_schedule(value):
+    """Parse "sun 02:00" / "daily 02:00" into (weekday or None, hour, minute)."""
+    day, _, clock = (value or '').strip().lower().partition(' ')
+    hour, _, minute = clock.strip().partition(':')
+    if day != 'daily' and day[:3] not in WEEKDAYS:
+        raise ValueError(f"Unknown day in ROSTER_SYNC_SCHEDULE: {value!r}")
+    hour, minute = int(hour), int(minute or 0)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid time in ROSTER_SYNC_SCHEDULE: {value!r}")
+    weekday = None if day == 'daily' else WEEKDAYS.index(day[:3])
+    return weekday, hour, minute
+
+
+def next_run_time(now, weekday, hour, minute):
+    """First time strictly after `now` that matches the schedule."""
+    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if weekday is not None:
+        candidate += timedelta(days=(weekday - candidate.weekday()) % 7)
+    while candidate <= now:
+        candidate += timedelta(days=1 if weekday is None else 7)
+    return candidate
+
+
+def sync_credentials():
+    """Return (username, password) for the sync, or (None, None) if not configured."""
+    username = os.environ.get('LCR_USERNAME')
+    password = os.environ.get('LCR_PASSWORD')
+    password_file = os.environ.get('LCR_PASSWORD_FILE')
+    if not password and password_file:
+        try:
+            with open(password_file, encoding='utf-8') as f:
+                password = f.read().strip()
+        except OSError as e:
+            logger.error(f"Could not read LCR_PASSWORD_FILE: {e}")
+    if not username or not password:
+        return None, None
+    return username, password
+
+
+def sync_organizations(valid_keys, default):
+    keys = [k.strip() for k in os.environ.get('ROSTER_SYNC_ORGANIZATIONS', '').split(',')]
+    return [k for k in keys if k in valid_keys] or [default]
+
+
+class SyncScheduler:
+    """Background thread that calls `job` at each scheduled time.
+
+    Only one run happens at a time; `run_now()` shares the same guard so a
+    manual run cannot overlap a scheduled one.
+    """
+
+    def __init__(self, job, schedule):
+        self.job = job
+        self.schedule = schedule
+        self.next_run = None
+        self._stop = threading.Event()
+        self._running = threading.Lock()
+        self._thread = None
+
+    @property
+    def busy(self):
+        return self._running.locked()
+
+    def start(self):
+        if not self.schedule or (self._thread and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._loop, name='roster-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_now(self, trigger='manual'):
+        """Run the job on this thread; returns False if a run is already in progress."""
+        if not self._running.acquire(blocking=False):
+            return False
+        try:
+            self.job(trigger)
+        except Exception as e:
+            logger.exception(f"Roster sync failed: {e}")
+        finally:
+            self._running.release()
+        return True
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.next_run = next_run_time(datetime.now(), *self.schedule)
+            logger.info(f"Next roster sync at {self.next_run:%Y-%m-%d %H:%M}")
+            # Wake up at least hourly so clock changes don't push the run out
+            while not self._stop.is_set() and datetime.now() < self.next_run:
+                remaining = (self.next_run - datetime.now()).total_seconds()
+                self._stop.wait(min(max(remaining, 0), 3600))
+            if self._stop.is_set():
+                break
+            if not self.run_now('scheduled'):
+                logger.warning("Skipped scheduled roster sync: previous run still in progress")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Automatic assignment of companionships to interview slots.
+
+Each unbooked companionship needs one slot and each slot can hold one
+companionship (the one-team-per-slot rule), so filling a district's calendar
+is a rectangular assignment problem. min_cost_assignment() solves it exactly
+with the Hungarian algorithm (O(n^2 m) for n teams and m slots) instead of
+trying slots greedily. Costs come from member time preferences, with a small
+bias towards earlier slots so the calendar fills from the front.
+
+Districts are independent (their slots and teams never mix), so a stake-wide
+run is one small assignment per district.
+
+find_overlaps() catches an interviewer being scheduled in two places at once
+across districts with a sorted sweep instead of pairwise comparison.
+
+check_booking_operations() validates a batch of admin booking changes against
+capacity and the one-team-per-slot rule as a whole, so the batch can be applied
+all together or not at all.
+"""
+
+import heapq
+from datetime import time
+
+# Member.time_preference values and the start times they accept
+TIME_PREFERENCES = {
+    'morning': (time(0, 0), time(12, 0)),
+    'afternoon': (time(12, 0), time(17, 0)),
+    'evening': (time(17, 0), time(23, 59, 59)),
+}
+
+INFEASIBLE = float('inf')
+PREFERENCE_MISS_COST = 100.0
+
+
+def min_cost_assignment(cost):
+    """Assign each row of `cost` to a distinct column minimising the total cost.
+
+    `cost` is a list of n rows of m values with n <= m; INFEASIBLE marks pairs
+    that must not be used. Returns a list giving the column for each row, or
+    None where a row could only be placed on an infeasible pair.
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    if n > m:
+        raise ValueError('More rows than columns; pad the columns first')
+    big = 1 + sum(max((c for c in row if c != INFEASIBLE), default=0) for row in cost) * 2
+    a = [[big if c == INFEASIBLE else c for c in row] for row in cost]
+
+    # Potentials u (rows) and v (columns); p[j] is the row matched to column j (1-based)
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [float('inf')] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = a[i0 - 1]
+            ui0 = u[i0]
+            delta = float('inf')
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    result = [None] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            i = p[j] - 1
+            if cost[i][j - 1] != INFEASIBLE:
+                result[i] = j - 1
+    return result
+
+
+def preference_misses(preferences, start_time):
+    """How many of a team's member preferences a slot start time fails."""
+    misses = 0
+    for preference in preferences:
+        window = TIME_PREFERENCES.get(preference)
+        if window and not (window[0] <= start_time < window[1]):
+            misses += 1
+    return misses
+
+
+def plan_assignments(teams, slots):
+    """Pick a slot for each team.
+
+    `teams` is a list of (team_id, size, [member time preferences]) and `slots`
+    a list of (slot_id, date, start_time, capacity) in calendar order, all from
+    one district. Returns {team_id: slot_id} for every team that could be placed.
+    """
+    if not teams or not slots:
+        return {}
+    rows = []
+    for _, size, preferences in teams:
+        row = []
+        for rank, (_, _, start_time, capacity) in enumerate(slots):
+            if capacity < size:
+                row.append(INFEASIBLE)
+            else:
+                # Preferences dominate; the rank term only breaks ties towards earlier slots
+                row.append(PREFERENCE_MISS_COST * preference_misses(preferences, start_time) + rank / len(slots))
+        rows.append(row)
+    # More teams than slots: dummy columns leave the overflow unassigned
+    extra = len(teams) - len(slots)
+    if extra > 0:
+        for row in rows:
+            row.extend([INFEASIBLE] * extra)
+    columns = min_cost_assignment(rows)
+    plan = {}
+    for (team_id, _, _), column in zip(teams, columns):
+        if column is not None and column < len(slots):
+            plan[team_id] = slots[column][0]
+    return plan
+
+
+def interviewer_key(name):
+    """Normalise an interviewer name so 'Bro. Smith ' and 'bro. smith' match."""
+    return ' '.join((name or '').split()).lower()
+
+
+def find_overlaps(intervals):
+    """Report overlapping intervals that share a key.
+
+    `intervals` is an iterable of (key, start, end, item). Intervals are swept in
+    start order per key while a min-heap holds the ones still open, so the cost
+    is O(n log n + k) for k overlapping pairs rather than comparing every pair.
+    Touching intervals (one ends exactly when the next starts) do not overlap.
+    Returns [(key, item_a, item_b)] with item_a starting no later than item_b.
+    """
+    by_key = {}
+    for key, start, end, item in intervals:
+        by_key.setdefault(key, []).append((start, end, item))
+
+    overlaps = []
+    for key, group in by_key.items():
+        group.sort(key=lambda interval: (interval[0], interval[1]))
+        open_intervals = []  # heap of (end, seq, item)
+        for seq, (start, end, item) in enumerate(group):
+            while open_intervals and open_intervals[0][0] <= start:
+                heapq.heappop(open_intervals)
+            for _, _, other in open_intervals:
+                overlaps.append((key, other, item))
+            heapq.heappush(open_intervals, (end, seq, item))
+    return overlaps
+
+
+def check_booking_operations(operations, capacities, members, booked):
+    """Validate add/remove operations together, in order, each one seeing the
+    state the ones before it leave.
+
+    `operations` is a list of (op, slot_id, member_id) with op 'add' or
+    'remove', `capacities` maps slot_id to max bookings, `members` maps
+    member_id to (name, team_id) for every member involved or already booked,
+    and `booked` maps slot_id to the set of member ids booked now. Returns
+    (errors, final): an error message or None per operation, and the booked
+    sets once every valid operation has been applied.
+    """
+    final = {slot_id: set(member_ids) for slot_id, member_ids in booked.items()}
+    errors = []
+    for op, slot_id, member_id in operations:
+        if slot_id not in capacities:
+            errors.append('Slot not found.')
+            continue
+        if member_id not in members:
+            errors.append('Member not found.')
+            continue
+        name, team_id = members[member_id]
+        in_slot = final.setdefault(slot_id, set())
+        if op == 'remove':
+            if member_id not in in_slot:
+                errors.append(f'{name} is not booked for this slot.')
+                continue
+            in_slot.discard(member_id)
+        elif op == 'add':
+            if member_id in in_slot:
+                errors.append(f'{name} is already booked for this slot.')
+                continue
+            # A slot belongs to the team of whoever is booked into it
+            if in_slot and members[next(iter(in_slot))][1] != team_id:
+                errors.append('This slot is reserved for another team.')
+                continue
+            if len(in_slot) >= capacities[slot_id]:
+                errors.append('Slot is full.')
+                continue
+            in_slot.add(member_id)
+        else:
+            errors.append('Unknown operation.')
+            continue
+        errors.append(None)
+    return errors, final
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Span timing and leveled, sampled debug logging for the LCR scraper.
+
+The scraper wraps each phase (driver setup, navigation, login steps, JSON
+extraction, table fallback, popups) in a span. The collected spans are turned
+into a per-scrape timing breakdown that the web app stores with the job.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('app_scraper')
+
+# SCRAPER_LOG_LEVEL=DEBUG turns the detailed scraper output back on
+# SCRAPER_DEBUG_SAMPLE=N keeps one of every N hot-loop debug lines per key
+DEBUG_SAMPLE_RATE = max(1, int(os.environ.get('SCRAPER_DEBUG_SAMPLE', '20')))
+
+
+def configure_logging():
+    """Attach a console handler to the scraper logger using SCRAPER_LOG_LEVEL."""
+    level_name = os.environ.get('SCRAPER_LOG_LEVEL', 'INFO').upper()
+    logger.setLevel(getattr(logging, level_name, logging.INFO))
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s'))
+        logger.addHandler(handler)
+    logger.propagate = False
+
+
+configure_logging()
+
+_sample_counts = {}
+_sample_lock = threading.Lock()
+
+
+def debug_sampled(key, message):
+    """Log a hot-loop debug line, keeping only one of every DEBUG_SAMPLE_RATE per key."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    with _sample_lock:
+        count = _sample_counts.get(key, 0)
+        _sample_counts[key] = count + 1
+    if count % DEBUG_SAMPLE_RATE == 0:
+        logger.debug(f"{message} (sampled 1/{DEBUG_SAMPLE_RATE}, seen {count + 1})")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class ScrapeTrace:
+    """Collects named timing spans for one scrape run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time the wrapped block and record it under `name`."""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            record = {'name': name, 'offset': start - self.started, 'duration': duration}
+            if attrs:
+                record.update(attrs)
+            if error:
+                record['error'] = error
+            with self._lock:
+                self.spans.append(record)
+            logger.debug(f"span {name} took {duration * 1000:.1f}ms")
+
+    def durations(self, name):
+        with self._lock:
+            return [s['duration'] for s in self.spans if s['name'] == name]
+
+    def summary(self):
+        """Return the timing breakdown as plain, JSON-serialisable data."""
+        with self._lock:
+            spans = list(self.spans)
+
+        phases = {}
+        order = []
+        for s in spans:
+            if s['name'] not in phases:
+                phases[s['name']] = []
+                order.append(s['name'])
+            phases[s['name']].append(s['duration'])
+
+        popups = phases.get('popup', [])
+        return {
+            'total_seconds': round(time.perf_counter() - self.started, 3),
+            'phases': [
+                {
+                    'name': name,
+                    'count': len(phases[name]),
+                    'total_seconds': round(sum(phases[name]), 3),
+                    'max_seconds': round(max(phases[name]), 3),
+                }
+                for name in order
+            ],
+            'popups': {
+                'count': len(popups),
+                'p50_seconds': round(percentile(popups, 50), 3),
+                'p95_seconds': round(percentile(popups, 95), 3),
+                'max_seconds': round(max(popups), 3) if popups else 0.0,
+            },
+        }
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Recurring interview availability stored as rules instead of rows.
+
+A rule says "num_slots back-to-back slots of `duration` minutes starting at
+start_time, every `weekday`, from start_date to end_date". Concrete
+InterviewSlot rows are only created for the dates a page actually shows (the
+next SLOT_WINDOW_DAYS), so generating a season of availability is one row and
+changing the pattern does not mean deleting hundreds of unbooked slots.
+
+Exceptions cancel a whole date of a rule (start_time None) or a single slot.
+"""
+
+import os
+from datetime import date, datetime, timedelta
+
+# How far ahead the calendar and schedule pages show (and materialise) slots
+SLOT_WINDOW_DAYS = int(os.environ.get('SLOT_WINDOW_DAYS', '56'))
+
+
+def visible_window(today=None):
+    """(first, last) date shown by the calendar and schedule pages."""
+    today = today or date.today()
+    return today, today + timedelta(days=SLOT_WINDOW_DAYS)
+
+
+def first_weekday_on_or_after(day, weekday):
+    return day + timedelta(days=(weekday - day.weekday()) % 7)
+
+
+def occurrences(weekday, start_time, duration, num_slots, start_date, end_date, window_start, window_end,
+                cancelled=()):
+    """Yield (date, start_time) for every slot a rule produces between window_start
+    and window_end inclusive. `cancelled` holds (date, None) for a cancelled date
+    and (date, start_time) for a single cancelled slot."""
+    cancelled = set(cancelled)
+    first = max(start_date, window_start)
+    last = min(end_date, window_end)
+    day = first_weekday_on_or_after(first, weekday)
+    while day <= last:
+        if (day, None) not in cancelled:
+            for j in range(num_slots):
+                slot_time = (datetime.combine(day, start_time) + timedelta(minutes=duration * j)).time()
+                if (day, slot_time) not in cancelled:
+                    yield day, slot_time
+        day += timedelta(weeks=1)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for check_booking_operations(), the validation behind /api/bookings/bulk.
+
+Operations are checked in order against the state the earlier ones leave, so a
+batch can move a team out of a slot and another team in, and capacity and the
+one-team-per-slot rule apply to the batch as a whole.
+"""
+from scheduling import check_booking_operations
+
+# member_id -> (name, team_id): members 1-2 are team 10, members 3-4 team 20
+MEMBERS = {1: ('Bro. A', 10), 2: ('Bro. B', 10), 3: ('Bro. C', 20), 4: ('Bro. D', 20)}
+
+
+def test_later_operations_see_earlier_ones():
+    # Team 10 leaves slot 1, then team 20 may take it; reversed, the add is refused
+    operations = [('remove', 1, 1), ('remove', 1, 2), ('add', 1, 3), ('add', 1, 4)]
+    errors, final = check_booking_operations(operations, {1: 2}, MEMBERS, {1: {1, 2}})
+    assert errors == [None, None, None, None]
+    assert final[1] == {3, 4}
+
+    errors, _ = check_booking_operations(list(reversed(operations)), {1: 2}, MEMBERS, {1: {1, 2}})
+    assert errors[0] == 'This slot is reserved for another team.'
+
+
+def test_capacity_counts_the_whole_batch():
+    operations = [('add', 1, 1), ('add', 1, 2), ('remove', 1, 1), ('add', 1, 1)]
+    errors, final = check_booking_operations(operations, {1: 1}, MEMBERS, {})
+    assert errors == [None, 'Slot is full.', None, None]
+    assert final[1] == {1}
+
+
+def test_add_then_remove_nets_to_nothing():
+    errors, final = check_booking_operations([('add', 1, 3), ('remove', 1, 3)], {1: 2}, MEMBERS, {1: set()})
+    assert errors == [None, None]
+    assert final[1] == set()
+
+
+def test_team_rule_uses_members_already_booked():
+    errors, final = check_booking_operations([('add', 1, 3), ('add', 1, 2)], {1: 5}, MEMBERS, {1: {1}})
+    assert errors == ['This slot is reserved for another team.', None]
+    assert final[1] == {1, 2}
+
+
+def test_rejected_operations_leave_state_alone():
+    operations = [('add', 1, 1), ('add', 1, 1), ('remove', 2, 3), ('add', 9, 1), ('add', 1, 99), ('move', 1, 2)]
+    errors, final = check_booking_operations(operations, {1: 2, 2: 2}, MEMBERS, {})
+    assert errors == [None, 'Bro. A is already booked for this slot.', 'Bro. C is not booked for this slot.',
+                      'Slot not found.', 'Member not found.', 'Unknown operation.']
+    assert final[1] == {1}
+    assert not final.get(2)
+
+
+if __name__ == "__main__":
+    test_later_operations_see_earlier_ones()
+    test_capacity_counts_the_whole_batch()
+    test_add_then_remove_nets_to_nothing()
+    test_team_rule_uses_members_already_booked()
+    test_rejected_operations_leave_state_alone()
+    print("✅ Booking operation tests passed")
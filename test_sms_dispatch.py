@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test concurrent, rate-limited SMS dispatch against a local fake Twilio endpoint.
+
+The fake server speaks just enough of POST /2010-04-01/Accounts/<sid>/Messages.json
+to check concurrency, connection reuse, the token bucket and 429 Retry-After.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from notifications import SmsSender
+
+ACCOUNT_SID = 'ACtest'
+
+
+class FakeTwilio(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeTwilioHandler)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.throttle_next = 0
+        self.latency = 0.05
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        with server.lock:
+            server.connections.add(self.client_address)
+            if server.throttle_next:
+                server.throttle_next -= 1
+                throttled = True
+            else:
+                throttled = False
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        if self.path != f'/2010-04-01/Accounts/{ACCOUNT_SID}/Messages.json' or not self.headers.get('Authorization'):
+            return self.reply(404, {'message': 'Not found'})
+        if throttled:
+            return self.reply(429, {'message': 'Too Many Requests'}, {'Retry-After': '1'})
+        time.sleep(server.latency)
+        with server.lock:
+            server.in_flight -= 1
+            server.messages.append(form)
+        if form['To'][0] == 'invalid':
+            return self.reply(400, {'code': 21211, 'message': "The 'To' number is not valid."})
+        self.reply(201, {'sid': f'SM{len(server.messages)}', 'status': 'queued'})
+
+
+def start_fake_twilio():
+    server = FakeTwilio()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_batch(count):
+    return [(i, f'+1555000{i:04d}', f'Interview link: http://localhost/schedule/{i}') for i in range(count)]
+
+
+def test_concurrent_batch_respects_pool_and_rate():
+    server = start_fake_twilio()
+    try:
+        sender = SmsSender(ACCOUNT_SID, 'token', '+15550000000', base_url=server.base_url,
+                           rate_per_second=50, workers=4)
+        start = time.perf_counter()
+        results = sender.send_batch(make_batch(100))
+        elapsed = time.perf_counter() - start
+        assert all(error is None for error in results.values()), results
+        assert len(server.messages) == 100
+        assert server.max_in_flight <= 4, server.max_in_flight
+        # Burst of 50 tokens, the other 50 arrive at 50/s
+        assert elapsed >= 0.9, elapsed
+        # Workers share pooled keep-alive connections instead of one per message
+        assert len(server.connections) <= 4, len(server.connections)
+        print(f"📱 100 SMS in {elapsed:.2f}s over {len(server.connections)} connections")
+    finally:
+        server.shutdown()
+
+
+def test_honours_retry_after():
+    server = start_fake_twilio()
+    try:
+        server.throttle_next = 1
+        sender = SmsSender(ACCOUNT_SID, 'token', '+15550000000', base_url=server.base_url,
+                           rate_per_second=0, workers=1)
+        start = time.perf_counter()
+        results = sender.send_batch(make_batch(1))
+        assert results == {0: None}
+        assert time.perf_counter() - start >= 1.0
+        assert len(server.messages) == 1
+    finally:
+        server.shutdown()
+
+
+def test_records_per_message_errors():
+    server = start_fake_twilio()
+    try:
+        sender = SmsSender(ACCOUNT_SID, 'token', '+15550000000', base_url=server.base_url,
+                           rate_per_second=0, workers=2)
+        results = sender.send_batch([(1, '+15550001111', 'hi'), (2, 'invalid', 'hi')])
+        assert results[1] is None
+        assert results[2] == "Twilio 400: The 'To' number is not valid."
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_concurrent_batch_respects_pool_and_rate()
+    test_honours_retry_after()
+    test_records_per_message_errors()
+    print("✅ SMS dispatch tests passed")
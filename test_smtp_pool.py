@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Throughput test for pooled batch email sending against a local aiosmtpd server.
+
+Compares one mail.send() per message (a new SMTP session each time) with
+send_email_batch(), which reuses one connection and reconnects every
+MAIL_MAX_EMAILS messages. Requires: pip install aiosmtpd
+"""
+import socket
+import time
+
+import pytest
+from flask import Flask
+from flask_mail import Mail, Message
+
+from notifications import send_email_batch
+
+# Not a runtime dependency; skip rather than fail where it isn't installed
+Controller = pytest.importorskip('aiosmtpd.controller').Controller
+
+MESSAGE_COUNT = 150
+MAX_PER_CONNECTION = 50
+
+
+class CountingHandler:
+    """Counts SMTP sessions and delivered messages; can drop the connection once."""
+
+    def __init__(self):
+        self.sessions = 0
+        self.messages = 0
+        self.fail_next_data = False
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.fail_next_data:
+            self.fail_next_data = False
+            return '421 Service closing transmission channel'
+        self.messages += 1
+        return '250 OK'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def make_mail(port):
+    app = Flask(__name__)
+    app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=port, MAIL_USE_TLS=False,
+                      MAIL_DEFAULT_SENDER='ward@example.com', MAIL_MAX_EMAILS=MAX_PER_CONNECTION)
+    return app, Mail(app)
+
+
+def make_messages(count):
+    messages = []
+    for i in range(count):
+        msg = Message('Interview Scheduling', recipients=[f'brother{i}@example.com'])
+        msg.body = f'Please schedule your interview: http://localhost/schedule/{i}'
+        messages.append((i, msg))
+    return messages
+
+
+def run_server():
+    handler = CountingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    return handler, controller
+
+
+def test_pooled_batch_reuses_connections():
+    handler, controller = run_server()
+    try:
+        app, mail = make_mail(controller.port)
+        with app.app_context():
+            results = send_email_batch(mail, make_messages(MESSAGE_COUNT), rate_per_second=0)
+        assert all(error is None for error in results.values()), results
+        assert handler.messages == MESSAGE_COUNT
+        # One session per MAX_PER_CONNECTION messages instead of one per message
+        assert handler.sessions == MESSAGE_COUNT // MAX_PER_CONNECTION, handler.sessions
+    finally:
+        controller.stop()
+
+
+def test_reconnects_after_server_closes_connection():
+    handler, controller = run_server()
+    try:
+        app, mail = make_mail(controller.port)
+        handler.fail_next_data = True
+        with app.app_context():
+            results = send_email_batch(mail, make_messages(5), rate_per_second=0)
+        assert all(error is None for error in results.values()), results
+        assert handler.messages == 5
+        assert handler.sessions == 2
+    finally:
+        controller.stop()
+
+
+def test_unreachable_server_fails_whole_batch():
+    app, mail = make_mail(free_port())
+    with app.app_context():
+        results = send_email_batch(mail, make_messages(3), rate_per_second=0)
+    assert len(results) == 3
+    assert all(error and error.startswith('SMTP connect failed') for error in results.values())
+
+
+def test_rate_limit():
+    handler, controller = run_server()
+    try:
+        app, mail = make_mail(controller.port)
+        start = time.perf_counter()
+        with app.app_context():
+            send_email_batch(mail, make_messages(30), rate_per_second=20)
+        elapsed = time.perf_counter() - start
+        # The bucket starts with 20 tokens, the other 10 come at 20/s
+        assert elapsed >= 0.45, elapsed
+    finally:
+        controller.stop()
+
+
+def compare_throughput():
+    handler, controller = run_server()
+    try:
+        app, mail = make_mail(controller.port)
+        with app.app_context():
+            start = time.perf_counter()
+            for _, msg in make_messages(MESSAGE_COUNT):
+                mail.send(msg)
+            single = time.perf_counter() - start
+            single_sessions = handler.sessions
+
+            handler.sessions = 0
+            start = time.perf_counter()
+            send_email_batch(mail, make_messages(MESSAGE_COUNT), rate_per_second=0)
+            pooled = time.perf_counter() - start
+        print(f"📧 {MESSAGE_COUNT} messages, one session each: {single:.2f}s ({single_sessions} sessions)")
+        print(f"📧 {MESSAGE_COUNT} messages, pooled:           {pooled:.2f}s ({handler.sessions} sessions)")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    test_pooled_batch_reuses_connections()
+    test_reconnects_after_server_closes_connection()
+    test_unreachable_server_fails_whole_batch()
+    test_rate_limit()
+    print("✅ Pooled SMTP tests passed")
+    compare_throughput()
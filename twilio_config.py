@@ -1,5 +1,6 @@
 from twilio.rest import Client
 import os
+from notifications import SmsSender
 
 # Twilio configuration
 account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
@@ -8,5 +9,8 @@ twilio_number = os.environ.get('TWILIO_NUMBER')
 
 if account_sid and auth_token:
     twilio_client = Client(account_sid, auth_token)
+    # Batch SMS sends go through the REST API directly with a shared, pooled session
+    sms_sender = SmsSender(account_sid, auth_token, twilio_number)
 else:
-    twilio_client = None
\ No newline at end of file
+    twilio_client = None
+    sms_sender = None